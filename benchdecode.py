@@ -0,0 +1,118 @@
+"""Measures the throughput of the functions that decompress STL data.
+
+Builds a random json payload resembling save slot data, compresses it
+twice in the manner used by support emails, and reports, for each
+method, the number of megabytes of compressed text decoded per second
+and the peak memory allocated while decoding. Parsing the decoded json
+takes the same time for every method, so it is not included.
+
+"""
+
+from base64 import b64decode, b64encode
+from io import StringIO
+from json import dumps
+from random import Random
+from time import perf_counter
+import tracemalloc
+from zlib import DEFLATED, compressobj, decompress
+from legends.functions import decompressData, iterDecompressed
+
+def compress(data):
+    """Compresses the given data in the manner described in
+    `legends.functions.decompressData`.
+
+    Args:
+        data (bytes): The data to compress.
+
+    Returns:
+        str: The compressed text.
+
+    """
+    compressor = compressobj(9, DEFLATED, -15)
+    return b64encode(compressor.compress(data) + compressor.flush()).decode()
+
+def makePayload(numUnits, seed=0):
+    """Builds a compressed payload with the given number of units.
+
+    Args:
+        numUnits (int): The number of entries in the payload.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        str: The payload, compressed twice.
+
+    """
+    rng = Random(seed)
+    data = {
+        'units': {
+            'Unit{}'.format(i): {
+                'rank': rng.randint(1, 9),
+                'xp': rng.randint(0, 10**6),
+                'skills': {'Skill{}'.format(j): rng.randint(0, 2)
+                           for j in range(3)}
+            }
+            for i in range(numUnits)
+        }
+    }
+    once = compress(dumps(data).encode('utf-8'))
+    return compress(b'compr-' + once.encode('ascii'))
+
+def utf16Decode(text):
+    """Decodes the payload as `legends.functions.decompressData` did
+    before version 0.27.0, by way of a UTF-16 encoding.
+
+    """
+    def decompressUTF16(text):
+        return decompress(b64decode(text.encode('utf-16')), -15).decode()
+    stringData = decompressUTF16(text)
+    if stringData[:6] == 'compr-':
+        stringData = decompressUTF16(stringData[6:])
+    return stringData
+
+def fastDecode(text):
+    """Decodes the payload in one shot with
+    `legends.functions.decompressData`.
+
+    """
+    stringData = decompressData(text)
+    if stringData[:6] == 'compr-':
+        stringData = decompressData(stringData[6:])
+    return stringData
+
+def streamDecode(text):
+    """Decodes the payload with `legends.functions.iterDecompressed`,
+    reading it from a file-like object.
+
+    """
+    return b''.join(iterDecompressed(StringIO(text)))
+
+def bench(func, text, repeat=5):
+    """Measures the given decoding function on the given text.
+
+    Returns:
+        tuple: (`float`, `float`) The best throughput, in megabytes of
+            compressed text per second, and the peak memory allocated,
+            in megabytes.
+
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        func(text)
+        best = min(best, perf_counter() - start)
+    tracemalloc.start()
+    func(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(text) / best / 10**6, peak / 10**6
+
+if __name__ == '__main__':
+    payload = makePayload(100000)
+    print('Payload: {:.1f} MB'.format(len(payload) / 10**6))
+    for name, func in [
+        ('UTF-16 round trip', utf16Decode),
+        ('One shot', fastDecode),
+        ('Streaming', streamDecode)
+    ]:
+        speed, peak = bench(func, payload)
+        print('{:<18} {:8.1f} MB/s {:8.1f} MB peak'.format(name, speed, peak))
@@ -0,0 +1,106 @@
+"""Compares `legends.roster.Roster.fork` with `copy.deepcopy`.
+
+Builds a roster of every playable character, with random ranks, levels,
+and gear levels, then evaluates one what-if variant per character: the
+character is raised to rank 9 and level 99, its gear is maxed, and its
+total power is computed. Each variant is made either by deep-copying
+the roster or by forking it. The report gives the time taken per
+variant, and the memory held by 100 variants kept alive at once.
+
+"""
+
+from copy import deepcopy
+from random import Random
+from time import perf_counter
+import tracemalloc
+from legends.constants import ENABLED
+from legends.roster import Roster
+
+def makeRoster(seed=0):
+    """Builds a roster of every playable character, with random ranks,
+    levels, and gear levels.
+
+    Args:
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        legends.roster.Roster: The roster.
+
+    """
+    rng = Random(seed)
+    roster = Roster()
+    roster.fillChars(ENABLED)
+    for char in roster.chars.values():
+        char.rank = rng.randint(1, 9)
+        char.level = rng.randint(1, 99)
+        for gearSlot in char.gearSlots:
+            gear = roster.containsGear[gearSlot]
+            gear.setLevel(roster, rng.randint(1, roster.maxGearLevel(gear)))
+    return roster
+
+def maxChar(roster, nameID, writable):
+    """Raises the given character to rank 9 and level 99, maxes its
+    gear, and returns its total power.
+
+    Args:
+        roster (legends.roster.Roster): The roster to change.
+        nameID (str): The name ID of the character.
+        writable (callable): Returns a version of an object in the
+            roster that may be changed.
+
+    Returns:
+        float: The power of the character's total stats.
+
+    """
+    char = writable(roster.chars[nameID])
+    char.rank = 9
+    char.level = 99
+    for gearSlot in char.gearSlots:
+        gear = writable(roster.containsGear[gearSlot])
+        gear.setLevel(roster, roster.maxGearLevel(gear))
+    return char.totalStats(roster).power
+
+def deepcopyVariant(roster, nameID):
+    """Evaluates a variant on a deep copy of the roster."""
+    variant = deepcopy(roster)
+    return variant, maxChar(variant, nameID, lambda obj: obj)
+
+def forkVariant(roster, nameID):
+    """Evaluates a variant on a fork of the roster."""
+    variant = roster.fork()
+    return variant, maxChar(variant, nameID, variant.writable)
+
+def bench(func, roster, keep=100):
+    """Measures the given way of evaluating variants.
+
+    Returns:
+        tuple: (`float`, `float`) The time per variant, in
+            milliseconds, and the memory held per variant kept alive, in
+            kilobytes.
+
+    """
+    start = perf_counter()
+    for nameID in roster.chars:
+        func(roster, nameID)
+    elapsed = (perf_counter() - start) / len(roster.chars)
+    nameIDs = list(roster.chars)[:keep]
+    tracemalloc.start()
+    variants = [func(roster, nameID) for nameID in nameIDs]
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del variants
+    return elapsed * 10**3, held / len(nameIDs) / 10**3
+
+if __name__ == '__main__':
+    roster = makeRoster()
+    print('Roster: {} characters, {} gear'.format(
+        len(roster.chars), len(roster.gear)
+    ))
+    for name, func in [
+        ('copy.deepcopy', deepcopyVariant),
+        ('Roster.fork', forkVariant)
+    ]:
+        speed, held = bench(func, roster)
+        print('{:<14} {:8.2f} ms/variant {:8.1f} kB/variant'.format(
+            name, speed, held
+        ))
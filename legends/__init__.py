@@ -21,3 +21,12 @@ from legends.gameobjects import *
 from legends.roster import *
 from legends.saveslot import *
 from legends.effstatcalc import *
+from legends.battle import *
+from legends.teamsearch import *
+from legends.loadout import *
+from legends.bridgecrew import *
+from legends.upgradeplan import *
+from legends.missiongraph import *
+from legends.savefile import *
+from legends.snapshot import *
+from legends.journal import *
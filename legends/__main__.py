@@ -0,0 +1,291 @@
+"""Summarizes many save files from the command line.
+
+Run `python -m legends --help` for usage. Every file in the given
+directory is read either as an STL save file (a property list, with up
+to three save slots) or as a support email dump (the compressed text
+found after the word "data:" in an STL support email). A
+`legends.saveslot.SaveSlot` is built from each save slot, and a summary
+of its roster, inventory, and power is written as one row of a CSV file
+or one line of a JSON Lines file.
+
+Files are processed in a pool of worker processes. Where the operating
+system allows it, the workers are forked from the main process, so the
+game data loaded by `legends.constants` is shared with them rather than
+loaded again. A file that cannot be read is reported and skipped.
+
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from legends.constants import POWER_AT_ORIGIN
+from legends.functions import loadCompressed
+from legends.savefile import SaveFile
+from legends.saveslot import SaveSlot
+
+SUMMARY_FIELDS = [
+    'file', 'slot', 'started', 'characters', 'power', 'maxPower',
+    'maxPowerChar', 'gear', 'particles', 'xp'
+]
+"""`list` of `str`: The fields of a slot summary that are written to
+every output format, in order. JSON Lines output also includes the
+fields 'inventory' and 'roster'."""
+
+def readSlots(path):
+    """Reads the save slots in the given file.
+
+    Args:
+        path (str): The path to a save file or support email dump.
+
+    Returns:
+        list: [(`int`, `legends.saveslot.SaveSlot`)] A list of pairs,
+            each consisting of the 0-based index of a nonempty save slot
+            and the `legends.saveslot.SaveSlot` built from it.
+
+    """
+    with open(path, 'rb') as f:
+        header = f.read(8)
+    if header.startswith((b'bplist', b'<?xml')):
+        save = SaveFile(path)
+        slots = [
+            slot for slot in range(3) if save['{} data'.format(slot)]
+        ]
+    else:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        if 'data:' in text:
+            text = text.split('data:', 1)[1]
+        save = {'0 data': loadCompressed(text)}
+        slots = [0]
+    result = []
+    for slot in slots:
+        saveslot = SaveSlot()
+        saveslot.fromFile(save, slot)
+        result.append((slot, saveslot))
+    return result
+
+def summarize(saveslot):
+    """Summarizes the roster, inventory, and power of a save slot.
+
+    Args:
+        saveslot (legends.saveslot.SaveSlot): The save slot.
+
+    Returns:
+        dict: A dictionary whose keys are the fields in
+            `SUMMARY_FIELDS` other than 'file' and 'slot', together with
+            'inventory', which maps item names to nonzero quantities,
+            and 'roster', which lists the name ID, rank, level, and
+            power of each character.
+
+    """
+    roster = saveslot.roster
+    chars = [
+        {
+            'nameID': char.nameID,
+            'rank': char.rank,
+            'level': char.level,
+            'power': round(
+                POWER_AT_ORIGIN + char.totalStats(roster).power, 2
+            )
+        }
+        for char in roster.chars.values()
+    ]
+    strongest = max(chars, key=lambda char: char['power'], default=None)
+    return {
+        'started': saveslot.timestamps.startDate.isoformat(),
+        'characters': len(chars),
+        'power': round(sum(char['power'] for char in chars), 2),
+        'maxPower': None if strongest is None else strongest['power'],
+        'maxPowerChar': None if strongest is None else strongest['nameID'],
+        'gear': len(roster.gear),
+        'particles': len(roster.parts),
+        'xp': saveslot.inventory.xp,
+        'inventory': {
+            item.name: qty for item, qty in saveslot.inventory.items() if qty
+        },
+        'roster': chars
+    }
+
+def processFile(path):
+    """Reads and summarizes every save slot in the given file. Any error
+    is caught and returned, so that one bad file does not stop the
+    others from being processed.
+
+    Args:
+        path (str): The path to a save file or support email dump.
+
+    Returns:
+        tuple: (`str`, `list`, `str`) The path, a list of slot summaries
+            (see `summarize`) with the 'file' and 'slot' fields added,
+            and an error message, which is `None` if there was no error.
+
+    """
+    try:
+        summaries = []
+        for slot, saveslot in readSlots(path):
+            summary = {'file': os.path.basename(path), 'slot': slot + 1}
+            summary.update(summarize(saveslot))
+            summaries.append(summary)
+        return path, summaries, None
+    except Exception as ex: # pylint: disable=broad-except
+        return path, [], '{}: {}'.format(type(ex).__name__, ex)
+
+def processFiles(paths, jobs=None, progress=None):
+    """Processes the given files in a pool of worker processes.
+
+    Args:
+        paths (list of str): The paths of the files.
+        jobs (int): The number of worker processes. If 1, the files are
+            processed in the calling process. Defaults to the number of
+            processors.
+        progress (callable): If given, called after each file with the
+            number of files done, the total number of files, and the
+            result of `processFile` for that file.
+
+    Yields:
+        tuple: The results of `processFile`, in order of completion.
+
+    """
+    total = len(paths)
+    if jobs == 1 or total < 2:
+        results = map(processFile, paths)
+        for done, result in enumerate(results, 1):
+            if progress is not None:
+                progress(done, total, result)
+            yield result
+        return
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = None
+    with ProcessPoolExecutor(jobs, mp_context=context) as pool:
+        futures = [pool.submit(processFile, path) for path in paths]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            if progress is not None:
+                progress(done, total, result)
+            yield result
+
+def writeCSV(summaries, f):
+    """Writes slot summaries to a CSV file, one row per slot. Each item
+    in any of the inventories gets its own column, and the roster of
+    each slot is omitted.
+
+    Args:
+        summaries (list of dict): The slot summaries.
+        f (file): The file, open for writing text.
+
+    """
+    itemNames = sorted({
+        name for summary in summaries for name in summary['inventory']
+    })
+    writer = csv.writer(f)
+    writer.writerow(SUMMARY_FIELDS + itemNames)
+    for summary in summaries:
+        writer.writerow(
+            [summary[field] for field in SUMMARY_FIELDS]
+            + [summary['inventory'].get(name, 0) for name in itemNames]
+        )
+
+def writeJSONLines(summaries, f):
+    """Writes slot summaries to a JSON Lines file, one line per slot.
+
+    Args:
+        summaries (list of dict): The slot summaries.
+        f (file): The file, open for writing text.
+
+    """
+    for summary in summaries:
+        f.write(json.dumps(summary) + '\n')
+
+def main(argv=None):
+    """Runs the command line interface.
+
+    Args:
+        argv (list of str): The command line arguments. Defaults to
+            `sys.argv[1:]`.
+
+    Returns:
+        int: The exit status, which is 1 if any file could not be
+            processed, and 0 otherwise.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m legends',
+        description='Summarize the rosters and inventories of STL save '
+        + 'files and support email dumps.'
+    )
+    parser.add_argument(
+        'directory', help='directory containing the files to summarize'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='output file (default: standard output)'
+    )
+    parser.add_argument(
+        '-f', '--format', choices=['csv', 'jsonl'],
+        help='output format (default: csv if the output file name ends '
+        + 'in .csv, jsonl otherwise)'
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int,
+        help='number of worker processes (default: number of processors)'
+    )
+    parser.add_argument(
+        '-q', '--quiet', action='store_true',
+        help='do not report progress'
+    )
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        isCSV = args.output is not None and args.output.endswith('.csv')
+        fmt = 'csv' if isCSV else 'jsonl'
+    paths = sorted(
+        os.path.join(args.directory, name)
+        for name in os.listdir(args.directory)
+        if name[0] != '.'
+        and os.path.isfile(os.path.join(args.directory, name))
+    )
+
+    def report(done, total, result):
+        path, summaries, error = result
+        status = (
+            'error: ' + error if error is not None
+            else '{} slot(s)'.format(len(summaries))
+        )
+        print(
+            '[{}/{}] {}: {}'.format(done, total, path, status),
+            file=sys.stderr
+        )
+
+    summaries = []
+    failures = 0
+    for _, fileSummaries, error in processFiles(
+        paths, args.jobs, None if args.quiet else report
+    ):
+        summaries.extend(fileSummaries)
+        failures += error is not None
+    summaries.sort(key=lambda summary: (summary['file'], summary['slot']))
+
+    write = writeCSV if fmt == 'csv' else writeJSONLines
+    if args.output is None:
+        write(summaries, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write(summaries, f)
+    if not args.quiet:
+        print(
+            '{} slot(s) from {} file(s), {} failed'.format(
+                len(summaries), len(paths), failures
+            ),
+            file=sys.stderr
+        )
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,640 @@
+"""A simplified battle simulator for *Star Trek: Legends*.
+
+Two simulators are provided, with identical interfaces. The
+`BattleSim` class is a scalar, per-object simulator that plays one
+battle at a time. The `BatchBattleSim` class is a structure-of-arrays
+kernel that plays many battles simultaneously, storing health, stats,
+shields, and buffs as NumPy arrays and stepping every battle in
+lockstep. Because both use the same battle model, the scalar simulator
+can be used to cross-check the results of the batch kernel.
+
+The battle model is a simplification of the in-game rules. Characters
+act once per round in descending order of their (unbuffed) speed. On
+each turn, a character uses the skill chosen by
+`legends.gameobjects.Character.aiSkillOrder`. The following skill
+effects are modeled: damage (from attack or tech), heals, shields, and
+buffs and debuffs that modify stats. Effect chains are followed until
+a conditional effect (an effect whose type begins with 'If') is
+reached; conditional effects and anything after them are ignored, as
+are all other effect types. Skills with multiple random targets are
+treated as hitting that many distinct targets. Damage is mitigated in
+the same way as in `legends.effstatcalc.EffStatCalc`. A battle ends
+when one side has no living characters, or in a draw after the maximum
+number of rounds.
+
+"""
+
+import numpy as np
+from legends.constants import STAT_ABBREVIATIONS
+
+__all__ = [
+    'BattleEffect',
+    'BattleResults',
+    'BattleSim',
+    'BattleUnit',
+    'BatchBattleSim',
+    'compileSkill'
+]
+
+STAT_INDEX = {statName: index for index, statName in enumerate(
+    STAT_ABBREVIATIONS
+)}
+"""`dict`: {`str`:`int`} A dictionary mapping stat names to their column
+index in the stat arrays used by the simulators."""
+
+FLAT_STATS = ['CritChance', 'CritDamage', 'GlancingChance', 'GlancingDamage']
+"""`list` of `str`: Stats whose modifiers are always applied as flat
+additions, rather than as fractions of the base stat."""
+
+class BattleEffect(): # pylint: disable=too-few-public-methods
+    """A skill effect, reduced to the parts modeled by the simulators.
+
+    Attributes:
+        kind (str): One of 'damage', 'heal', 'shield', or 'mod'.
+        stat (str): For 'damage', 'heal', and 'shield' effects, the
+            name of the source stat. For 'mod' effects, the name of the
+            stat being modified.
+        coef (float): The multiplier applied to the source stat. For
+            'mod' effects, the size of the modification, which is
+            negative for debuffs.
+        flat (bool): For 'mod' effects, `True` if the modification is a
+            flat addition; otherwise it is a fraction of the base stat.
+        chance (float): The probability that the effect is applied.
+        duration (int): For 'mod' effects, the number of turns of the
+            affected character during which the modification lasts.
+        onCaster (bool): `True` if the effect applies to the caster
+            instead of the skill's targets.
+
+    """
+
+    def __init__(
+        self, kind, stat, coef, flat=False, chance=1, duration=0,
+        onCaster=False
+    ):
+        self.kind = kind
+        self.stat = stat
+        self.coef = coef
+        self.flat = flat
+        self.chance = chance
+        self.duration = duration
+        self.onCaster = onCaster
+
+    def __repr__(self):
+        return '<BattleEffect: {} {} {:g}>'.format(
+            self.kind, self.stat, self.coef
+        )
+
+def compileSkill(skill):
+    """Reduces the given skill to the list of effects that are modeled
+    by the battle simulators.
+
+    Args:
+        skill (legends.skill.Skill): The skill to compile.
+
+    Returns:
+        list of BattleEffect: The modeled effects, in order of
+            application.
+
+    """
+    chains = [(effect.chain, False) for effect in skill.effects]
+    if skill.casterEffect is not None:
+        chains.append((skill.casterEffect.chain, True))
+    battleEffects = []
+    for chain, onCaster in chains:
+        for effect in chain:
+            effectType = effect.effectType
+            if effectType[:2] == 'If':
+                break
+            data = effect.data
+            effectOnCaster = onCaster or (
+                not effect.doesDamage
+                and data['statAffectedTarget'] == 'Caster'
+            )
+            kargs = {'chance': data['chance'], 'onCaster': effectOnCaster}
+            if effect.doesDamage:
+                if effect.statSource not in ('Attack', 'Tech'):
+                    continue
+                battleEffects.append(BattleEffect(
+                    'damage', effect.statSource,
+                    effect.fraction * effect.statSourceFrac, **kargs
+                ))
+            elif effectType == 'Heal':
+                if effect.statSource not in ('Tech', 'MaxHealth'):
+                    continue
+                battleEffects.append(BattleEffect(
+                    'heal', effect.statSource,
+                    effect.fraction * effect.statSourceFrac, **kargs
+                ))
+            elif effectType == 'Shield':
+                if effect.statSource != 'Tech':
+                    continue
+                battleEffects.append(BattleEffect(
+                    'shield', 'Tech',
+                    effect.fraction * effect.statSourceFrac, **kargs
+                ))
+            elif effectType in ('Buff', 'Debuff'):
+                stat = effect.statAffected
+                if stat not in STAT_INDEX or data['duration'] <= 0:
+                    continue
+                sign = 1 if effectType == 'Buff' else -1
+                battleEffects.append(BattleEffect(
+                    'mod', stat, sign * effect.statSourceFrac,
+                    flat=(
+                        stat in FLAT_STATS
+                        or effect.statSource == 'FlatValue'
+                    ),
+                    duration=data['duration'], **kargs
+                ))
+    return battleEffects
+
+class BattleUnit(): # pylint: disable=too-few-public-methods
+    """A character prepared for battle.
+
+    Attributes:
+        char (legends.gameobjects.Character): The character.
+        team (int): 0 for allies, 1 for enemies.
+        stats (list of float): The character's total stats, including
+            gear and particles, ordered as in `STAT_ABBREVIATIONS`.
+        schedule (list): [(`str`, `int`, `bool`, [`BattleEffect`])] The
+            skills used on each of the character's turns. Each skill is
+            represented as a tuple containing its target type (one of
+            'Enemies', 'Allies', 'AlliesExclusive', or 'Caster'), its
+            number of targets, whether it is AOE, and its compiled
+            effects.
+
+    """
+
+    def __init__(self, char, roster, team, maxRounds):
+        """The constructor computes the character's total stats in the
+        given roster and precomputes the skills it will use in the
+        first `maxRounds` rounds.
+
+        """
+        self.char = char
+        self.team = team
+        statObj = char.totalStats(roster)
+        self.stats = [statObj.get(statName) for statName in STAT_INDEX]
+        compiled = {}
+        self.schedule = []
+        skillOrder = char.aiSkillOrder()
+        for _ in range(maxRounds):
+            skill = next(skillOrder)
+            if skill.skillID not in compiled:
+                compiled[skill.skillID] = (
+                    skill.data['targetType'],
+                    skill.numTargets,
+                    skill.isAOE,
+                    compileSkill(skill)
+                )
+            self.schedule.append(compiled[skill.skillID])
+
+    def __repr__(self):
+        return '<BattleUnit: {}, team {}>'.format(self.char.nameID, self.team)
+
+class BattleResults():
+    """The outcomes of a collection of simulated battles.
+
+    Attributes:
+        winners (numpy.ndarray): One entry per battle; 1 if the allies
+            won, -1 if the enemies won, and 0 for a draw.
+        rounds (numpy.ndarray): One entry per battle; the number of
+            rounds the battle lasted.
+
+    """
+
+    def __init__(self, winners, rounds):
+        self.winners = np.asarray(winners)
+        self.rounds = np.asarray(rounds)
+
+    @property
+    def numBattles(self):
+        """`int`: The number of simulated battles."""
+        return len(self.winners)
+
+    @property
+    def winRate(self):
+        """`float`: The proportion of battles won by the allies."""
+        return float(np.mean(self.winners == 1))
+
+    @property
+    def lossRate(self):
+        """`float`: The proportion of battles won by the enemies."""
+        return float(np.mean(self.winners == -1))
+
+    @property
+    def drawRate(self):
+        """`float`: The proportion of battles ending in a draw."""
+        return float(np.mean(self.winners == 0))
+
+    @property
+    def meanRounds(self):
+        """`float`: The average length of a battle, in rounds."""
+        return float(np.mean(self.rounds))
+
+    def __repr__(self):
+        return (
+            'BattleResults(battles={}, winRate={:.3f}, lossRate={:.3f}, '
+            + 'drawRate={:.3f})'
+        ).format(self.numBattles, self.winRate, self.lossRate, self.drawRate)
+
+class BattleSim():
+    """A scalar battle simulator that plays one battle at a time.
+
+    Attributes:
+        units (list of BattleUnit): The allied units followed by the
+            enemy units.
+        order (list of int): Indices into `units`, in the order in which
+            the units act each round.
+        maxRounds (int): The number of rounds after which a battle is
+            declared a draw.
+
+    """
+
+    def __init__(
+        self, allies, enemies, allyRoster, enemyRoster=None, maxRounds=10
+    ):
+        """The constructor prepares the given characters for battle.
+
+        Args:
+            allies (list of legends.gameobjects.Character): The allied
+                team.
+            enemies (list of legends.gameobjects.Character): The enemy
+                team.
+            allyRoster (legends.roster.Roster): The roster to which the
+                allied characters belong.
+            enemyRoster (legends.roster.Roster): The roster to which the
+                enemy characters belong. Defaults to `allyRoster`.
+            maxRounds (int): The value of the `maxRounds` attribute.
+
+        """
+        if enemyRoster is None:
+            enemyRoster = allyRoster
+        self.maxRounds = maxRounds
+        self.units = (
+            [BattleUnit(char, allyRoster, 0, maxRounds) for char in allies]
+            + [BattleUnit(char, enemyRoster, 1, maxRounds) for char in enemies]
+        )
+        spd = STAT_INDEX['Speed']
+        self.order = sorted(
+            range(len(self.units)),
+            key=lambda index: (-self.units[index].stats[spd], index)
+        )
+
+    def candidates(self, caster, targetType):
+        """Returns the indices of the units that a skill with the given
+        target type, cast by the given unit, may target.
+
+        Args:
+            caster (int): The index of the casting unit.
+            targetType (str): One of 'Enemies', 'Allies',
+                'AlliesExclusive', or 'Caster'.
+
+        Returns:
+            list of int: The candidate indices.
+
+        """
+        team = self.units[caster].team
+        if targetType == 'Caster':
+            return [caster]
+        if targetType == 'Enemies':
+            return [
+                index for index, unit in enumerate(self.units)
+                if unit.team != team
+            ]
+        return [
+            index for index, unit in enumerate(self.units)
+            if unit.team == team
+            and (targetType == 'Allies' or index != caster)
+        ]
+
+    def run(self, rng):
+        """Plays a single battle.
+
+        Args:
+            rng (numpy.random.Generator): The random number generator.
+
+        Returns:
+            tuple: (`int`, `int`) The winner (1 for allies, -1 for
+                enemies, 0 for a draw) and the number of rounds played.
+
+        """
+        # pylint: disable=too-many-locals, too-many-branches
+        hlth = STAT_INDEX['Health']
+        base = [unit.stats for unit in self.units]
+        hp = [stats[hlth] for stats in base]
+        shield = [0.0] * len(self.units)
+        mods = [{} for _ in self.units] # {(stat, sign): [delta, turns]}
+
+        def stat(index, statName):
+            value = base[index][STAT_INDEX[statName]]
+            for (modStat, _), (delta, _) in mods[index].items():
+                if modStat == statName:
+                    value += delta
+            return value
+
+        def teamAlive(team):
+            return any(
+                hp[index] > 0 for index, unit in enumerate(self.units)
+                if unit.team == team
+            )
+
+        for rnd in range(self.maxRounds):
+            for caster in self.order:
+                if hp[caster] <= 0:
+                    continue
+                targetType, numTargets, isAOE, effects = (
+                    self.units[caster].schedule[rnd]
+                )
+                cands = [
+                    index for index in self.candidates(caster, targetType)
+                    if hp[index] > 0
+                ]
+                if not isAOE and numTargets < len(cands):
+                    keys = rng.random(len(cands))
+                    cands = [cands[k] for k in np.argsort(keys)[:numTargets]]
+                for effect in effects:
+                    targets = [caster] if effect.onCaster else cands
+                    for target in targets:
+                        if hp[target] <= 0 or rng.random() >= effect.chance:
+                            continue
+                        if effect.kind == 'damage':
+                            dmg = stat(caster, effect.stat) * effect.coef
+                            if rng.random() < stat(caster, 'CritChance'):
+                                dmg *= stat(caster, 'CritDamage')
+                            if rng.random() < stat(target, 'GlancingChance'):
+                                dmg *= 1 - stat(target, 'GlancingDamage')
+                            if effect.stat == 'Attack':
+                                dmg -= stat(target, 'Defense')
+                            else:
+                                dmg -= 0.38 * stat(target, 'Tech')
+                            dmg = max(dmg, 1)
+                            absorbed = min(shield[target], dmg)
+                            shield[target] -= absorbed
+                            hp[target] -= dmg - absorbed
+                        elif effect.kind == 'heal':
+                            if effect.stat == 'MaxHealth':
+                                amount = base[target][hlth] * effect.coef
+                            else:
+                                amount = stat(caster, 'Tech') * effect.coef
+                            hp[target] = min(
+                                hp[target] + amount, base[target][hlth]
+                            )
+                        elif effect.kind == 'shield':
+                            shield[target] += (
+                                stat(caster, 'Tech') * effect.coef
+                            )
+                        else:
+                            delta = effect.coef if effect.flat else (
+                                effect.coef
+                                * base[target][STAT_INDEX[effect.stat]]
+                            )
+                            sign = 1 if effect.coef > 0 else -1
+                            mods[target][(effect.stat, sign)] = [
+                                delta, effect.duration
+                            ]
+
+                # tick down the caster's buffs and debuffs
+                for key in list(mods[caster]):
+                    mods[caster][key][1] -= 1
+                    if mods[caster][key][1] <= 0:
+                        del mods[caster][key]
+
+                alliesAlive, enemiesAlive = teamAlive(0), teamAlive(1)
+                if not alliesAlive:
+                    return -1, rnd + 1
+                if not enemiesAlive:
+                    return 1, rnd + 1
+        return 0, self.maxRounds
+
+    def simulate(self, numBattles, seed=None):
+        """Plays the given number of battles.
+
+        Args:
+            numBattles (int): The number of battles to play.
+            seed (int): A seed for the random number generator.
+
+        Returns:
+            BattleResults: The outcomes of the battles.
+
+        Raises:
+            ValueError: If `numBattles` is less than 1.
+
+        """
+        if numBattles < 1:
+            raise ValueError(
+                'numBattles must be at least 1, not {!r}'.format(numBattles)
+            )
+        rng = np.random.default_rng(seed)
+        outcomes = [self.run(rng) for _ in range(numBattles)]
+        return BattleResults(
+            [winner for winner, _ in outcomes],
+            [rounds for _, rounds in outcomes]
+        )
+
+class BatchBattleSim(BattleSim):
+    """A structure-of-arrays battle kernel that plays many battles at
+    once.
+
+    The constructor and the `simulate` method have the same signatures
+    as those of `BattleSim`. Every battle is played with the same
+    teams. Health, shields, and stat modifiers are stored in NumPy
+    arrays with one row per unit and one column per battle, and each
+    unit's turn is applied to all battles simultaneously with
+    vectorized random draws.
+
+    Attributes:
+        baseStats (numpy.ndarray): The total stats of the units, with
+            one row per unit, and columns ordered as in
+            `STAT_ABBREVIATIONS`.
+        teams (numpy.ndarray): The team of each unit.
+        chunkSize (int): The maximum number of battles played
+            simultaneously by the `simulate` method. Defaults to
+            50,000.
+
+    """
+
+    def __init__(
+        self, allies, enemies, allyRoster, enemyRoster=None, maxRounds=10
+    ):
+        BattleSim.__init__(
+            self, allies, enemies, allyRoster, enemyRoster, maxRounds
+        )
+        self.baseStats = np.array([unit.stats for unit in self.units])
+        self.teams = np.array([unit.team for unit in self.units])
+        self.chunkSize = 50000
+
+    def candidateMask(self, caster, targetType):
+        """Returns a boolean array with one entry per unit indicating
+        which units a skill with the given target type, cast by the
+        given unit, may target.
+
+        """
+        mask = np.zeros(len(self.units), dtype=bool)
+        mask[self.candidates(caster, targetType)] = True
+        return mask
+
+    def run(self, rng, numBattles=1):
+        """Plays the given number of battles simultaneously.
+
+        Args:
+            rng (numpy.random.Generator): The random number generator.
+            numBattles (int): The number of battles to play.
+
+        Returns:
+            tuple: (`numpy.ndarray`, `numpy.ndarray`) The winners and
+                the number of rounds played, one entry per battle.
+
+        """
+        # pylint: disable=too-many-locals, arguments-differ
+        # all per-battle arrays are unit-major, with one row per unit and
+        # one column per battle
+        numUnits = len(self.units)
+        shape = (numUnits, numBattles)
+        hlth = STAT_INDEX['Health']
+        base = self.baseStats[:, :, None]
+        hp = np.repeat(base[:, hlth], numBattles, axis=1)
+        shield = np.zeros(shape)
+        # stat modifiers, indexed by stat, then 0 for buffs and 1 for
+        # debuffs, then unit, then battle
+        delta = np.zeros((len(STAT_INDEX), 2) + shape)
+        turns = np.zeros((len(STAT_INDEX), 2) + shape, np.int32)
+        modded = np.zeros(numUnits, dtype=bool) # units with active mods
+        winners = np.zeros(numBattles, int)
+        rounds = np.full(numBattles, self.maxRounds)
+        done = np.zeros(numBattles, dtype=bool)
+        allyRows = self.teams == 0
+        candMasks = {}
+
+        def stat(statName, unit=None):
+            index = STAT_INDEX[statName]
+            if unit is None:
+                return base[:, index] + delta[index, 0] + delta[index, 1]
+            return (
+                base[unit, index] + delta[index, 0, unit]
+                + delta[index, 1, unit]
+            )
+
+        for rnd in range(self.maxRounds):
+            for caster in self.order:
+                active = (hp[caster] > 0) & ~done
+                if not active.any():
+                    continue
+                targetType, numTargets, isAOE, effects = (
+                    self.units[caster].schedule[rnd]
+                )
+                key = (caster, targetType)
+                if key not in candMasks:
+                    candMasks[key] = self.candidateMask(caster, targetType)
+                cands = (hp > 0) & candMasks[key][:, None] & active
+                if not isAOE and numTargets < numUnits:
+                    keys = rng.random(shape)
+                    keys[~cands] = 2
+                    if numTargets == 1:
+                        picked = np.zeros(shape, dtype=bool)
+                        picked[keys.argmin(axis=0), np.arange(numBattles)] = (
+                            True
+                        )
+                    else:
+                        picked = (
+                            keys.argsort(axis=0).argsort(axis=0) < numTargets
+                        )
+                    cands &= picked
+                casterMask = np.zeros(shape, dtype=bool)
+                casterMask[caster] = active
+                for effect in effects:
+                    targets = casterMask if effect.onCaster else cands
+                    targets = targets & (hp > 0)
+                    if effect.chance < 1:
+                        targets &= rng.random(shape) < effect.chance
+                    if not targets.any():
+                        continue
+                    if effect.kind == 'damage':
+                        dmg = np.repeat(
+                            stat(effect.stat, caster)[None, :] * effect.coef,
+                            numUnits, axis=0
+                        )
+                        crits = rng.random(shape) < stat('CritChance', caster)
+                        dmg *= np.where(crits, stat('CritDamage', caster), 1)
+                        glances = rng.random(shape) < stat('GlancingChance')
+                        dmg *= np.where(
+                            glances, 1 - stat('GlancingDamage'), 1
+                        )
+                        if effect.stat == 'Attack':
+                            dmg -= stat('Defense')
+                        else:
+                            dmg -= 0.38 * stat('Tech')
+                        dmg = np.where(targets, np.maximum(dmg, 1), 0)
+                        absorbed = np.minimum(shield, dmg)
+                        shield -= absorbed
+                        hp -= dmg - absorbed
+                    elif effect.kind == 'heal':
+                        if effect.stat == 'MaxHealth':
+                            amount = base[:, hlth] * effect.coef
+                        else:
+                            amount = stat('Tech', caster) * effect.coef
+                        hp = np.where(
+                            targets, np.minimum(hp + amount, base[:, hlth]), hp
+                        )
+                    elif effect.kind == 'shield':
+                        shield += np.where(
+                            targets, stat('Tech', caster) * effect.coef, 0
+                        )
+                    else:
+                        index = STAT_INDEX[effect.stat]
+                        slot = 0 if effect.coef > 0 else 1
+                        value = effect.coef if effect.flat else (
+                            effect.coef * base[:, index]
+                        )
+                        delta[index, slot] = np.where(
+                            targets, value, delta[index, slot]
+                        )
+                        turns[index, slot][targets] = effect.duration
+                        modded |= targets.any(axis=1)
+
+                # tick down the caster's buffs and debuffs
+                if modded[caster]:
+                    casterTurns = turns[:, :, caster]
+                    casterTurns -= active
+                    np.maximum(casterTurns, 0, out=casterTurns)
+                    delta[:, :, caster] *= casterTurns > 0
+                    modded[caster] = casterTurns.any()
+
+                alliesAlive = (hp[allyRows] > 0).any(axis=0)
+                enemiesAlive = (hp[~allyRows] > 0).any(axis=0)
+                finished = ~done & ~(alliesAlive & enemiesAlive)
+                winners[finished & ~alliesAlive] = -1
+                winners[finished & alliesAlive] = 1
+                rounds[finished] = rnd + 1
+                done |= finished
+            if done.all():
+                break
+        return winners, rounds
+
+    def simulate(self, numBattles, seed=None):
+        """Plays the given number of battles. To bound memory use, the
+        battles are played in chunks of at most `chunkSize` battles.
+
+        Args:
+            numBattles (int): The number of battles to play.
+            seed (int): A seed for the random number generator.
+
+        Returns:
+            BattleResults: The outcomes of the battles.
+
+        Raises:
+            ValueError: If `numBattles` is less than 1.
+
+        """
+        if numBattles < 1:
+            raise ValueError(
+                'numBattles must be at least 1, not {!r}'.format(numBattles)
+            )
+        rng = np.random.default_rng(seed)
+        winners, rounds = [], []
+        for start in range(0, numBattles, self.chunkSize):
+            chunkWinners, chunkRounds = self.run(
+                rng, min(self.chunkSize, numBattles - start)
+            )
+            winners.append(chunkWinners)
+            rounds.append(chunkRounds)
+        return BattleResults(np.concatenate(winners), np.concatenate(rounds))
@@ -0,0 +1,258 @@
+"""Tools used to choose a bridge crew for an away team.
+
+Each of the stations in `BRIDGE_STATIONS` may be occupied by one
+character who is not on the away team, and who is eligible for that
+station. The bridge skill of each bridge crew member boosts a stat of
+every away team member, or only of those away team members that have a
+particular tag. The `BridgeCrew` class precomputes the boost that every
+candidate gives to every character in the roster, so that many away
+team and bridge crew combinations can be evaluated at once, and
+assigns candidates to stations to maximize the total boost.
+
+"""
+
+import numpy as np
+from legends.constants import BRIDGE_STATIONS, POWER_GRADIENT
+from legends.constants import STAT_ABBREVIATIONS
+from legends.loadout import assignMax
+from legends.roster import RosterReloadEvent
+
+__all__ = ['BridgeCrew', 'BOOST_NAMES']
+
+BOOST_NAMES = list(STAT_ABBREVIATIONS) + ['Resistance']
+"""`list` of `str`: The names of the boosts a bridge skill can give,
+which are the stat names in `STAT_ABBREVIATIONS` together with
+'Resistance', the chance to resist detrimental effects."""
+
+class BridgeCrew():
+    """Chooses bridge crews for away teams.
+
+    The value of a bridge crew for a given away team is the weighted sum
+    of the boosts it gives to the members of the away team. Boosts are
+    added together, and boosts given as a fraction of a stat use the
+    total stats (including gear and particles) of the away team member.
+    Boost values are stored for retrieval, and the boosts received by a
+    character are recomputed when the roster's `charChangeWatcher`
+    reports that the character has changed.
+
+    Attributes:
+        roster (legends.roster.Roster): The roster from which the away
+            team and bridge crew are chosen.
+        weights (dict): {`str`:`float`} A dictionary mapping names in
+            `BOOST_NAMES` to their weights. Defaults to
+            `POWER_GRADIENT`, so that the value of a bridge crew is the
+            power it adds to the away team.
+        chars (list of legends.gameobjects.Character): The characters in
+            the roster, in the order used to index the arrays of boosts.
+        candidates (list of int): Indices into `chars` of the characters
+            that can serve on the bridge, meaning they have a bridge
+            skill with an effect and at least one bridge station.
+
+    """
+
+    def __init__(self, roster, weights=None):
+        self.roster = roster
+        if weights is None:
+            weights = POWER_GRADIENT.copy()
+        self.weights = weights
+        self._build()
+        self.roster.charChangeWatcher.subscribe(self.onCharChange, weak=True)
+
+    @property
+    def values(self):
+        """`numpy.ndarray`: A square array whose entry in row `i` and
+        column `j` is the value of the boost the character `chars[i]`
+        gives to the character `chars[j]` from the bridge.
+        """
+        self._refresh()
+        return self._values
+
+    def boosts(self, team, bridge):
+        """Computes the boosts the given bridge crew gives to each
+        member of the given away team.
+
+        Args:
+            team (list of str): The name IDs of the away team.
+            bridge (list of str): The name IDs of the bridge crew.
+
+        Returns:
+            dict: {`str`:{`str`:`float`}} A dictionary mapping the name
+                IDs of the away team to dictionaries that map names in
+                `BOOST_NAMES` to the total boost.
+
+        """
+        self._refresh()
+        rows = [self._index[nameID] for nameID in bridge]
+        return {
+            nameID: dict(zip(
+                BOOST_NAMES,
+                self._boosts[rows, self._index[nameID]].sum(axis=0).tolist()
+            ))
+            for nameID in team
+        }
+
+    def value(self, team, bridge):
+        """Computes the value of the given bridge crew for the given
+        away team.
+
+        Args:
+            team (list of str): The name IDs of the away team.
+            bridge (list of str): The name IDs of the bridge crew.
+
+        Returns:
+            float: The total value of the boosts.
+
+        """
+        return float(self.evaluate(
+            [self.indices(team)], [self.indices(bridge)]
+        )[0])
+
+    def evaluate(self, teams, bridges):
+        """Computes the values of many pairs of away teams and bridge
+        crews at once.
+
+        Args:
+            teams (numpy.ndarray): An array of shape (N, 4), whose rows
+                are the indices in `chars` of the away teams.
+            bridges (numpy.ndarray): An array of shape (N, M), whose
+                rows are the indices in `chars` of the bridge crews.
+
+        Returns:
+            numpy.ndarray: An array of length N containing the values of
+                the pairs.
+
+        """
+        teams = np.asarray(teams)
+        bridges = np.asarray(bridges)
+        values = self.values
+        return values[bridges[:, :, None], teams[:, None, :]].sum(
+            axis=(1, 2)
+        )
+
+    def indices(self, nameIDs):
+        """Converts name IDs to indices in `chars`.
+
+        Args:
+            nameIDs (list of str): The name IDs.
+
+        Returns:
+            list of int: The indices.
+
+        """
+        return [self._index[nameID] for nameID in nameIDs]
+
+    def optimize(self, team):
+        """Finds the bridge crew of greatest value for the given away
+        team. No character on the away team is placed on the bridge.
+
+        Args:
+            team (list of str): The name IDs of the away team.
+
+        Returns:
+            tuple: (`float`, `dict`) The value of the bridge crew, and a
+                dictionary mapping bridge stations to the name IDs of
+                the characters assigned to them. Stations that cannot be
+                usefully filled are omitted.
+
+        """
+        teamRows = self.indices(team)
+        cands = [index for index in self.candidates if index not in teamRows]
+        scores = self.values[cands][:, teamRows].sum(axis=1)
+        grid = np.full((len(BRIDGE_STATIONS), len(cands)), -np.inf)
+        for col, index in enumerate(cands):
+            for station in self.chars[index].bridgeStations:
+                grid[BRIDGE_STATIONS.index(station), col] = scores[col]
+        stations = {}
+        total = 0
+        for row, col in assignMax(grid):
+            stations[BRIDGE_STATIONS[row]] = self.chars[cands[col]].nameID
+            total += scores[col]
+        return float(total), stations
+
+    def onCharChange(self, charChangeEvent):
+        """Marks the boosts received by a character as out of date when
+        the character is modified. When the roster is reloaded, the
+        characters and candidates are listed again from the roster, and
+        all boosts are recomputed.
+
+        Args:
+            charChangeEvent (legends.roster.CharChangeEvent): The event
+                sent by the roster's `charChangeWatcher` event handler.
+
+        """
+        if isinstance(charChangeEvent, RosterReloadEvent):
+            self._build()
+            return
+        index = self._index.get(charChangeEvent.char.nameID)
+        if index is not None:
+            self._stale.add(index)
+
+    def _build(self):
+        """Lists the characters in the roster and the candidates, and
+        builds the tables of the boosts their bridge skills give. Every
+        boost is marked as out of date.
+
+        """
+        self.chars = list(self.roster.chars.values())
+        self._index = {
+            char.nameID: index for index, char in enumerate(self.chars)
+        }
+        self.candidates = [
+            index for index, char in enumerate(self.chars)
+            if char.bridgeSkill is not None and char.bridgeSkill.effects
+            and char.bridgeStations
+        ]
+
+        # one row per candidate: the tag affected and the boost given
+        numChars, numBoosts = len(self.chars), len(BOOST_NAMES)
+        self._fracs = np.zeros((numChars, numBoosts))
+        self._flats = np.zeros((numChars, numBoosts))
+        self._tags = [None] * numChars
+        for index in self.candidates:
+            skill = self.chars[index].bridgeSkill
+            effect = skill.effect
+            self._tags[index] = skill.tagAffected
+            if effect.statAffected is None:
+                self._flats[index, -1] = effect.chanceToResist
+                continue
+            statName = (
+                'Health' if effect.statAffected == 'MaxHealth'
+                else effect.statAffected
+            )
+            if statName not in STAT_ABBREVIATIONS:
+                continue
+            column = BOOST_NAMES.index(statName)
+            if effect.statSource == 'FlatValue':
+                self._flats[index, column] = effect.statSourceFrac
+            else:
+                self._fracs[index, column] = effect.statSourceFrac
+
+        self._boosts = np.zeros((numChars, numChars, numBoosts))
+        self._values = np.zeros((numChars, numChars))
+        self._stale = set(range(numChars))
+
+    def _refresh(self):
+        """Recomputes the boosts received by characters whose stats have
+        changed.
+
+        """
+        if not self._stale:
+            return
+        weights = np.array([
+            self.weights.get(boostName, 0) for boostName in BOOST_NAMES
+        ])
+        for col in self._stale:
+            char = self.chars[col]
+            stats = char.totalStats(self.roster)
+            statVec = np.array(
+                [stats.get(statName) for statName in STAT_ABBREVIATIONS]
+                + [1]
+            )
+            applies = np.array([
+                tag is None or tag in char.tags for tag in self._tags
+            ])
+            boosts = (self._fracs * statVec + self._flats) * applies[:, None]
+            boosts[col] = 0 # a character cannot boost itself
+            self._boosts[:, col] = boosts
+            self._values[:, col] = boosts @ weights
+        self._stale.clear()
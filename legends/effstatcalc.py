@@ -5,7 +5,7 @@
 import itertools
 from legends.utils.functions import formatDict
 from legends.gameobjects import Particle
-from legends.roster import Roster
+from legends.roster import Roster, RosterReloadEvent
 from legends.stats import EffStats, StatMods, ThreatStats
 
 __all__ = [
@@ -78,8 +78,8 @@ class EnemyCharSettings():
 
         self._statMods = StatMods()
 
-        self.roster.charChangeWatcher.subscribe(self.onCharChange)
-        self.statMods.onChange.subscribe(lambda event:self.parent.update())
+        self.roster.charChangeWatcher.subscribe(self.onCharChange, weak=True)
+        self.statMods.onChange.subscribe(self.onStatModsChange)
 
     @property
     def parent(self):
@@ -129,17 +129,33 @@ class EnemyCharSettings():
     def onCharChange(self, charChangeEvent):
         """Triggered when the associated roster sends a
         `legends.roster.CharChangeEvent`. If it is the enemy character
-        that changed, the parent `EnemyChar` instance is forced to
-        update its threat statistics. Otherwise, nothing happens.
+        that changed, or if the roster was reloaded, the parent
+        `EnemyChar` instance is forced to update its threat statistics.
+        Otherwise, nothing happens.
 
         Args:
             charChangeEvent (legends.roster.CharChangeEvent): The event
                 sent by the associated roster.
 
         """
-        if charChangeEvent.char is self.char:
+        if (
+            isinstance(charChangeEvent, RosterReloadEvent)
+            or charChangeEvent.char is self.char
+        ):
             self.parent.update()
 
+    # pylint: disable-next=unused-argument
+    def onStatModsChange(self, statChangeEvent):
+        """Triggered when the `statMods` property changes. Forces the
+        parent `EnemyChar` instance to update its threat statistics.
+
+        Args:
+            statChangeEvent (legends.stats.StatChangeEvent): The event
+                sent by the `statMods` property.
+
+        """
+        self.parent.update()
+
 class EnemyChar():
     """Used to calculate the threat posed by an enemy character.
 
@@ -450,14 +466,17 @@ class EffStatCalc():
 
     def __init__(self, roster):
         """The constructor assigns the constructed instance to the given
-        roster, subscribes to the roster's `charChangeWatcher` event
-        handler with the `EffStatCalc.onCharChange` method, and sets the
+        roster, subscribes weakly to the roster's `charChangeWatcher`
+        event handler with the `EffStatCalc.onCharChange` method, so
+        that the roster does not keep the calculator alive, and sets the
         `roster` property accordingly.
 
         """
         self._settings = EffStatSettings(self)
         self._roster = roster
-        self._roster.charChangeWatcher.subscribe(self.onCharChange)
+        self._roster.charChangeWatcher.subscribe(
+            self.onCharChange, weak=True
+        )
         self._data = {}
 
     @property
@@ -542,6 +561,31 @@ class EffStatCalc():
             ValueError: If any settings attributes have not yet been
                 instantiated. (See `EffStatSettings.ready`.)
 
+        """
+        return self.calculateFromStats(
+            char.totalStats(self.roster), char.partEffects(self.roster)
+        )
+
+    def calculateFromStats(self, stats, partEffects):
+        """Calculates the effective stats of a character with the given
+        total stats and particle effects, and returns them as a stat
+        dictionary. This allows effective stats to be computed for
+        equipment that is not actually equipped.
+
+        Args:
+            stats (legends.stats.Stats): The total stats of the
+                character, including gear and particles.
+            partEffects (legends.stats.PartEffects): The total effects
+                of the character's particles.
+
+        Returns:
+            dict: {`str`:`float`} A dictionary mapping effective stat
+                names, as they appear in `EFF_STATS` to their values.
+
+        Raises:
+            ValueError: If any settings attributes have not yet been
+                instantiated. (See `EffStatSettings.ready`.)
+
         """
         if not self.settings.ready:
             raise ValueError(
@@ -549,10 +593,8 @@ class EffStatCalc():
             )
         statDict = {}
 
-        # get stats and particle effects
-        stats = char.totalStats(self.roster)
+        # apply stat modifiers
         stats = self.settings.statMods.apply(stats)
-        partEffects = char.partEffects(self.roster)
 
         # compute effective attack and tech damage
         stats.att *= 1 + partEffects.attUp * self.settings.ampForceRounds
@@ -607,6 +649,9 @@ class EffStatCalc():
 
     def onCharChange(self, charChangeEvent):
         """Recalculates effective stats when a character is modified.
+        When the roster is reloaded, the effective stats of characters
+        no longer in the roster are discarded, and all others are
+        recalculated.
 
         Args:
             charChangeEvent (legends.roster.CharChangeEvent): The event
@@ -614,5 +659,11 @@ class EffStatCalc():
                 handler.
 
         """
+        if isinstance(charChangeEvent, RosterReloadEvent):
+            for nameID in list(self._data):
+                if nameID not in self.roster.chars:
+                    del self._data[nameID]
+            self.updateAll()
+            return
         if charChangeEvent.char.nameID in self._data:
             self.update(charChangeEvent.char)
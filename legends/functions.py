@@ -3,9 +3,13 @@
 """
 
 from base64 import b64decode
-from zlib import decompress
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from itertools import chain
+from zlib import decompress, decompressobj
 from json import loads
 from getpass import getuser
+from os import environ
 from plistlib import load
 from legends.utils.functions import AESdecrypt
 #pylint: disable-next=no-name-in-module
@@ -20,13 +24,16 @@ __all__ = [
     'cleanTime',
     'decompressData',
     'decryptSaveFile',
+    'decryptSlotData',
     'gearToMaxCost',
     'gearUpgradeCost',
     'getBasicGearID',
     'getCharStats',
     'getGearStats',
     'getPartStats',
+    'iterDecompressed',
     'levelFromXP',
+    'loadCompressed',
     'saveFilePath',
     'skillToMaxCost',
     'skillUpgradeCost',
@@ -104,15 +111,100 @@ def decompressData(text):
         str: The decompressed data, typically a json string.
 
     """
-    b64data = text.encode('utf-16')
+    try:
+        b64data = text.encode('ascii')
+    except UnicodeEncodeError:
+        b64data = text.encode('utf-16')
     compressedData = b64decode(b64data)
     data = decompress(compressedData, -15)
     return data.decode('utf-8')
 
-def decryptSaveFile():
+# every byte that cannot appear in base-64 encoded data
+_NOT_BASE64 = bytes(
+    set(range(256)) - set(
+        b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/='
+    )
+)
+
+def _inflate(chunks):
+    """Base-64 decodes and decompresses the given chunks of text.
+
+    Args:
+        chunks (iterable): An iterable of `str` or `bytes` objects,
+            which together form the compressed text.
+
+    Yields:
+        bytes: The decompressed data, in chunks.
+
+    """
+    decoder = decompressobj(-15)
+    pending = b''
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii', 'ignore')
+        pending += chunk.translate(None, _NOT_BASE64)
+        size = len(pending) // 4 * 4
+        if size:
+            yield decoder.decompress(b64decode(pending[:size]))
+            pending = pending[size:]
+    if pending:
+        yield decoder.decompress(b64decode(pending))
+    yield decoder.flush()
+
+def iterDecompressed(stream, chunkSize=65536):
+    """Decompresses data compressed in the manner described in the
+    `decompressData` function, reading it from a file-like object one
+    chunk at a time, so that the compressed data is never held in
+    memory all at once. If the decompressed data begins with 'compr-',
+    the remainder is decompressed once more, in the same way.
+
+    Args:
+        stream (file): A file-like object, in text or binary mode,
+            containing the compressed text.
+        chunkSize (int): The number of characters to read at a time.
+
+    Yields:
+        bytes: The decompressed data, in chunks.
+
+    """
+    chunks = _inflate(iter(lambda: stream.read(chunkSize), stream.read(0)))
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= 6:
+            break
+    if head[:6] == b'compr-':
+        yield from _inflate(chain([head[6:]], chunks))
+    else:
+        yield head
+        yield from chunks
+
+def loadCompressed(stream):
+    """Decompresses and parses json data compressed in the manner
+    described in the `decompressData` function.
+
+    Args:
+        stream (file or str): A file-like object containing the
+            compressed text, or the text itself.
+
+    Returns:
+        obj: The parsed data, typically a dictionary.
+
+    """
+    if isinstance(stream, str):
+        stream = StringIO(stream)
+    return loads(b''.join(iterDecompressed(stream)))
+
+def decryptSaveFile(workers=None):
     """Finds the STL save file on the local hard drive, then decrypts
     and parses it into a dictionary.
 
+    Args:
+        workers (int): If given, the three save slots are decrypted and
+            parsed in parallel, using a pool of this many threads.
+            Decryption and decompression release the GIL, so this is
+            faster than decrypting the slots one after another.
+
     Returns:
         dict: The decrypted save file as a dictionary.
 
@@ -120,21 +212,45 @@ def decryptSaveFile():
     with open(saveFilePath(), 'rb') as f:
         saveFile = load(f)
     saveFile.pop('CloudKitAccountInfoCache', None)
-    for i in range(3):
-        key = str(i) + ' data'
-        if len(saveFile.get(key, '')) == 0:
-            saveFile[key] = {}
-            continue
-        slotData = AESdecrypt(
-            saveFile[key],
-            'K1FjcmVkc2Vhc29u',
-            'LH75Qxpyf0prVvImu4gqxg=='
-        )
-        if slotData[:6] == 'compr-':
-            slotData = decompressData(slotData[6:])
-        saveFile[key] = loads(slotData)
+    keys = [str(i) + ' data' for i in range(3)]
+    cipherTexts = [saveFile.get(key, '') for key in keys]
+    if workers is None:
+        slots = map(decryptSlotData, cipherTexts)
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            slots = list(pool.map(decryptSlotData, cipherTexts))
+    for key, slotData in zip(keys, slots):
+        saveFile[key] = slotData
     return saveFile
 
+def decryptSlotData(cipherText, parse=True):
+    """Decrypts the data of one save slot, as stored in the STL save
+    file, decompresses it if necessary, and parses it.
+
+    Args:
+        cipherText (str): The encrypted slot data.
+        parse (bool): `False` if the decrypted json string should be
+            returned without parsing it.
+
+    Returns:
+        dict or str: The slot data as a dictionary, or as a json string
+            if `parse` is `False`. An empty slot gives an empty
+            dictionary or an empty string.
+
+    """
+    if len(cipherText) == 0:
+        return {} if parse else ''
+    slotData = AESdecrypt(
+        cipherText,
+        'K1FjcmVkc2Vhc29u',
+        'LH75Qxpyf0prVvImu4gqxg=='
+    )
+    if slotData[:6] == 'compr-':
+        if parse:
+            return loadCompressed(StringIO(slotData[6:]))
+        slotData = decompressData(slotData[6:])
+    return loads(slotData) if parse else slotData
+
 def gearToMaxCost(gearID, currLvl, finalLvl):
     """Computes and returns the cost of leveling the given gear from the
     given current level to the given final level.
@@ -311,12 +427,17 @@ def levelFromXP(xp, rarity='Common'):
     return level
 
 def saveFilePath():
-    """Creates and return the complete path of the STL save file.
+    """Creates and return the complete path of the STL save file. If the
+    environment variable `STL_SAVE_FILE` is set, its value is used
+    instead, so that a save file copied to another location, or to
+    another operating system, can be read.
 
     Returns:
         str: The complete path of the save file.
 
     """
+    if environ.get('STL_SAVE_FILE'):
+        return environ['STL_SAVE_FILE']
     return (
         '/Users/' + getuser() + '/Library/Containers/'
         + 'com.tiltingpoint.startrek/Data/Library/Preferences/'
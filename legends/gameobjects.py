@@ -2,6 +2,7 @@
 
 """
 
+from copy import copy
 from re import findall
 from legends.utils.objrelations import Managed
 #pylint: disable-next=no-name-in-module
@@ -219,6 +220,26 @@ class Character():
         """
         self.stats.update(getCharStats(self.nameID, self.rank, self.level))
 
+    def copy(self):
+        """Returns a copy of the character, with its own skills and its
+        own gear and particle slots. The stats of the copy are copied
+        from this character, rather than computed from the game data.
+
+        Returns:
+            Character: The copy.
+
+        """
+        char = Character.__new__(Character)
+        char._data = self._data.copy()
+        char._stats = Stats(char, self.stats.asDict)
+        char.skills = {
+            skillID: copy(skill) for skillID, skill in self.skills.items()
+        }
+        char.bridgeSkill = self.bridgeSkill
+        char.gearSlots = [GearSlot(char, slot) for slot in range(4)]
+        char.partSlots = [PartSlot(char, slot) for slot in range(2)]
+        return char
+
     def totalStats(self, roster):
         """Constructs and returns a `legends.stats.Stats` object
         containing the total stats (including gear and particles) of the
@@ -465,6 +486,21 @@ class Gear(Managed):
         """
         self.stats.update(getGearStats(self.gearID, self.level))
 
+    def copy(self):
+        """Returns a copy of the gear piece. The stats of the copy are
+        copied from this gear piece, rather than computed from the game
+        data.
+
+        Returns:
+            Gear: The copy.
+
+        """
+        gear = Gear.__new__(Gear)
+        gear.gearID = self.gearID
+        gear._level = self._level
+        gear._stats = Stats(gear, self.stats.asDict)
+        return gear
+
     def itemsToMax(self, roster):
         """Computes and returns the items needed to level this gear to
         its maximum level. The gear must be equipped on a character, and
@@ -610,6 +646,18 @@ class Particle(Managed):
         self._statNames[index] = statName
         self.updateStats()
 
+    def setStatNames(self, statNames):
+        """Sets every value of the `statNames` property at once, calling
+        the `Particle.updateStats` method only once.
+
+        Args:
+            statNames (iterable of str): Up to four stat names, any of
+                which may be `None`.
+
+        """
+        self._statNames = (list(statNames) + [None] * 4)[:4]
+        self.updateStats()
+
     def updateStats(self):
         """Updates the `stats` attribute.
 
@@ -620,6 +668,26 @@ class Particle(Managed):
         ]
         self.stats.update(getPartStats(self.rarity, self.level, statList))
 
+    def copy(self):
+        """Returns a copy of the particle. The copy shares the passive
+        skill and effects of this particle, which do not change, and
+        its stats are copied from this particle, rather than computed
+        from the game data.
+
+        Returns:
+            Particle: The copy.
+
+        """
+        part = Particle.__new__(Particle)
+        part._data = self._data.copy()
+        part._key = self._key
+        part.passive = self.passive
+        part.effects = self.effects
+        part.locked = self.locked
+        part._statNames = self._statNames.copy()
+        part._stats = Stats(part, self.stats.asDict)
+        return part
+
     def __repr__(self):
         return (
             '<' + repr(self.typ) + ', ' + repr(self.rarity)
@@ -0,0 +1,323 @@
+"""The `legends.journal.RosterJournal` class.
+
+A `RosterJournal` records the edits made to a roster, so that they can
+be undone and redone without reloading the save file. Each recorded
+edit holds the state of one object before and after the edit. The
+states are small tuples, taken from a cache of the current state of
+every object in the roster, so recording an edit does not copy any part
+of the roster.
+
+"""
+
+from collections import deque
+from legends.roster import RosterReloadEvent
+
+__all__ = ['RosterJournal']
+
+def _setCharState(roster, char, state): # pylint: disable=unused-argument
+    """Restores the rank and xp of a character."""
+    char.rank, char.xp = state
+
+def _setGearState(roster, gear, level):
+    """Restores the level of a gear piece."""
+    gear.setLevel(roster, level)
+
+def _setPartState(roster, part, state): # pylint: disable=unused-argument
+    """Restores the level and stat names of a particle."""
+    level, statNames = state
+    if part.level != level:
+        part.level = level
+    if part.statNames != statNames:
+        part.setStatNames(statNames)
+
+def _setSlot(roster, target, slot):
+    """Restores the slot of a gear piece or particle, which is `None` if
+    it is not equipped.
+
+    """
+    rel, item = target
+    if rel.get(item) is slot:
+        return
+    rel.pop(item, None)
+    if slot is None:
+        return
+    if rel is roster.inGearSlot:
+        rel.enforceLevel = False
+        try:
+            rel[item] = slot
+        finally:
+            rel.enforceLevel = True
+    else:
+        rel[item] = slot
+
+class RosterJournal():
+    """A journal of the edits made to a roster.
+
+    The journal records changes to the rank and xp of characters, the
+    level of gear, the level and stats of particles, and the equipping
+    and unequipping of gear and particles. These are detected through
+    the event handlers of the roster, so edits are recorded however
+    they are made. Each call to `RosterJournal.undo` reverts one step,
+    and each call to `RosterJournal.redo` repeats one. A step is a
+    single edit, or all the edits made in one
+    `legends.roster.CharChangeWatcher.transaction` block of the
+    roster's `charChangeWatcher`. Undoing and redoing a step takes time
+    proportional to the number of edits in the step, regardless of the
+    size of the roster or the length of the journal. Making a new edit
+    discards the steps that could be redone.
+
+    Only the last `maxSteps` steps are kept. Adding or removing
+    characters, gear, or particles is not recorded; after doing so, the
+    journal should be cleared with `RosterJournal.clear`. The journal
+    is cleared automatically when the roster is reloaded.
+
+    Attributes:
+        roster (legends.roster.Roster): The roster being recorded.
+        maxSteps (int): The maximum number of steps that can be undone.
+
+    """
+
+    def __init__(self, roster, maxSteps=1000):
+        """The constructor records the current state of the roster and
+        starts recording edits.
+
+        Args:
+            roster (legends.roster.Roster): The roster to record.
+            maxSteps (int): The value of the `maxSteps` attribute.
+
+        """
+        self.roster = roster
+        self.maxSteps = maxSteps
+        self._undo = deque(maxlen=maxSteps)
+        self._redo = []
+        self._step = []
+        self._states = {}
+        self._replaying = False
+        self.clear()
+        roster.chars.subscribe(self.onCharChange)
+        roster.gear.subscribe(self.onGearChange)
+        roster.parts.subscribe(self.onPartChange)
+        roster.inGearSlot.onChange.subscribe(self.onGearSlotChange)
+        roster.inPartSlot.onChange.subscribe(self.onPartSlotChange)
+        roster.charChangeWatcher.subscribe(self.onRosterChange)
+        roster.charChangeWatcher.subscribeBatch(self.onCharBatch)
+
+    @property
+    def canUndo(self):
+        """`bool`: `True` if there is a step that can be undone."""
+        self._endStep()
+        return bool(self._undo)
+
+    @property
+    def canRedo(self):
+        """`bool`: `True` if there is a step that can be redone."""
+        self._endStep()
+        return bool(self._redo)
+
+    def clear(self):
+        """Discards every recorded step, and records the current state
+        of the roster.
+
+        """
+        self._undo.clear()
+        self._redo.clear()
+        self._step = []
+        roster = self.roster
+        self._states = {
+            char: (char.rank, char.xp) for char in roster.chars.values()
+        }
+        self._states.update((gear, gear.level) for gear in roster.gear)
+        self._states.update(
+            (part, (part.level, part.statNames)) for part in roster.parts
+        )
+
+    def close(self):
+        """Stops recording edits and discards every recorded step.
+
+        """
+        roster = self.roster
+        roster.chars.unsubscribe(self.onCharChange)
+        roster.gear.unsubscribe(self.onGearChange)
+        roster.parts.unsubscribe(self.onPartChange)
+        roster.inGearSlot.onChange.unsubscribe(self.onGearSlotChange)
+        roster.inPartSlot.onChange.unsubscribe(self.onPartSlotChange)
+        roster.charChangeWatcher.unsubscribe(self.onRosterChange)
+        roster.charChangeWatcher.unsubscribeBatch(self.onCharBatch)
+        self._undo.clear()
+        self._redo.clear()
+        self._step = []
+        self._states = {}
+
+    def undo(self):
+        """Reverts the last step that was not undone.
+
+        Returns:
+            bool: `True` if a step was undone, `False` if there was
+                nothing to undo.
+
+        """
+        if not self.canUndo:
+            return False
+        step = self._undo.pop()
+        self._replay([
+            (setState, target, old) for setState, target, old, _
+            in reversed(step)
+        ])
+        self._redo.append(step)
+        return True
+
+    def redo(self):
+        """Repeats the last step that was undone.
+
+        Returns:
+            bool: `True` if a step was redone, `False` if there was
+                nothing to redo.
+
+        """
+        if not self.canRedo:
+            return False
+        step = self._redo.pop()
+        self._replay([
+            (setState, target, new) for setState, target, _, new in step
+        ])
+        self._undo.append(step)
+        return True
+
+    def onCharChange(self, statChangeEvent):
+        """Records a change to the rank or xp of a character.
+
+        Args:
+            statChangeEvent (legends.stats.StatChangeEvent): The stat
+                change event sent by the roster's `chars` property.
+
+        """
+        char = statChangeEvent.parent
+        self._record(_setCharState, char, (char.rank, char.xp))
+
+    def onGearChange(self, statChangeEvent):
+        """Records a change to the level of a gear piece.
+
+        Args:
+            statChangeEvent (legends.stats.StatChangeEvent): The stat
+                change event sent by the roster's `gear` property.
+
+        """
+        gear = statChangeEvent.parent
+        self._record(_setGearState, gear, gear.level)
+
+    def onPartChange(self, statChangeEvent):
+        """Records a change to the level or stats of a particle.
+
+        Args:
+            statChangeEvent (legends.stats.StatChangeEvent): The stat
+                change event sent by the roster's `parts` property.
+
+        """
+        part = statChangeEvent.parent
+        self._record(_setPartState, part, (part.level, part.statNames))
+
+    def onGearSlotChange(self, oneToOneChangeEvent):
+        """Records the equipping or unequipping of a gear piece.
+
+        Args:
+            oneToOneChangeEvent (legends.roster.OneToOneChangeEvent):
+                The event sent by the roster's `inGearSlot` attribute.
+
+        """
+        self._recordSlot(self.roster.inGearSlot, oneToOneChangeEvent)
+
+    def onPartSlotChange(self, oneToOneChangeEvent):
+        """Records the equipping or unequipping of a particle.
+
+        Args:
+            oneToOneChangeEvent (legends.roster.OneToOneChangeEvent):
+                The event sent by the roster's `inPartSlot` attribute.
+
+        """
+        self._recordSlot(self.roster.inPartSlot, oneToOneChangeEvent)
+
+    def onRosterChange(self, event):
+        """Clears the journal when the roster is reloaded.
+
+        Args:
+            event (legends.utils.eventhandler.Event): The event sent by
+                the roster's `charChangeWatcher`.
+
+        """
+        if isinstance(event, RosterReloadEvent):
+            self.clear()
+
+    # pylint: disable-next=unused-argument
+    def onCharBatch(self, charBatchEvent):
+        """Ends the current step at the end of a transaction.
+
+        Args:
+            charBatchEvent (legends.roster.CharBatchEvent): The batch
+                event sent by the roster's `charChangeWatcher`.
+
+        """
+        self._endStep()
+
+    def _record(self, setState, obj, new):
+        """Records an edit that changed the state of the given object to
+        the given state. If the previous state of the object is unknown
+        or is the same, only the cached state is updated.
+
+        """
+        old = self._states.get(obj)
+        self._states[obj] = new
+        if old is None or old == new:
+            return
+        self._add((setState, obj, old, new))
+
+    def _recordSlot(self, rel, oneToOneChangeEvent):
+        """Records the addition or removal of a pair in the given
+        relation.
+
+        """
+        if self.roster.charChangeWatcher.silent:
+            return
+        slot = oneToOneChangeEvent.value
+        if oneToOneChangeEvent.changeType == 'added':
+            old, new = None, slot
+        else:
+            old, new = slot, None
+        self._add((_setSlot, (rel, oneToOneChangeEvent.key), old, new))
+
+    def _add(self, edit):
+        """Adds an edit to the current step, which ends at once unless
+        the edit was made in a transaction.
+
+        """
+        if self._replaying:
+            return
+        self._step.append(edit)
+        self._redo.clear()
+        self._endStep()
+
+    def _endStep(self):
+        """Moves the edits of the current step, if any, to the undo
+        stack, unless a transaction is in progress.
+
+        """
+        if self._step and not self.roster.charChangeWatcher.inTransaction:
+            self._undo.append(self._step)
+            self._step = []
+
+    def _replay(self, changes):
+        """Restores the given states, in order, in a single transaction,
+        without recording the changes as new edits.
+
+        Args:
+            changes (list): [(`callable`, `obj`, `obj`)] A list of
+                triples, each consisting of a function that restores a
+                state, the target of the function, and the state.
+
+        """
+        self._replaying = True
+        try:
+            with self.roster.charChangeWatcher.transaction():
+                for setState, target, state in changes:
+                    setState(self.roster, target, state)
+        finally:
+            self._replaying = False
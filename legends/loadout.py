@@ -0,0 +1,442 @@
+"""Tools used to distribute gear and particles among the characters of a
+roster.
+
+The `LoadoutOptimizer` class treats the redistribution of equipment as
+a collection of assignment problems, one for the particles and one for
+the unequipped gear of each gear slot. The value of placing an item in
+a slot is the weighted sum of the item's stats (and, for particles,
+their effects), where the weights depend on the character that owns the
+slot. Each assignment problem is solved exactly with the Hungarian
+algorithm or, for very large problems, approximately with a greedy
+heuristic.
+
+"""
+
+import numpy as np
+from legends.constants import (
+    EFF_STATS, PART_EFFECTS, POWER_GRADIENT, STAT_ABBREVIATIONS
+)
+from legends.stats import PartEffects, Stats
+
+__all__ = ['assignMax', 'Loadout', 'LoadoutOptimizer']
+
+EXACT_LIMIT = 250000
+"""`int`: The largest assignment problem, measured by the number of
+item-slot pairs, that is solved exactly when no method is specified."""
+
+def assignMax(values, method='exact'):
+    """Assigns rows to columns so as to maximize the total value of the
+    assigned pairs. Each row and each column is used at most once, and
+    pairs with nonpositive or infinite negative values are never
+    assigned.
+
+    Args:
+        values (numpy.ndarray): A two-dimensional array of values.
+            Infeasible pairs should have the value `-numpy.inf`.
+        method (str): Either 'exact', which uses the Hungarian
+            algorithm, or 'greedy', which repeatedly assigns the most
+            valuable remaining pair.
+
+    Returns:
+        list: [(`int`, `int`)] The list of assigned (row, column) pairs.
+
+    Raises:
+        ValueError: If the method is not recognized.
+
+    """
+    values = np.where(np.isfinite(values), values, 0)
+    values = np.maximum(values, 0)
+    if values.size == 0:
+        return []
+    if method == 'greedy':
+        pairs = []
+        usedRows, usedCols = set(), set()
+        flatOrder = np.argsort(-values, axis=None, kind='stable')
+        for row, col in zip(*np.unravel_index(flatOrder, values.shape)):
+            if values[row, col] <= 0:
+                break
+            if row in usedRows or col in usedCols:
+                continue
+            usedRows.add(row)
+            usedCols.add(col)
+            pairs.append((int(row), int(col)))
+        return pairs
+    if method != 'exact':
+        raise ValueError(method)
+    transposed = values.shape[0] > values.shape[1]
+    if transposed:
+        values = values.T
+    cols = _hungarian(-values)
+    pairs = [
+        (row, col) for row, col in enumerate(cols) if values[row, col] > 0
+    ]
+    if transposed:
+        pairs = [(col, row) for row, col in pairs]
+    return pairs
+
+def _hungarian(cost):
+    """Solves the rectangular assignment problem for the given cost
+    matrix, which must have no more rows than columns, and returns the
+    column assigned to each row.
+
+    """
+    # pylint: disable=too-many-locals
+    numRows, numCols = cost.shape
+    rowPot = np.zeros(numRows + 1)
+    colPot = np.zeros(numCols + 1)
+    match = np.zeros(numCols + 1, dtype=int) # row matched to each column
+    way = np.zeros(numCols + 1, dtype=int)
+    for row in range(1, numRows + 1):
+        match[0] = row
+        col0 = 0
+        minVal = np.full(numCols + 1, np.inf)
+        used = np.zeros(numCols + 1, dtype=bool)
+        while True:
+            used[col0] = True
+            row0 = match[col0]
+            reduced = cost[row0 - 1] - rowPot[row0] - colPot[1:]
+            free = ~used[1:]
+            better = free & (reduced < minVal[1:])
+            minVal[1:][better] = reduced[better]
+            way[1:][better] = col0
+            masked = np.where(free, minVal[1:], np.inf)
+            col1 = int(np.argmin(masked)) + 1
+            delta = masked[col1 - 1]
+            rowPot[match[used]] += delta
+            colPot[used] -= delta
+            minVal[1:][free] -= delta
+            col0 = col1
+            if match[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            match[col0] = match[col1]
+            col0 = col1
+    cols = [0] * numRows
+    for col in range(1, numCols + 1):
+        if match[col]:
+            cols[match[col] - 1] = col - 1
+    return cols
+
+class Loadout():
+    """A proposed distribution of gear and particles.
+
+    Attributes:
+        gear (dict): {`legends.gameobjects.Gear`:
+            `legends.gameobjects.GearSlot`} The proposed location of
+            every gear piece that was considered by the optimizer. Gear
+            pieces mapped to `None` are left unequipped.
+        parts (dict): {`legends.gameobjects.Particle`:
+            `legends.gameobjects.PartSlot`} The proposed location of
+            every particle that was considered by the optimizer.
+            Particles mapped to `None` are left unequipped.
+        value (float): The value of the loadout, as estimated by the
+            optimizer.
+
+    """
+
+    def __init__(self, gear, parts, value):
+        self.gear = gear
+        self.parts = parts
+        self.value = value
+
+    def apply(self, roster):
+        """Moves the gear and particles in the given roster to their
+        proposed locations. The moves are made in a
+        `legends.roster.CharChangeWatcher.transaction` block, so each
+        affected character is reported once.
+
+        Args:
+            roster (legends.roster.Roster): The roster to which the
+                gear and particles belong.
+
+        """
+        with roster.charChangeWatcher.transaction():
+            for rel, proposal, inverse in (
+                (roster.inGearSlot, self.gear, roster.containsGear),
+                (roster.inPartSlot, self.parts, roster.containsPart)
+            ):
+                for item in proposal:
+                    if item in rel:
+                        del rel[item]
+                for slot in proposal.values():
+                    if slot is not None and slot in inverse:
+                        del inverse[slot]
+                for item, slot in proposal.items():
+                    if slot is not None:
+                        rel[item] = slot
+
+    def __repr__(self):
+        return 'Loadout({} gear, {} particles, value={:.1f})'.format(
+            len(self.gear), len(self.parts), self.value
+        )
+
+class LoadoutOptimizer():
+    """Redistributes the particles and unequipped gear of a roster.
+
+    If no effective stat calculator is given, the value of a stat to
+    every character is its weight in `weights`, which defaults to
+    `POWER_GRADIENT`, so that the optimizer maximizes power. If an
+    effective stat calculator is given, the value of a stat to a
+    character is the proportional increase it produces in that
+    character's effective stats, summed using the weights in `weights`.
+    In this case, the values depend on the equipment already assigned,
+    so the assignment is repeated `passes` times, recomputing the values
+    each time.
+
+    Attributes:
+        roster (legends.roster.Roster): The roster to optimize.
+        calc (legends.effstatcalc.EffStatCalc): The effective stat
+            calculator used to value stats, or `None`.
+        weights (dict): {`str`:`float`} A dictionary mapping stat names,
+            as they appear in `STAT_ABBREVIATIONS` (if `calc` is `None`)
+            or `EFF_STATS` (otherwise), to their weights.
+        priority (dict): {`str`:`float`} A dictionary mapping name IDs
+            to a multiplier applied to the value of every item placed on
+            that character. Characters not in the dictionary have a
+            multiplier of 1.
+        chars (list of legends.gameobjects.Character): The characters
+            whose equipment may change. Particles equipped on other
+            characters are left in place.
+        moveGear (bool): If `True`, gear equipped on `chars` may also be
+            moved; otherwise, only unequipped gear is placed in empty
+            gear slots.
+        method (str): The method passed to `assignMax`. If `None`,
+            problems with at most `EXACT_LIMIT` item-slot pairs are
+            solved exactly and larger ones with the greedy heuristic.
+        passes (int): The number of times the assignment is repeated
+            when using effective stats.
+
+    """
+
+    def __init__(
+        self, roster, calc=None, weights=None, priority=None, chars=None,
+        moveGear=False, method=None, passes=2
+    ):
+        # pylint: disable=too-many-arguments
+        self.roster = roster
+        self.calc = calc
+        if weights is None:
+            weights = POWER_GRADIENT.copy() if calc is None else {
+                statName: 1 for statName in EFF_STATS
+            }
+        self.weights = weights
+        self.priority = {} if priority is None else priority
+        if chars is None:
+            chars = list(roster.chars.values())
+        self.chars = chars
+        self.moveGear = moveGear
+        self.method = method
+        self.passes = passes if calc is not None else 1
+
+    def items(self):
+        """Returns the gear and particles that may be moved.
+
+        Returns:
+            tuple: (`list`, `list`) The list of
+                `legends.gameobjects.Gear` and the list of
+                `legends.gameobjects.Particle` objects that may be
+                moved.
+
+        """
+        charIDs = {id(char) for char in self.chars}
+        gear = [
+            gear for gear in self.roster.gear
+            if gear not in self.roster.inGearSlot or (
+                self.moveGear
+                and id(self.roster.inGearSlot[gear].char) in charIDs
+            )
+        ]
+        parts = [
+            part for part in self.roster.parts
+            if part not in self.roster.inPartSlot
+            or id(self.roster.inPartSlot[part].char) in charIDs
+        ]
+        return gear, parts
+
+    def optimize(self):
+        """Computes an optimal loadout. The roster is not modified; use
+        `Loadout.apply` to move the equipment.
+
+        Returns:
+            Loadout: The proposed loadout.
+
+        """
+        gear, parts = self.items()
+        gearSlots = [
+            slot for char in self.chars for slot in char.gearSlots
+            if self.moveGear or slot not in self.roster.containsGear
+        ]
+        partSlots = [slot for char in self.chars for slot in char.partSlots]
+        gearStats = _statMatrix(gear)
+        partStats = _statMatrix(parts)
+        partEffects = np.array([
+            [part.effects.get(effectName) for effectName in PART_EFFECTS]
+            for part in parts
+        ]).reshape(len(parts), len(PART_EFFECTS))
+
+        # start from the current locations
+        gearProposal = {
+            item: self.roster.inGearSlot.get(item) for item in gear
+        }
+        partProposal = {
+            item: self.roster.inPartSlot.get(item) for item in parts
+        }
+        charIndex = {id(char): index for index, char in enumerate(self.chars)}
+        for _ in range(self.passes):
+            statValues, effectValues = self.marginalValues(
+                gearProposal, partProposal
+            )
+            value = 0
+
+            # gear must go in a slot with a matching index
+            for index in range(4):
+                rows = [i for i, item in enumerate(gear) if item.slot == index]
+                cols = [
+                    j for j, slot in enumerate(gearSlots)
+                    if slot.index == index
+                ]
+                values = (
+                    gearStats[rows]
+                    @ statValues[
+                        [charIndex[id(gearSlots[j].char)] for j in cols]
+                    ].T
+                )
+                for i, row in enumerate(rows):
+                    for j, col in enumerate(cols):
+                        if not self._fits(gear[row], gearSlots[col]):
+                            values[i, j] = -np.inf
+                for item in (gear[row] for row in rows):
+                    gearProposal[item] = None
+                for i, j in assignMax(values, self._method(values)):
+                    gearProposal[gear[rows[i]]] = gearSlots[cols[j]]
+                    value += values[i, j]
+
+            rows = [charIndex[id(slot.char)] for slot in partSlots]
+            values = (
+                partStats @ statValues[rows].T
+                + partEffects @ effectValues[rows].T
+            )
+            partProposal = dict.fromkeys(parts)
+            for i, j in assignMax(values, self._method(values)):
+                partProposal[parts[i]] = partSlots[j]
+                value += values[i, j]
+        return Loadout(gearProposal, partProposal, value)
+
+    def marginalValues(self, gearProposal, partProposal):
+        """Computes the value of each stat and particle effect to each
+        character in `chars`, given the proposed locations of the
+        movable equipment.
+
+        Args:
+            gearProposal (dict): {`legends.gameobjects.Gear`:
+                `legends.gameobjects.GearSlot`} The proposed gear
+                locations.
+            partProposal (dict): {`legends.gameobjects.Particle`:
+                `legends.gameobjects.PartSlot`} The proposed particle
+                locations.
+
+        Returns:
+            tuple: (`numpy.ndarray`, `numpy.ndarray`) Arrays with one row
+                per character in `chars`, holding the values of the
+                stats (ordered as in `STAT_ABBREVIATIONS`) and of the
+                particle effects (ordered as in `PART_EFFECTS`).
+
+        """
+        statValues = np.zeros((len(self.chars), len(STAT_ABBREVIATIONS)))
+        effectValues = np.zeros((len(self.chars), len(PART_EFFECTS)))
+        for index, char in enumerate(self.chars):
+            mult = self.priority.get(char.nameID, 1)
+            if self.calc is None:
+                statValues[index] = mult * np.array([
+                    self.weights.get(statName, 0)
+                    for statName in STAT_ABBREVIATIONS
+                ])
+                continue
+            stats, effects = self._loadoutStats(
+                char, gearProposal, partProposal
+            )
+            statValues[index], effectValues[index] = (
+                mult * grad for grad in self._effStatGradient(stats, effects)
+            )
+        return statValues, effectValues
+
+    def _method(self, values):
+        if self.method is not None:
+            return self.method
+        return 'exact' if values.size <= EXACT_LIMIT else 'greedy'
+
+    def _fits(self, gear, gearSlot):
+        try:
+            return self.roster.inGearSlot.validate(gear, gearSlot)
+        except ValueError:
+            return False
+
+    def _loadoutStats(self, char, gearProposal, partProposal):
+        """Returns the total stats and particle effects the given
+        character would have under the proposed loadout.
+
+        """
+        stats = char.stats + Stats()
+        effects = PartEffects()
+        for slot in char.gearSlots:
+            gear = self.roster.containsGear.get(slot)
+            if gear is not None and gearProposal.get(gear, slot) is slot:
+                stats += gear.stats
+        for gear, slot in gearProposal.items():
+            if slot is not None and slot.char is char and (
+                self.roster.inGearSlot.get(gear) is not slot
+            ):
+                stats += gear.stats
+        for slot in char.partSlots:
+            part = self.roster.containsPart.get(slot)
+            if part is not None and part not in partProposal:
+                stats += part.stats
+                effects += part.effects
+        for part, slot in partProposal.items():
+            if slot is not None and slot.char is char:
+                stats += part.stats
+                effects += part.effects
+        return stats, effects
+
+    def _effStatGradient(self, stats, effects):
+        """Returns the proportional increase in the weighted effective
+        stats per unit of each stat and each particle effect, estimated
+        by finite differences.
+
+        """
+        def score(stats, effects):
+            effStats = self.calc.calculateFromStats(stats, effects)
+            return np.array([
+                effStats[statName] for statName in self.weights
+            ])
+        base = score(stats, effects)
+        scale = np.where(base == 0, 1, base)
+        weights = np.array(list(self.weights.values()))
+        statGrad = np.zeros(len(STAT_ABBREVIATIONS))
+        for index, statName in enumerate(STAT_ABBREVIATIONS):
+            step = max(abs(stats.get(statName)), 1) * 1e-3
+            bumped = stats + Stats()
+            bumped.set(statName, stats.get(statName) + step)
+            statGrad[index] = weights @ (
+                (score(bumped, effects) - base) / scale
+            ) / step
+        effectGrad = np.zeros(len(PART_EFFECTS))
+        for index, effectName in enumerate(PART_EFFECTS):
+            step = 1e-3
+            bumped = effects + PartEffects()
+            bumped.set(effectName, effects.get(effectName) + step)
+            effectGrad[index] = weights @ (
+                (score(stats, bumped) - base) / scale
+            ) / step
+        return statGrad, effectGrad
+
+def _statMatrix(items):
+    """Returns an array whose rows are the stats of the given items,
+    ordered as in `STAT_ABBREVIATIONS`.
+
+    """
+    return np.array([
+        [item.stats.get(statName) for statName in STAT_ABBREVIATIONS]
+        for item in items
+    ], dtype=float).reshape(len(items), len(STAT_ABBREVIATIONS))
@@ -0,0 +1,339 @@
+"""Route queries on the node graphs of missions.
+
+The nodes of a mission, together with its node connections, form a
+directed acyclic graph, leading from the start node of the mission to
+one of its end nodes. A `MissionGraph` instance stores this graph as
+arrays, and finds routes through the mission, such as the route with
+the fewest combat nodes, or the route with the most valuable rewards.
+Connections leaving an exploration node may require a minimum
+proficiency in a role, so route queries take the player's proficiency
+into account. Results are stored for retrieval, one for each set of
+connections that the player's proficiency allows.
+
+"""
+
+import numpy as np
+from legends.constants import Inventory, POWER_AT_ORIGIN
+
+__all__ = ['MissionGraph', 'MissionRoute', 'proficiency']
+
+def proficiency(chars, roster):
+    """Computes the proficiency of a group of characters in each role,
+    which is the total power of the characters having that role.
+
+    Args:
+        chars (list of legends.gameobjects.Character): The characters,
+            typically an away team.
+        roster (legends.roster.Roster): The roster to which the
+            characters belong.
+
+    Returns:
+        dict: {`str`:`float`} A dictionary mapping roles to the
+            proficiency in that role. Roles with no characters are
+            omitted.
+
+    """
+    result = {}
+    for char in chars:
+        power = POWER_AT_ORIGIN + char.totalStats(roster).power
+        result[char.role] = result.get(char.role, 0) + power
+    return result
+
+class MissionRoute():
+    """A route through a mission, from its start node to one of its end
+    nodes.
+
+    Attributes:
+        mission (legends.saveslot.Mission): The mission.
+        connections (list of legends.saveslot.NodeConnection): The node
+            connections followed by the route, in order.
+        nodes (list of legends.saveslot.MissionNode): The nodes visited
+            by the route, in order.
+
+    """
+
+    def __init__(self, mission, connections, nodes):
+        self.mission = mission
+        self.connections = connections
+        self.nodes = nodes
+
+    @property
+    def combatNodes(self):
+        """`int`: The number of combat nodes on the route."""
+        return sum(node.type == 'Combat' for node in self.nodes)
+
+    @property
+    def rewards(self):
+        """`legends.constants.Inventory`: The total rewards of the nodes
+        on the route.
+        """
+        return sum((node.rewards for node in self.nodes), Inventory())
+
+    @property
+    def missingRewards(self):
+        """`legends.constants.Inventory`: The total rewards of the nodes
+        on the route that have not been completed.
+        """
+        return sum(
+            (node.rewards for node in self.nodes if not node.complete),
+            Inventory()
+        )
+
+    def __repr__(self):
+        return 'MissionRoute({!r}, {})'.format(
+            self.mission, [node.nodeID for node in self.nodes]
+        )
+
+class MissionGraph():
+    """The node graph of a mission.
+
+    The connections of the mission are stored in compressed form: the
+    connections leaving the node `nodes[i]` are those with indices from
+    `offsets[i]` to `offsets[i + 1]` in the arrays `targets`, `roles`,
+    and `powers`.
+
+    Attributes:
+        mission (legends.saveslot.Mission): The mission.
+        nodes (list of legends.saveslot.MissionNode): The nodes of the
+            mission, in topological order, so that every connection
+            leads from a node to a node later in the list.
+        connections (list of legends.saveslot.NodeConnection): The
+            connections of the mission, sorted by start node.
+        offsets (numpy.ndarray): An integer array of length
+            `len(nodes) + 1`, as described above.
+        targets (numpy.ndarray): An integer array containing, for each
+            connection, the index in `nodes` of its end node.
+        roles (list of str): The role whose proficiency is required to
+            follow each connection, or `None`.
+        powers (numpy.ndarray): The proficiency required to follow each
+            connection, or 0.
+        combat (numpy.ndarray): A boolean array indicating which nodes
+            are combat nodes.
+        start (int): The index of the start node.
+        ends (numpy.ndarray): A boolean array indicating which nodes are
+            end nodes.
+
+    """
+
+    def __init__(self, mission):
+        """The constructor builds the arrays from the given mission.
+
+        Raises:
+            ValueError: If the mission's node connections contain a
+                cycle.
+
+        """
+        self.mission = mission
+        outgoing = {nodeID: [] for nodeID in mission.nodes}
+        inDegree = {nodeID: 0 for nodeID in mission.nodes}
+        for connection in mission.nodeConnections:
+            outgoing[connection.startNode.nodeID].append(connection)
+            inDegree[connection.endNode.nodeID] += 1
+
+        order = [nodeID for nodeID, degree in inDegree.items() if not degree]
+        for nodeID in order:
+            for connection in outgoing[nodeID]:
+                endID = connection.endNode.nodeID
+                inDegree[endID] -= 1
+                if not inDegree[endID]:
+                    order.append(endID)
+        if len(order) != len(mission.nodes):
+            raise ValueError('{} contains a cycle'.format(mission))
+
+        self.nodes = [mission.nodes[nodeID] for nodeID in order]
+        self._index = {nodeID: index for index, nodeID in enumerate(order)}
+        self.connections = [
+            connection for nodeID in order for connection in outgoing[nodeID]
+        ]
+        self.offsets = np.cumsum(
+            [0] + [len(outgoing[nodeID]) for nodeID in order]
+        )
+        self.targets = np.array(
+            [self._index[conn.endNode.nodeID] for conn in self.connections],
+            dtype=int
+        )
+        self.roles = [
+            None if conn.nodeOption is None else conn.nodeOption.role
+            for conn in self.connections
+        ]
+        self.powers = np.array([
+            0 if conn.nodeOption is None or conn.nodeOption.role is None
+            else conn.nodeOption.power
+            for conn in self.connections
+        ])
+        self.combat = np.array([node.type == 'Combat' for node in self.nodes])
+        starts = [
+            index for index, node in enumerate(self.nodes)
+            if node.data['StartNode']
+        ]
+        self.start = starts[0] if starts else 0
+        self.ends = np.array([
+            node.data['EndNode'] or not len(outgoing[node.nodeID])
+            for node in self.nodes
+        ])
+        self._cache = {}
+
+    def allowed(self, prof=None):
+        """Determines which connections can be followed.
+
+        Args:
+            prof (dict): {`str`:`float`} A dictionary mapping roles to
+                the player's proficiency in that role, as returned by
+                the `proficiency` function. If `None`, every connection
+                is allowed.
+
+        Returns:
+            numpy.ndarray: A boolean array indicating which connections
+                in `connections` can be followed.
+
+        """
+        if prof is None:
+            return np.ones(len(self.connections), dtype=bool)
+        levels = np.array([
+            0 if role is None else prof.get(role, 0) for role in self.roles
+        ])
+        return levels >= self.powers
+
+    def signature(self, prof=None):
+        """Summarizes the effect of a proficiency on this mission.
+        Proficiencies with equal signatures allow the same connections,
+        and so have the same routes.
+
+        Args:
+            prof (dict): {`str`:`float`} The player's proficiency, as in
+                `MissionGraph.allowed`.
+
+        Returns:
+            bytes: The signature.
+
+        """
+        return np.packbits(self.allowed(prof)).tobytes()
+
+    def fewestCombats(self, prof=None):
+        """Finds the route with the fewest combat nodes.
+
+        Args:
+            prof (dict): {`str`:`float`} The player's proficiency, as in
+                `MissionGraph.allowed`.
+
+        Returns:
+            MissionRoute: The route, or `None` if the player's
+                proficiency allows no route to an end node.
+
+        """
+        key = ('fewestCombats', self.signature(prof))
+        if key not in self._cache:
+            self._cache[key] = self._bestRoute(
+                np.zeros(len(self.nodes)), self.allowed(prof)
+            )
+        return self._cache[key]
+
+    def bestRoute(self, prof=None, weights=None, missing=False):
+        """Finds the route with the greatest total reward value. Among
+        routes of equal value, one with the fewest combat nodes is
+        chosen.
+
+        Args:
+            prof (dict): {`str`:`float`} The player's proficiency, as in
+                `MissionGraph.allowed`.
+            weights (dict): {`str`:`float`} A dictionary mapping item
+                IDs to the value of one such item. Items not in the
+                dictionary have value 0. If `None`, every item has value
+                1.
+            missing (bool): `True` if only the rewards of nodes that
+                have not been completed are counted.
+
+        Returns:
+            MissionRoute: The route, or `None` if the player's
+                proficiency allows no route to an end node.
+
+        """
+        values = np.array([
+            0 if missing and node.complete else sum(
+                qty * (1 if weights is None else weights.get(item.itemID, 0))
+                for item, qty in node.rewards.items()
+            )
+            for node in self.nodes
+        ])
+        key = ('bestRoute', self.signature(prof), values.tobytes())
+        if key not in self._cache:
+            self._cache[key] = self._bestRoute(values, self.allowed(prof))
+        return self._cache[key]
+
+    def routes(self, prof=None):
+        """Lists every route through the mission.
+
+        Args:
+            prof (dict): {`str`:`float`} The player's proficiency, as in
+                `MissionGraph.allowed`.
+
+        Returns:
+            list of MissionRoute: The routes that the player's
+                proficiency allows.
+
+        """
+        key = ('routes', self.signature(prof))
+        if key in self._cache:
+            return self._cache[key]
+        allowed = self.allowed(prof)
+        routes = []
+        stack = [([], [self.start])]
+        while stack:
+            edges, path = stack.pop()
+            node = path[-1]
+            if self.ends[node]:
+                routes.append(self._route(edges, path))
+                continue
+            for edge in range(self.offsets[node], self.offsets[node + 1]):
+                if allowed[edge]:
+                    stack.append(
+                        (edges + [edge], path + [self.targets[edge]])
+                    )
+        self._cache[key] = routes
+        return routes
+
+    def _bestRoute(self, values, allowed):
+        """Finds, by dynamic programming over the nodes in reverse
+        topological order, the route maximizing the total value of its
+        nodes, breaking ties by the number of combat nodes.
+
+        Args:
+            values (numpy.ndarray): The value of each node.
+            allowed (numpy.ndarray): A boolean array indicating which
+                connections can be followed.
+
+        Returns:
+            MissionRoute: The route, or `None` if there is none.
+
+        """
+        numNodes = len(self.nodes)
+        best = [None] * numNodes
+        choice = [None] * numNodes
+        for node in reversed(range(numNodes)):
+            score = (values[node], -int(self.combat[node]))
+            if self.ends[node]:
+                best[node] = score
+                continue
+            for edge in range(self.offsets[node], self.offsets[node + 1]):
+                target = self.targets[edge]
+                if not allowed[edge] or best[target] is None:
+                    continue
+                total = (
+                    score[0] + best[target][0], score[1] + best[target][1]
+                )
+                if best[node] is None or total > best[node]:
+                    best[node], choice[node] = total, edge
+        if best[self.start] is None:
+            return None
+        edges, path = [], [self.start]
+        while choice[path[-1]] is not None:
+            edges.append(choice[path[-1]])
+            path.append(self.targets[edges[-1]])
+        return self._route(edges, path)
+
+    def _route(self, edges, path):
+        return MissionRoute(
+            self.mission,
+            [self.connections[edge] for edge in edges],
+            [self.nodes[node] for node in path]
+        )
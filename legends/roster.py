@@ -3,9 +3,11 @@
 """
 
 from collections.abc import MutableMapping, MutableSequence
+from contextlib import contextmanager
 from warnings import warn
+from weakref import finalize
 from legends.utils.eventhandler import Event, EventHandler
-from legends.utils.objrelations import OneToOne
+from legends.utils.objrelations import Managed, OneToOne
 #pylint: disable-next=no-name-in-module
 from legends.constants import GSAccessoryItems, GSCharacter
 from legends.constants import DESCRIPTIONS, SUMMON_POOL
@@ -22,7 +24,9 @@ __all__ = [
     'WatchedList',
     'WatchedDict',
     'CharChangeEvent',
+    'CharBatchEvent',
     'CharChangeWatcher',
+    'RosterReloadEvent',
     'Roster'
 ]
 
@@ -78,11 +82,31 @@ def readParts(save, slot):
         name = DESCRIPTIONS[GSAccessoryItems[data['accessoryid']]['Name']]
         rarity = GSAccessoryItems[data['accessoryid']]['Rarity']
         part = Particle(name, rarity, data['level'], data['locked'])
-        for statIndex, statName in enumerate(data['stats'].values()):
-            part.setStatName(statIndex, statName)
+        part.setStatNames(data['stats'].values())
         parts[saveIndex] = part
     return parts
 
+def _unregister(rels):
+    """Removes the given relations, and their inverses, from the
+    registry of `legends.utils.objrelations.Managed` objects, so that
+    they can be garbage collected along with the roster that owns them.
+
+    """
+    Managed.release(*rels, *[rel.inverse for rel in rels])
+
+def _releaseOwned(owned):
+    """Removes the copies made by `Roster.writable` in a fork, and the
+    gear and particle slots of the copied characters, from the registry
+    of `legends.utils.objrelations.Managed` objects, so that they can be
+    garbage collected along with the fork.
+
+    """
+    for obj in owned:
+        if isinstance(obj, Character):
+            Managed.release(*obj.gearSlots, *obj.partSlots)
+        else:
+            Managed.release(obj)
+
 class OneToOneChangeEvent(Event): # pylint: disable=too-few-public-methods
     """A change in a `legends.utils.objrelations.OneToOne` relation.
 
@@ -219,6 +243,19 @@ class WatchedCollection():
     Subclasses must override the `values()` method with a method that
     returns an iterator over the values contained in the collection.
 
+    Subscriptions can be suspended with `WatchedCollection.pause`, so
+    that many values can be added or removed without subscribing or
+    unsubscribing callbacks one value at a time. The values copied from
+    another collection with `WatchedCollection.share` are not subscribed
+    to at all.
+
+    Attributes:
+        weak (bool): If `True`, callbacks subscribe weakly to the event
+            handlers of the values (see
+            `legends.utils.eventhandler.EventHandler.subscribe`), so
+            that a value does not keep a subscriber alive. Defaults to
+            `False`.
+
     """
     def __init__(self, collectionType):
         """The constructor stores the collection data in a private
@@ -231,6 +268,23 @@ class WatchedCollection():
         """
         self._data = collectionType()
         self._subscribers = []
+        self._paused = False
+        self._unwatched = set()
+        self.weak = False
+
+    @property
+    def paused(self):
+        """`bool`: `True` if subscriptions are suspended. (See
+        `WatchedCollection.pause`.)
+        """
+        return self._paused
+
+    @property
+    def _active(self):
+        """`list`: The subscribers currently subscribed to the values,
+        which is empty while subscriptions are suspended.
+        """
+        return [] if self._paused else self._subscribers
 
     def __getitem__(self, key):
         return self._data[key]
@@ -238,12 +292,11 @@ class WatchedCollection():
     def __setitem__(self, key, value):
         checkForStats(value)
         self._data[key] = value
-        for callback in self._subscribers:
-            value.stats.onChange.subscribe(callback)
+        for callback in self._active:
+            value.stats.onChange.subscribe(callback, self.weak)
 
     def __delitem__(self, key):
-        for callback in self._subscribers:
-            self._data[key].stats.onChange.unsubscribe(callback)
+        self._release(self._data[key])
         del self._data[key]
 
     def __len__(self):
@@ -267,8 +320,10 @@ class WatchedCollection():
 
         """
         self._subscribers.append(callback)
-        for value in self.values():
-            value.stats.onChange.subscribe(callback)
+        if self._paused:
+            return
+        for value in self._watched():
+            value.stats.onChange.subscribe(callback, self.weak)
 
     def unsubscribe(self, callback):
         """Removes the given callback from the list of subscribers, then
@@ -281,7 +336,75 @@ class WatchedCollection():
 
         """
         self._subscribers.remove(callback)
-        for value in self.values():
+        if self._paused:
+            return
+        for value in self._watched():
+            value.stats.onChange.unsubscribe(callback)
+
+    def pause(self):
+        """Suspends subscriptions. Every subscriber is unsubscribed from
+        the values currently in the collection, and until
+        `WatchedCollection.resume` is called, values that are added or
+        removed are not subscribed to or unsubscribed from.
+
+        """
+        if self._paused:
+            return
+        for value in self._watched():
+            for callback in self._subscribers:
+                value.stats.onChange.unsubscribe(callback)
+        self._paused = True
+
+    def resume(self):
+        """Resumes subscriptions. Every subscriber is subscribed to the
+        values currently in the collection.
+
+        """
+        if not self._paused:
+            return
+        self._paused = False
+        for value in self._watched():
+            for callback in self._subscribers:
+                value.stats.onChange.subscribe(callback, self.weak)
+
+    def share(self, other):
+        """Replaces the contents of this collection with the values of
+        another collection of the same type, in the same order. The
+        subscribers of this collection do not subscribe to the event
+        handlers of the shared values, so sharing takes no more time
+        than copying the underlying list or dictionary. Changes to the
+        shared values are therefore not reported to the subscribers.
+        Values added to this collection afterwards, including values
+        that replace shared ones, are subscribed to as usual.
+
+        Args:
+            other (WatchedCollection): The collection whose values are
+                to be shared.
+
+        """
+        self.clear()
+        self._data = other._data.copy()
+        self._unwatched = set(self.values())
+
+    def _watched(self):
+        """Returns an iterator over the values in the collection whose
+        event handlers are subscribed to.
+
+        """
+        return (
+            value for value in self.values()
+            if value not in self._unwatched
+        )
+
+    def _release(self, value):
+        """Unsubscribes the subscribers from the event handler of a
+        value that is being removed from the collection.
+
+        """
+        if value in self._unwatched:
+            self._unwatched.discard(value)
+            return
+        for callback in self._active:
             value.stats.onChange.unsubscribe(callback)
 
     def __repr__(self):
@@ -309,8 +432,7 @@ class WatchedList(WatchedCollection, MutableSequence):
     def __setitem__(self, key, value):
         if isinstance(key, slice):
             raise NotImplementedError('Slice assignment not implemented')
-        for callback in self._subscribers:
-            self._data[key].stats.onChange.unsubscribe(callback)
+        self._release(self._data[key])
         WatchedCollection.__setitem__(self, key, value)
 
     def insert(self, index, value):
@@ -320,8 +442,8 @@ class WatchedList(WatchedCollection, MutableSequence):
         """
         checkForStats(value)
         self._data.insert(index, value)
-        for callback in self._subscribers:
-            value.stats.onChange.subscribe(callback)
+        for callback in self._active:
+            value.stats.onChange.subscribe(callback, self.weak)
 
     def values(self):
         """An alias for `__iter__()`.
@@ -350,8 +472,7 @@ class WatchedDict(WatchedCollection, MutableMapping):
 
     def __setitem__(self, key, value):
         if key in self._data:
-            for callback in self._subscribers:
-                self._data[key].stats.onChange.unsubscribe(callback)
+            self._release(self._data[key])
         WatchedCollection.__setitem__(self, key, value)
 
     def __iter__(self):
@@ -383,6 +504,45 @@ class CharChangeEvent(Event): # pylint: disable=too-few-public-methods
         self.char = char
         self.triggerEvent = triggerEvent
 
+class RosterReloadEvent(Event): # pylint: disable=too-few-public-methods
+    """An event indicating that many characters in a roster may have
+    changed at once, or been added or removed.
+
+    Sent by a `CharChangeWatcher` instance in place of the individual
+    `CharChangeEvent` instances, at the end of `Roster.bulkLoad`.
+    Subscribers should treat every character in the roster as changed.
+
+    Attributes:
+        roster (Roster): The roster that was reloaded.
+
+    """
+
+    def __init__(self, roster):
+        self.roster = roster
+
+class CharBatchEvent(Event): # pylint: disable=too-few-public-methods
+    """An event listing every character that has changed in one
+    dispatch of a `CharChangeWatcher` instance.
+
+    Sent to the batch subscribers of a `CharChangeWatcher` (see
+    `CharChangeWatcher.subscribeBatch`).
+
+    Attributes:
+        roster (Roster): The roster to which the characters belong.
+        chars (list of legends.gameobjects.Character): The characters
+            that have changed, each listed once, in the order of their
+            first change.
+        reloaded (bool): `True` if the event was caused by a
+            `RosterReloadEvent`, in which case `chars` lists every
+            character in the roster.
+
+    """
+
+    def __init__(self, roster, chars, reloaded=False):
+        self.roster = roster
+        self.chars = chars
+        self.reloaded = reloaded
+
 class CharChangeWatcher(EventHandler):
     """An event handler that watches a roster for changes to characters.
 
@@ -397,21 +557,39 @@ class CharChangeWatcher(EventHandler):
     subscribing to the `onChange` event handlers of the roster's
     `inGearSlot` and `inPartSlot` attributes. When a character change is
     detected, this event handler creates and sends subscribers a
-    `CharChangeEvent` instance.
+    `CharChangeEvent` instance. While the roster is in a
+    `Roster.bulkLoad` block, no events are sent, and a single
+    `RosterReloadEvent` is sent at the end of the block.
+
+    Within a `CharChangeWatcher.transaction` block, events are queued
+    instead of sent. At the end of the block, subscribers are sent one
+    `CharChangeEvent` for each character that changed, however many
+    times it changed. Callbacks subscribed with
+    `CharChangeWatcher.subscribeBatch` are called once per dispatch
+    with a `CharBatchEvent` listing all the changed characters, so a
+    subscriber that recomputes something for every change can do it
+    once per transaction.
 
     Attributes:
         roster (Roster): The roster to watch.
+        silent (bool): If `True`, no events are sent to subscribers.
+            Defaults to `False`.
 
     """
 
     def __init__(self, roster):
         EventHandler.__init__(self)
         self.roster = roster
+        self.silent = False
+        self._batchHandler = EventHandler()
+        self._depth = 0
+        self._pending = {}
+        self._reload = None
         self.roster.gear.subscribe(self.onGearChange)
         self.roster.parts.subscribe(self.onPartChange)
         self.roster.chars.subscribe(self.onCharChange)
-        self.roster.inGearSlot.onChange.subscribe(self.onRelChange)
-        self.roster.inPartSlot.onChange.subscribe(self.onRelChange)
+        self.roster.inGearSlot.onChange.subscribe(self.onRelChange, True)
+        self.roster.inPartSlot.onChange.subscribe(self.onRelChange, True)
 
     def onGearChange(self, statChangeEvent):
         """Called when the stats of a gear piece in the roster changes.
@@ -469,6 +647,106 @@ class CharChangeWatcher(EventHandler):
             oneToOneChangeEvent.value.char, oneToOneChangeEvent
         ))
 
+    @property
+    def inTransaction(self):
+        """`bool`: `True` if events are being queued by a
+        `CharChangeWatcher.transaction` block.
+        """
+        return self._depth > 0
+
+    def subscribeBatch(self, callback, weak=False):
+        """Subscribes to batches of changes. The callback is called with
+        a `CharBatchEvent` after every dispatch: once at the end of each
+        transaction, and once for each event sent outside of a
+        transaction.
+
+        Args:
+            callback (callable): The callable object to add to the list
+                of batch subscribers. Must take one argument.
+            weak (bool): If `True`, the callback is held by a weak
+                reference, as in
+                `legends.utils.eventhandler.EventHandler.subscribe`.
+
+        """
+        self._batchHandler.subscribe(callback, weak)
+
+    def unsubscribeBatch(self, callback):
+        """Removes a callback added with
+        `CharChangeWatcher.subscribeBatch`.
+
+        Args:
+            callback (callable): The callable object to remove from the
+                list of batch subscribers.
+
+        """
+        self._batchHandler.unsubscribe(callback)
+
+    @contextmanager
+    def transaction(self):
+        """A context manager that queues the events sent by this event
+        handler until the end of the `with` block, then sends one
+        `CharChangeEvent` for each changed character, carrying the
+        event that triggered its last change. If the roster was
+        reloaded during the block, only the `RosterReloadEvent` is
+        sent. Transactions may be nested, in which case the events are
+        sent at the end of the outermost block. The events are sent
+        even if the block raises an exception, since the changes made
+        before the exception have already taken place.
+
+        """
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                if self._reload is not None:
+                    events = [self._reload]
+                else:
+                    events = list(self._pending.values())
+                self._pending = {}
+                self._reload = None
+                self._dispatch(events)
+
+    def notify(self, event):
+        """Notifies the subscribers of an event, unless the `silent`
+        attribute is `True`. Within a transaction, the event is queued
+        instead.
+
+        Args:
+            event (legends.utils.eventhandler.Event): The event.
+
+        """
+        if self.silent:
+            return
+        if not self._depth:
+            self._dispatch([event])
+        elif isinstance(event, RosterReloadEvent):
+            self._reload = event
+        else:
+            self._pending[event.char] = event
+
+    def _dispatch(self, events):
+        """Sends the given events to the subscribers, then sends a
+        `CharBatchEvent` describing them to the batch subscribers.
+
+        """
+        if not events:
+            return
+        for event in events:
+            EventHandler.notify(self, event)
+        if not len(self._batchHandler):
+            return
+        if isinstance(events[0], RosterReloadEvent):
+            batch = CharBatchEvent(
+                self.roster, list(self.roster.chars.values()), True
+            )
+        else:
+            batch = CharBatchEvent(
+                self.roster, [event.char for event in events]
+            )
+        self._batchHandler.notify(batch)
+
 class Roster():
     """A collection of related characters, gear, and particles.
 
@@ -501,9 +779,15 @@ class Roster():
         self._chars = WatchedDict()
         self.inGearSlot = InGearSlot()
         self.inPartSlot = WatchedOneToOne()
+        self._saveGear = None
+        self._saveParts = None
+        self._bulkDepth = 0
+        self._owned = None
+        self._source = None
+        self.charChangeWatcher = CharChangeWatcher(self)
+        finalize(self, _unregister, [self.inGearSlot, self.inPartSlot])
         if save is not None:
             self.fromSaveData(save, slot)
-        self.charChangeWatcher = CharChangeWatcher(self)
 
     @property
     def gear(self):
@@ -540,6 +824,139 @@ class Roster():
         """
         return self.inPartSlot.inverse
 
+    @contextmanager
+    def bulkLoad(self):
+        """A context manager for adding or removing many characters,
+        gear pieces, and particles at once. Within the `with` block,
+        the roster's watched collections do not subscribe to or
+        unsubscribe from the items added to or removed from them, and
+        `charChangeWatcher` sends no events. At the end of the block,
+        every subscription is made at once, and `charChangeWatcher`
+        sends a single `RosterReloadEvent`. Blocks may be nested, in
+        which case this happens at the end of the outermost block.
+
+        """
+        collections = [self.gear, self.parts, self.chars]
+        if not self._bulkDepth:
+            for collection in collections:
+                collection.pause()
+            self.charChangeWatcher.silent = True
+        self._bulkDepth += 1
+        try:
+            yield self
+        finally:
+            self._bulkDepth -= 1
+            if not self._bulkDepth:
+                for collection in collections:
+                    collection.resume()
+                self.charChangeWatcher.silent = False
+                self.charChangeWatcher.notify(RosterReloadEvent(self))
+
+    @property
+    def isFork(self):
+        """`bool`: `True` if the roster was created by `Roster.fork`.
+        """
+        return self._owned is not None
+
+    def fork(self):
+        """Creates a copy-on-write fork of the roster, for trying out
+        changes without affecting the roster. The fork starts out
+        sharing every character, gear piece, and particle with this
+        roster, and has its own copy of which items are equipped where,
+        so creating a fork takes no more time than copying a few lists
+        and dictionaries.
+
+        A shared object must not be changed through the fork. Instead,
+        `Roster.writable` is called first, which replaces the object in
+        the fork with a copy of it that belongs to the fork alone.
+        Equipping and unequipping gear and particles in the fork does
+        not affect this roster, and needs no copies. Changes made
+        through this roster to objects that are still shared show up in
+        the fork.
+
+        The watched collections of the fork share the objects of this
+        roster (see `WatchedCollection.share`), so `charChangeWatcher`
+        of the fork reports changes to the objects made writable in the
+        fork, and to the equipment of the fork, but not changes to
+        shared objects. The copies are subscribed to weakly (see
+        `WatchedCollection.weak`), so a fork that is no longer used can
+        be garbage collected, at which point the copies it made are
+        released from the registry of
+        `legends.utils.objrelations.Managed` objects. A fork keeps this
+        roster alive, since it shares the copies this roster made if it
+        is itself a fork. Forks are not linked to save data;
+        calling `Roster.syncFromSaveData` on a fork rebuilds it from
+        scratch.
+
+        Returns:
+            Roster: The fork.
+
+        """
+        roster = Roster()
+        roster._owned = set()
+        roster._source = self
+        finalize(roster, _releaseOwned, roster._owned)
+        for collection, other in [
+            (roster.gear, self.gear),
+            (roster.parts, self.parts),
+            (roster.chars, self.chars)
+        ]:
+            collection.weak = True
+            collection.share(other)
+        roster.inGearSlot.map = self.inGearSlot.map.copy()
+        roster.inGearSlot.enforceLevel = self.inGearSlot.enforceLevel
+        roster.inPartSlot.map = self.inPartSlot.map.copy()
+        return roster
+
+    def writable(self, obj):
+        """Returns a version of the given character, gear piece, or
+        particle that can be changed without affecting any other
+        roster. In a fork, the first call with an object shared with
+        the original roster replaces the object, everywhere in the fork,
+        with a copy of it, and returns the copy. The equipment of a
+        copied character is moved to the slots of the copy. Otherwise,
+        the object is returned unchanged.
+
+        No events are sent when an object is replaced, since the copy
+        is identical to the original. Subscribers that store objects
+        from the fork should look them up again after calling this
+        method.
+
+        Args:
+            obj (legends.gameobjects.Character or
+                legends.gameobjects.Gear or
+                legends.gameobjects.Particle): An object in the roster.
+
+        Returns:
+            legends.gameobjects.Character or legends.gameobjects.Gear
+                or legends.gameobjects.Particle: The writable object.
+
+        """
+        if self._owned is None or obj in self._owned:
+            return obj
+        new = obj.copy()
+        self._owned.add(new)
+        if isinstance(obj, Character):
+            self.chars[obj.nameID] = new
+            for rel, oldSlots, newSlots in [
+                (self.inGearSlot, obj.gearSlots, new.gearSlots),
+                (self.inPartSlot, obj.partSlots, new.partSlots)
+            ]:
+                for oldSlot, newSlot in zip(oldSlots, newSlots):
+                    itemID = rel.map.inverse.pop(id(oldSlot), None)
+                    if itemID is not None:
+                        rel.map[itemID] = id(newSlot)
+            return new
+        if isinstance(obj, Gear):
+            items, rel = self.gear, self.inGearSlot
+        else:
+            items, rel = self.parts, self.inPartSlot
+        items[items.index(obj)] = new
+        slotID = rel.map.pop(id(obj), None)
+        if slotID is not None:
+            rel.map[id(new)] = slotID
+        return new
+
     def clear(self):
         """Completely clears all items in the roster.
 
@@ -549,10 +966,14 @@ class Roster():
         self.chars.clear()
         self.inGearSlot.clear()
         self.inPartSlot.clear()
+        self._saveGear = None
+        self._saveParts = None
 
     def fromSaveData(self, save, slot):
         """Completely empties the roster, then re-populates it with data
-        from the given save data and slot.
+        from the given save data and slot. This is done in a
+        `Roster.bulkLoad` block, so subscribers to `charChangeWatcher`
+        receive a single `RosterReloadEvent`.
 
         Args:
             save (dict): A decrypted dictionary representation of the
@@ -562,57 +983,202 @@ class Roster():
                 read the data.
 
         """
-        self.clear()
+        with self.bulkLoad():
+            self.clear()
+
+            # fill gear and particles
+            gearDict = readGear(save, slot)
+            self.gear.extend(gearDict.values())
+            partDict = readParts(save, slot)
+            self.parts.extend(partDict.values())
+            self._saveGear = gearDict
+            self._saveParts = partDict
+
+            # cycle through characters in save data
+            slotData = save['{} data'.format(slot)]
+            for nameID, data in slotData['units'].items():
+                char = self._charFromData(nameID, data)
+                self._equipFromData(char, data)
+                self.chars[nameID] = char
+
+    def syncFromSaveData(self, save, slot):
+        """Updates the roster to match the given save data and slot,
+        changing only what differs from the save data the roster was
+        last built from. Gear and particles are matched by their index
+        in the save file, and characters by their name ID, so that
+        subscribers to `charChangeWatcher` are only notified about
+        characters that have actually changed. The changes are made in
+        a `CharChangeWatcher.transaction` block, so each changed
+        character is reported once. If the roster was not built from
+        save data, this is the same as `fromSaveData`.
+
+        Args:
+            save (dict): A decrypted dictionary representation of the
+                player's save file, as returned by the
+                `legends.functions.decryptSaveFile` function.
+            slot (int): The 0-based index of the save slot from which to
+                read the data.
 
-        # fill gear and particles
-        gearDict = readGear(save, slot)
-        self.gear.extend(gearDict.values())
-        partDict = readParts(save, slot)
-        self.parts.extend(partDict.values())
+        """
+        if self._saveGear is None:
+            self.fromSaveData(save, slot)
+            return
+        with self.charChangeWatcher.transaction():
+            self._syncFromSaveData(save, slot)
 
-        # cycle through characters in save data
+    def _syncFromSaveData(self, save, slot):
+        """Does the work of `Roster.syncFromSaveData` for a roster that
+        was built from save data.
+
+        """
         slotData = save['{} data'.format(slot)]
-        for nameID, data in slotData['units'].items():
-            char = Character(nameID, data['rank'], data['xp'])
-
-            # add skills to character
-            for skillID, level in data['skills'].items():
-                if level > 0:
-                    try:
-                        char.skills[skillID].unlocked = True
-                        char.skills[skillID].level = level
-                    except KeyError:
-                        warn(
-                            repr(skillID)
-                            + ' found in save file but not in game data'
-                        )
-
-            # add gear to character
-            for slotIndex, itemSaveIndex in enumerate(data['gears'].values()):
-                if itemSaveIndex > 0:
-                    item = gearDict[itemSaveIndex]
-                    slot = char.gearSlots[slotIndex]
-                    try:
-                        self.inGearSlot[item] = slot
-                    except ValueError:
-                        warn('Rarity of {} exceeds rarity of {}'.format(
-                            item, char
-                        ))
-                        self.inGearSlot.enforceLevel = False
-                        self.inGearSlot[item] = slot
-                        self.inGearSlot.enforceLevel = True
-
-            # add particles to character
-            for slotIndex, itemSaveIndex in (
-                enumerate(data['accessories'].values())
+
+        # replace gear whose save index is new, or whose type or level
+        # has changed
+        gearDict = {}
+        for indexStr, data in slotData['gears'].items():
+            index = int(indexStr)
+            gear = self._saveGear.pop(index, None)
+            if gear is None or (gear.gearID, gear.level) != (
+                data['gearid'], data['level']
             ):
-                if itemSaveIndex > 0:
-                    item = partDict[itemSaveIndex]
-                    slot = char.partSlots[slotIndex]
-                    self.inPartSlot[item] = slot
+                if gear is not None:
+                    self._discardGear(gear)
+                gear = Gear(data['gearid'], data['level'])
+                self.gear.append(gear)
+            gearDict[index] = gear
+        for gear in self._saveGear.values():
+            self._discardGear(gear)
+        self._saveGear = gearDict
+
+        # update particles in place, or replace those whose type has
+        # changed
+        newParts = readParts(save, slot)
+        partDict = {}
+        for index, newPart in newParts.items():
+            part = self._saveParts.pop(index, None)
+            if part is None or (part.typ, part.rarity) != (
+                newPart.typ, newPart.rarity
+            ):
+                if part is not None:
+                    self._discardPart(part)
+                part = newPart
+                self.parts.append(part)
+            else:
+                part.locked = newPart.locked
+                if part.level != newPart.level:
+                    part.level = newPart.level
+                for statIndex, statName in enumerate(newPart.statNames):
+                    if part.statNames[statIndex] != statName:
+                        part.setStatName(statIndex, statName)
+            partDict[index] = part
+        for part in self._saveParts.values():
+            self._discardPart(part)
+        self._saveParts = partDict
+
+        # remove characters that are no longer in the save data
+        for nameID in [
+            nameID for nameID in self.chars
+            if nameID not in slotData['units']
+        ]:
+            char = self.chars[nameID]
+            for gearSlot in char.gearSlots:
+                self.containsGear.pop(gearSlot, None)
+            for partSlot in char.partSlots:
+                self.containsPart.pop(partSlot, None)
+            del self.chars[nameID]
+
+        # update or add the characters in the save data
+        for nameID, data in slotData['units'].items():
+            char = self.chars.get(nameID)
+            if char is None:
+                char = self._charFromData(nameID, data)
+                self._equipFromData(char, data)
+                self.chars[nameID] = char
+                continue
+            if char.rank != data['rank']:
+                char.rank = data['rank']
+            if char.xp != data['xp']:
+                char.xp = data['xp']
+            for skillID, skill in char.skills.items():
+                level = data['skills'].get(skillID, 0)
+                skill.unlocked = level > 0 or skill.startWith
+                skill.level = max(level, 1)
+            self._equipFromData(char, data)
+
+    def _charFromData(self, nameID, data):
+        """Builds a character, with its skills, from its save data.
+
+        Args:
+            nameID (str): The name ID of the character.
+            data (dict): The character's data in the save file.
 
-            # add character to roster
-            self.chars[nameID] = char
+        Returns:
+            legends.gameobjects.Character: The character.
+
+        """
+        char = Character(nameID, data['rank'], data['xp'])
+        for skillID, level in data['skills'].items():
+            if level > 0:
+                try:
+                    char.skills[skillID].unlocked = True
+                    char.skills[skillID].level = level
+                except KeyError:
+                    warn(
+                        repr(skillID)
+                        + ' found in save file but not in game data'
+                    )
+        return char
+
+    def _equipFromData(self, char, data):
+        """Equips a character with the gear and particles named in its
+        save data, leaving unchanged slots alone. Gear and particles are
+        looked up by save index in the dictionaries stored by
+        `fromSaveData` and `syncFromSaveData`, and are unequipped from
+        any other slot before they are equipped.
+
+        Args:
+            char (legends.gameobjects.Character): The character.
+            data (dict): The character's data in the save file.
+
+        """
+        for gearSlot, itemSaveIndex in zip(
+            char.gearSlots, data['gears'].values()
+        ):
+            item = self._saveGear.get(itemSaveIndex)
+            if self.containsGear.get(gearSlot) is item:
+                continue
+            self.containsGear.pop(gearSlot, None)
+            if item is None:
+                continue
+            self.inGearSlot.pop(item, None)
+            try:
+                self.inGearSlot[item] = gearSlot
+            except ValueError:
+                warn('Rarity of {} exceeds rarity of {}'.format(item, char))
+                self.inGearSlot.enforceLevel = False
+                self.inGearSlot[item] = gearSlot
+                self.inGearSlot.enforceLevel = True
+        for partSlot, itemSaveIndex in zip(
+            char.partSlots, data['accessories'].values()
+        ):
+            item = self._saveParts.get(itemSaveIndex)
+            if self.containsPart.get(partSlot) is item:
+                continue
+            self.containsPart.pop(partSlot, None)
+            if item is not None:
+                self.inPartSlot.pop(item, None)
+                self.inPartSlot[item] = partSlot
+
+    def _discardGear(self, gear):
+        """Unequips the given gear and removes it from the roster."""
+        self.inGearSlot.pop(gear, None)
+        self.gear.remove(gear)
+
+    def _discardPart(self, part):
+        """Unequips the given particle and removes it from the roster."""
+        self.inPartSlot.pop(part, None)
+        self.parts.remove(part)
 
     def fillChars(self, nameIDs, maxGear=True):
         """For each name ID in the given list of name IDs, a character
@@ -622,7 +1188,8 @@ class Roster():
 
         If the `maxGear` attribute is True, maxed gear pieces will be
         created, added to the roster, and equipped to the newly added
-        characters.
+        characters. The characters are added in a `Roster.bulkLoad`
+        block.
 
         Args:
             nameIDs (iterable of str): The name IDs of the characters to
@@ -637,24 +1204,25 @@ class Roster():
             'Communicator 2256',
             'Tricorder 2256'
         ]
-        for nameID in nameIDs:
-            if nameID in self.chars:
-                continue
-            char = Character(nameID, 9)
-            char.level = 99
-            for skill in char.skills.values():
-                skill.unlocked = True
-                skill.level = 2
-            self.chars[nameID] = char
-            if not maxGear:
-                continue
-            for slot, gearName in enumerate(gearNames):
-                gear = Gear(
-                    '{} {}'.format(gearName, char.role),
-                    5 + 5 * char.rarityIndex
-                )
-                self.gear.append(gear)
-                self.inGearSlot[gear] = char.gearSlots[slot]
+        with self.bulkLoad():
+            for nameID in nameIDs:
+                if nameID in self.chars:
+                    continue
+                char = Character(nameID, 9)
+                char.level = 99
+                for skill in char.skills.values():
+                    skill.unlocked = True
+                    skill.level = 2
+                self.chars[nameID] = char
+                if not maxGear:
+                    continue
+                for slot, gearName in enumerate(gearNames):
+                    gear = Gear(
+                        '{} {}'.format(gearName, char.role),
+                        5 + 5 * char.rarityIndex
+                    )
+                    self.gear.append(gear)
+                    self.inGearSlot[gear] = char.gearSlots[slot]
 
     def maxGearLevel(self, gear):
         """Returns the maximum possible gear level of the given gear
@@ -0,0 +1,273 @@
+"""The `legends.savefile.SaveFile` class and related objects.
+
+The `legends.functions.decryptSaveFile` function decrypts and parses all
+three save slots, even though only one of them is typically used. A
+`SaveFile` instance reads the save file in the same way, but decrypts
+and parses each slot only when it is first accessed. It can also report
+basic information about each slot without parsing the slot data.
+
+A `SaveFileWatcher` instance detects changes to the save file, such as
+those made when the game syncs a cloud save, and reads the changed file
+in a background thread.
+
+"""
+
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from json import JSONDecoder, loads
+import os
+from plistlib import load
+import re
+from time import monotonic
+from legends.utils.functions import ticksToDatetime, ticksToTimedelta
+from legends.functions import decryptSlotData, saveFilePath
+
+__all__ = ['SaveFile', 'SaveFileWatcher', 'SlotInfo']
+
+SLOT_KEYS = ['{} data'.format(slot) for slot in range(3)]
+"""`list` of `str`: The keys of the save slots in the save file."""
+
+# in the slot data, the first occurrences of these keys are at the top
+# level, so the slot metadata can be found without parsing everything
+_CREATETS = re.compile(r'"createts"\s*:\s*(\d+)')
+_UNITS = re.compile(r'"units"\s*:\s*')
+
+class SaveFile(Mapping):
+    """The STL save file, decrypted one slot at a time.
+
+    A `SaveFile` instance is a read-only mapping with the same keys and
+    values as the dictionary returned by the
+    `legends.functions.decryptSaveFile` function, so it can be passed to
+    `legends.saveslot.SaveSlot.fromFile` in its place. The data of a
+    save slot is decrypted and parsed the first time its key is looked
+    up, and is stored for retrieval.
+
+    """
+
+    def __init__(self, path=None):
+        """The constructor reads, but does not decrypt, the save file.
+
+        Args:
+            path (str): The path to the save file. Defaults to the path
+                returned by `legends.functions.saveFilePath`.
+
+        """
+        if path is None:
+            path = saveFilePath()
+        with open(path, 'rb') as f:
+            self._raw = load(f)
+        self._raw.pop('CloudKitAccountInfoCache', None)
+        for key in SLOT_KEYS:
+            self._raw.setdefault(key, '')
+        self._texts = {}
+        self._slots = {}
+
+    def __getitem__(self, key):
+        if key not in SLOT_KEYS:
+            return self._raw[key]
+        if key not in self._slots:
+            text = self._text(key)
+            self._slots[key] = loads(text) if text else {}
+            self._texts.pop(key, None)
+        return self._slots[key]
+
+    def __contains__(self, key):
+        return key in self._raw
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def decryptAll(self, workers=3):
+        """Decrypts and parses, in parallel, every slot that has not yet
+        been decrypted.
+
+        Args:
+            workers (int): The number of threads to use.
+
+        """
+        keys = [key for key in SLOT_KEYS if key not in self._slots]
+        with ThreadPoolExecutor(workers) as pool:
+            slots = list(pool.map(
+                lambda key: decryptSlotData(self._raw[key]), keys
+            ))
+        for key, slotData in zip(keys, slots):
+            self._slots[key] = slotData
+            self._texts.pop(key, None)
+
+    def slotInfo(self, slot):
+        """Reads basic information about a save slot. The slot data is
+        decrypted if necessary, but only the parts of it that are needed
+        are parsed.
+
+        Args:
+            slot (int): The 0-based index of the save slot.
+
+        Returns:
+            SlotInfo: The information, or `None` if the slot is empty.
+
+        """
+        key = SLOT_KEYS[slot]
+        info = SlotInfo()
+        if key in self._slots:
+            slotData = self._slots[key]
+            if not slotData:
+                return None
+            createts = slotData['createts']
+            info.numChars = len(slotData['units'])
+        else:
+            text = self._text(key)
+            if not text:
+                return None
+            createts = int(_CREATETS.search(text).group(1))
+            match = _UNITS.search(text)
+            info.numChars = len(
+                JSONDecoder().raw_decode(text, match.end())[0]
+            )
+        info.startDate = datetime.fromtimestamp(createts, tz=timezone.utc)
+        try:
+            info.timeLastPlayed = ticksToDatetime(
+                int(self._raw['{} timeLastPlayed'.format(slot)])
+            )
+            info.playDuration = ticksToTimedelta(
+                int(self._raw['{} playDuration'.format(slot)])
+            )
+        except KeyError:
+            pass
+        return info
+
+    def _text(self, key):
+        """Returns the decrypted json string of the slot with the given
+        key, decrypting it if necessary.
+
+        """
+        if key not in self._texts:
+            self._texts[key] = decryptSlotData(self._raw[key], parse=False)
+        return self._texts[key]
+
+class SaveFileWatcher():
+    """Watches the save file for changes to a save slot.
+
+    The watcher does not use a timer or operating system notifications
+    of its own. Instead, its owner calls `SaveFileWatcher.poll` at
+    regular intervals (for instance, with `tk.Tk.after`), which
+    compares the modification time and size of the file with those
+    seen on the previous call. Since the game may write the file in
+    several steps, a change is only reported once the file has been
+    left unchanged for `debounce` seconds. The changed file can then be
+    read with `SaveFileWatcher.load`, which decrypts and parses only the
+    watched slot, in a background thread.
+
+    Attributes:
+        slot (int): The 0-based index of the watched save slot.
+        path (str): The path to the save file.
+        interval (float): The number of seconds the owner should wait
+            between calls to `SaveFileWatcher.poll`.
+        debounce (float): The number of seconds the file must be left
+            unchanged before a change is reported.
+
+    """
+
+    def __init__(self, slot, path=None, interval=2.0, debounce=1.0):
+        """The constructor records the current state of the save file,
+        so that only later changes are reported.
+
+        Args:
+            slot (int): The 0-based index of the save slot to watch.
+            path (str): The path to the save file. Defaults to the path
+                returned by `legends.functions.saveFilePath`.
+            interval (float): The value of the `interval` attribute.
+            debounce (float): The value of the `debounce` attribute.
+
+        """
+        self.slot = slot
+        self.path = saveFilePath() if path is None else path
+        self.interval = interval
+        self.debounce = debounce
+        self._seen = self._stat()
+        self._changed = None
+        self._pool = ThreadPoolExecutor(1)
+
+    def poll(self, now=None):
+        """Checks the save file for changes.
+
+        Args:
+            now (float): The current time, in seconds, on the clock of
+                `time.monotonic`. Defaults to the current time.
+
+        Returns:
+            bool: `True` if the file has changed since the last change
+                was reported, and has been left unchanged for at least
+                `debounce` seconds.
+
+        """
+        if now is None:
+            now = monotonic()
+        stat = self._stat()
+        if stat != self._seen:
+            self._seen = stat
+            self._changed = now
+            return False
+        if self._changed is None or now - self._changed < self.debounce:
+            return False
+        self._changed = None
+        return stat is not None
+
+    def load(self):
+        """Reads the save file in a background thread, decrypting and
+        parsing only the watched slot.
+
+        Returns:
+            concurrent.futures.Future: A future whose result is the
+                `SaveFile`. If the file cannot be read, or the watched
+                slot cannot be decrypted, the future holds the
+                exception instead.
+
+        """
+        return self._pool.submit(self._read)
+
+    def close(self):
+        """Stops the background thread once any pending read is done.
+
+        """
+        self._pool.shutdown(wait=False)
+
+    def _read(self):
+        save = SaveFile(self.path)
+        save[SLOT_KEYS[self.slot]] # pylint: disable=pointless-statement
+        return save
+
+    def _stat(self):
+        """Returns the modification time and size of the save file, or
+        `None` if it does not exist.
+
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+class SlotInfo(): # pylint: disable=too-few-public-methods
+    """Basic information about a save slot.
+
+    Attributes:
+        startDate (datetime): The time the user first played the save
+            slot.
+        timeLastPlayed (datetime): The time the user last played the
+            save slot, or `None` if it is not recorded.
+        playDuration (timedelta): The amount of time the user has spent
+            playing the save slot, or `None` if it is not recorded.
+        numChars (int): The number of characters in the save slot's
+            roster.
+
+    """
+
+    def __init__(self):
+        self.startDate = None
+        self.timeLastPlayed = None
+        self.playDuration = None
+        self.numChars = 0
@@ -3,7 +3,10 @@
 """
 
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from warnings import warn
+import numpy as np
+from legends.utils.eventhandler import Event, EventHandler
 from legends.utils.functions import ticksToDatetime, ticksToTimedelta
 # pylint: disable-next=no-name-in-module
 from legends.constants import (
@@ -16,7 +19,9 @@ from legends.constants import (
 from legends.roster import Roster
 
 __all__ = [
+    'CompleteChangeEvent',
     'Mission',
+    'MissionRewards',
     'MissionNode',
     'NodeConnection',
     'NodeOption',
@@ -25,6 +30,47 @@ __all__ = [
     'STLTimeStamps'
 ]
 
+@lru_cache(maxsize=None)
+def _nodeAssetIDs():
+    """Builds, once, an index of the node assets in `GSMissionNodes`.
+    Issues a warning for each node ID found in more than one node asset.
+
+    Returns:
+        dict: {`str`:`str`} A dictionary mapping each node ID to the ID
+            of the first node asset containing that node.
+
+    """
+    index = {}
+    for nodeAssetID, data in GSMissionNodes.items():
+        for nodeID in data['Nodes']:
+            if nodeID in index:
+                warn('Node ID {} found in multiple node assets.'.format(
+                    nodeID
+                ))
+                continue
+            index[nodeID] = nodeAssetID
+    return index
+
+@lru_cache(maxsize=None)
+def _nodeOptionData():
+    """Builds, once, an index of the node options in
+    `GSNodeExploration`, whose keys have the form
+    '<node ID>_option<2-digit option number>-<difficulty>'.
+
+    Returns:
+        dict: {`tuple`:{`int`:`dict`}} A dictionary mapping pairs
+            (node ID, difficulty name as used in the game data) to a
+            dictionary that maps option numbers to their data in
+            `GSNodeExploration`.
+
+    """
+    index = {}
+    for key, data in GSNodeExploration.items():
+        nodeOption, difficulty = key.rsplit('-', 1)
+        nodeID, optionNum = nodeOption.rsplit('_option', 1)
+        index.setdefault((nodeID, difficulty), {})[int(optionNum)] = data
+    return index
+
 class Mission():
     """A mission in STL.
 
@@ -41,20 +87,24 @@ class Mission():
             connections in this mission.
         rewards (legends.constants.Inventory): The rewards earned from
             100% completion of the mission.
-        complete (float): The proportion of the mission that has been
-            completed.
+        onChange (legends.utils.eventhandler.EventHandler): Sends a
+            `CompleteChangeEvent` to subscribers when the completion
+            status of the mission, or of one of its nodes, changes.
 
     """
     def __init__(self, episode, orderIndex, difficulty):
         self.episode = episode
         self.orderIndex = orderIndex
         self.difficulty = difficulty
+        self.onChange = EventHandler()
 
         self.nodes = {}
         for nodeID in GSMissionNodes[
             'e{}_m{}'.format(self.episode, self.orderIndex)
         ]['Nodes']:
-            self.nodes[nodeID] = MissionNode(nodeID, self.difficulty)
+            node = MissionNode(nodeID, self.difficulty)
+            node.onChange.subscribe(self.onNodeChange)
+            self.nodes[nodeID] = node
 
         self.nodeConnections = []
         for node in self.nodes.values():
@@ -78,9 +128,34 @@ class Mission():
             )]['reward']['AllItems']
         except KeyError:
             initDict = {}
+        self._rewardDict = initDict
         self.rewards = Inventory(initDict)
 
-        self.complete = 0
+        self._complete = 0
+
+    @property
+    def complete(self):
+        """`float`: The proportion of the mission that has been
+        completed.
+        """
+        return self._complete
+
+    @complete.setter
+    def complete(self, value):
+        if value != self._complete:
+            self._complete = value
+            self.onChange.notify(CompleteChangeEvent(self))
+
+    def onNodeChange(self, node):
+        """Sends a `CompleteChangeEvent` to the `onChange` subscribers
+        when the completion status of one of the mission's nodes
+        changes.
+
+        Args:
+            node (MissionNode): The node that changed.
+
+        """
+        self.onChange.notify(CompleteChangeEvent(self, node))
 
     @property
     def _key(self):
@@ -115,17 +190,32 @@ class Mission():
                 rewards from nodes within the mission.
 
         """
-        return sum(
-            (
-                node.rewards for node in self.nodes.values()
-                if not node.complete
-            ),
-            Inventory()
-        )
+        total = {}
+        for node in self.nodes.values():
+            if not node.complete:
+                for itemID, qty in node._rewardDict.items():
+                    total[itemID] = total.get(itemID, 0) + qty
+        return Inventory(total)
 
     def __repr__(self):
         return 'Mission({!r})'.format(self._key)
 
+class CompleteChangeEvent(Event): # pylint: disable=too-few-public-methods
+    """Sent when the completion status of a mission or mission node
+    changes.
+
+    Attributes:
+        mission (Mission): The mission that changed, or the mission
+            containing the node that changed.
+        node (MissionNode): The node that changed, or `None` if the
+            completion status of the mission itself changed.
+
+    """
+
+    def __init__(self, mission, node=None):
+        self.mission = mission
+        self.node = node
+
 class MissionNode():
     """A mission node in STL.
 
@@ -140,19 +230,16 @@ class MissionNode():
             always `None`. If the node is 'Explore' type, there will be
             additional items representing the options available to the
             player from this node.
-        complete (bool): `True` if the node has been completed.
+        onChange (legends.utils.eventhandler.EventHandler): Sends the
+            node to subscribers when its completion status changes.
 
     """
     def __init__(self, nodeID, difficulty):
         self.nodeID = nodeID
+        self.onChange = EventHandler()
 
-        nodeAssetsIDs = []
-        for nodeAssetID, data in GSMissionNodes.items():
-            if self.nodeID in data['Nodes']:
-                nodeAssetsIDs.append(nodeAssetID)
-        if len(nodeAssetsIDs) > 1:
-            warn('Node ID found in multiple node assets.')
-        self.data = GSMissionNodes[nodeAssetsIDs[0]]['Nodes'][self.nodeID]
+        nodeAssetID = _nodeAssetIDs()[self.nodeID]
+        self.data = GSMissionNodes[nodeAssetID]['Nodes'][self.nodeID]
 
         self.difficulty = difficulty
 
@@ -161,19 +248,29 @@ class MissionNode():
             initDict = GSNodeRewards[self._key]['reward']['AllItems']
         except KeyError:
             initDict = {}
+        self._rewardDict = initDict
         self.rewards = Inventory(initDict)
 
         self.options = [None]
         if self.type == 'Explore':
-            optionNum = 1
-            while True:
-                try:
-                    self.options.append(NodeOption(self, optionNum))
-                except OptionError:
-                    break
-                optionNum += 1
+            optionData = _nodeOptionData().get(
+                (self.nodeID, DIFFICULTIES[self.difficulty]), {}
+            )
+            while len(self.options) in optionData:
+                self.options.append(NodeOption(self, len(self.options)))
+
+        self._complete = False
+
+    @property
+    def complete(self):
+        """`bool`: `True` if the node has been completed."""
+        return self._complete
 
-        self.complete = False
+    @complete.setter
+    def complete(self, value):
+        if value != self._complete:
+            self._complete = value
+            self.onChange.notify(self)
 
     @property
     def type(self):
@@ -281,13 +378,9 @@ class NodeOption(): # pylint: disable=too-few-public-methods
         """
         self.node = node
         self.optionNum = optionNum
-        key = '{}_option{:02d}-{}'.format(
-                self.node.nodeID,
-                self.optionNum,
-                DIFFICULTIES[self.node.difficulty]
-            )
+        key = (self.node.nodeID, DIFFICULTIES[self.node.difficulty])
         try:
-            data = GSNodeExploration[key]
+            data = _nodeOptionData()[key][self.optionNum]
         except KeyError as ex:
             raise OptionError('Option {} not found for {}'.format(
                 self.optionNum, self.node
@@ -311,6 +404,124 @@ class OptionError(Exception):
 
     pass # pylint: disable=unnecessary-pass
 
+class MissionRewards():
+    """The uncollected rewards of a list of missions.
+
+    The rewards of the missions and their nodes are stored as the rows
+    of a matrix, together with an array indicating which rows have been
+    collected. The rewards of a mission and of its nodes count as
+    collected when the mission is fully complete. Otherwise, the rewards
+    of the mission are uncollected, and the rewards of each node are
+    collected if the node is complete. The total of the uncollected rows
+    is updated each time a mission sends a `CompleteChangeEvent`.
+
+    Attributes:
+        missions (list of Mission): The missions.
+        itemIDs (list of str): The item IDs in `GSItem`, in the order
+            used to index the columns of `matrix`.
+        matrix (numpy.ndarray): An integer array with one row for each
+            mission and one row for each node, containing the quantity
+            of each item given as a reward.
+        collected (numpy.ndarray): A boolean array indicating which rows
+            of `matrix` have been collected.
+
+    """
+
+    def __init__(self, missions):
+        """The constructor builds the matrix from the given missions,
+        and subscribes to their `onChange` event handlers with the
+        `MissionRewards.onCompleteChange` method.
+
+        """
+        self.missions = missions
+        self.itemIDs = list(ITEMS)
+        columns = {itemID: col for col, itemID in enumerate(self.itemIDs)}
+        self._rows = {}
+        rewardDicts = []
+        for mission in missions:
+            self._rows[mission] = range(
+                len(rewardDicts), len(rewardDicts) + 1 + len(mission.nodes)
+            )
+            rewardDicts.append(mission._rewardDict)
+            rewardDicts.extend(
+                node._rewardDict for node in mission.nodes.values()
+            )
+            mission.onChange.subscribe(self.onCompleteChange)
+        self.matrix = np.zeros((len(rewardDicts), len(self.itemIDs)), int)
+        for row, rewardDict in enumerate(rewardDicts):
+            for itemID, qty in rewardDict.items():
+                self.matrix[row, columns[itemID]] = qty
+        self.collected = np.zeros(len(rewardDicts), dtype=bool)
+        for mission in missions:
+            self.collected[self._rows[mission]] = self._collected(mission)
+        self._missing = self.matrix[~self.collected].sum(axis=0)
+        self._categories = {}
+
+    def missing(self, category=None):
+        """Returns the uncollected rewards.
+
+        Args:
+            category (str): If given, only items whose `category`
+                attribute matches this are included.
+
+        Returns:
+            legends.constants.Inventory: The uncollected rewards.
+
+        """
+        if category is None:
+            cols = np.flatnonzero(self._missing)
+        else:
+            if category not in self._categories:
+                self._categories[category] = np.array([
+                    col for col, itemID in enumerate(self.itemIDs)
+                    if ITEMS[itemID].category == category
+                ], dtype=int)
+            cols = self._categories[category]
+        return Inventory({
+            self.itemIDs[col]: int(self._missing[col]) for col in cols
+        })
+
+    def onCompleteChange(self, completeChangeEvent):
+        """Updates the collected rows, and the total of the uncollected
+        rows, for the mission that changed.
+
+        Args:
+            completeChangeEvent (CompleteChangeEvent): The event sent
+                by the mission.
+
+        """
+        mission = completeChangeEvent.mission
+        rows = self._rows[mission]
+        collected = self._collected(mission)
+        changed = collected != self.collected[rows]
+        if not changed.any():
+            return
+        changedRows = np.asarray(rows)[changed]
+        # rows becoming collected are subtracted, the others are added
+        signs = np.where(collected[changed], -1, 1)
+        self._missing += signs @ self.matrix[changedRows]
+        self.collected[changedRows] = collected[changed]
+
+    @staticmethod
+    def _collected(mission):
+        """Determines which of the rows of the given mission have been
+        collected.
+
+        Args:
+            mission (Mission): The mission.
+
+        Returns:
+            numpy.ndarray: A boolean array with one entry for the
+                mission and one for each of its nodes.
+
+        """
+        if mission.complete >= 1:
+            return np.ones(1 + len(mission.nodes), dtype=bool)
+        return np.array(
+            [False] + [node.complete for node in mission.nodes.values()],
+            dtype=bool
+        )
+
 class SaveSlot():
     """Data from one of three save slots in an STL save file.
 
@@ -327,7 +538,8 @@ class SaveSlot():
         inventory (legends.constants.Inventory): The inventory
             associated with the save slot.
         missions (list of Mission): The list of missions associated with
-            the save slot.
+            the save slot. The missions are built the first time this
+            attribute is accessed.
         survivalEffects (dict): {`str`:[`int`]} A dictionary mapping
             names of active battle modifiers in survival mode to a list.
             Each item in the list represent one instance of the
@@ -343,16 +555,67 @@ class SaveSlot():
         self.tokens = {nameID: 0 for nameID in GSCharacter}
         self.favorites = []
         self.inventory = Inventory()
-        self.missions = []
-        for difficulty in ['Normal', 'Advanced', 'Expert']:
-            for episode in range(1,8):
-                for orderIndex in range(1,7):
-                    self.missions.append(
-                        Mission(episode, orderIndex, difficulty)
-                    )
+        self._missions = None
+        self._missionData = {}
+        self._missionRewards = None
         self.survivalEffects = {}
 
-    def fromFile(self, save, slot):
+    @property
+    def missions(self):
+        """`list` of `Mission`: The list of missions associated with
+        the save slot, built on first access.
+        """
+        if self._missions is None:
+            self._missions = [
+                Mission(episode, orderIndex, difficulty)
+                for difficulty in ['Normal', 'Advanced', 'Expert']
+                for episode in range(1,8)
+                for orderIndex in range(1,7)
+            ]
+            self._applyMissionData()
+        return self._missions
+
+    @property
+    def missionData(self):
+        """`dict`: The completion status of the missions and their
+        nodes, in the format of the 'missions' entry of the save slot
+        data. Only missions with some progress are included. Setting
+        this property updates the missions, if they have been built.
+        """
+        if self._missions is None:
+            return self._missionData
+        missionData = {}
+        for mission in self._missions:
+            nodes = {
+                nodeID: {'complete': node.complete}
+                for nodeID, node in mission.nodes.items() if node.complete
+            }
+            if not mission.complete and not nodes:
+                continue
+            missionKey = 'episode {} mission {}'.format(
+                mission.episode, mission.orderIndex
+            )
+            missionData.setdefault(missionKey, {})[
+                DIFFICULTIES[mission.difficulty]
+            ] = {'complete_pct': mission.complete * 100, 'nodes': nodes}
+        return missionData
+
+    @missionData.setter
+    def missionData(self, value):
+        self._missionData = value
+        if self._missions is not None:
+            self._applyMissionData()
+
+    @property
+    def missionRewards(self):
+        """`MissionRewards`: The uncollected rewards of the missions in
+        `missions`, built on first access.
+        """
+        if self._missionRewards is None:
+            self._missionRewards = MissionRewards(self.missions)
+        return self._missionRewards
+
+    def fromFile(self, save, slot, sync=False):
         """Uses the given save data to populate the calling instance's
         attributes.
 
@@ -362,6 +625,12 @@ class SaveSlot():
                 `legends.functions.decryptSaveFile` function.
             slot (int): The 0-based index of the save slot from which to
                 draw the data.
+            sync (bool): `True` if the instance was already populated
+                from an earlier version of the same save slot. The
+                roster is then updated in place with
+                `legends.roster.Roster.syncFromSaveData`, and items and
+                survival effects missing from the save data are
+                cleared.
 
         Raises:
             ValueError: If the given slot is not in the given save data,
@@ -372,17 +641,42 @@ class SaveSlot():
         if key not in save or not save[key]:
             raise ValueError(slot)
         self.timestamps.fromSaveData(save, slot)
-        self.roster.fromSaveData(save, slot)
+        if sync:
+            self.roster.syncFromSaveData(save, slot)
+            for item in ITEMS.values():
+                self.inventory[item] = 0
+            self.survivalEffects.clear()
+        else:
+            self.roster.fromSaveData(save, slot)
         for nameID in self.tokens:
             self.tokens[nameID] = save[key]['items'].get(nameID, 0)
         for itemID, qty in save[key]['items'].items():
             self.inventory[ITEMS[itemID]] = qty
-        for mission in self.missions:
+        self._missionData = save[key].get('missions', {})
+        if self._missions is not None:
+            self._applyMissionData()
+        try:
+            for effectID, durations in (
+                save[key]['dungeon']['mission_effects'].items()
+            ):
+                modID = GSMissionEffects[effectID]['battleModifierID']
+                tooltipID = GSBattleModifier[modID]['TooltipID']
+                nameKey = GSTooltip[tooltipID]['headerText']
+                self.survivalEffects[DESCRIPTIONS[nameKey].title()] = durations
+        except KeyError:
+            pass
+
+    def _applyMissionData(self):
+        """Sets the completion status of the missions and their nodes
+        from the mission data stored by `fromFile`.
+
+        """
+        for mission in self._missions:
             missionKey = 'episode {} mission {}'.format(
                 mission.episode, mission.orderIndex
             )
             try:
-                data = save[key]['missions'][missionKey][
+                data = self._missionData[missionKey][
                     DIFFICULTIES[mission.difficulty]
                 ]
             except KeyError:
@@ -393,17 +687,6 @@ class SaveSlot():
                     node.complete = data['nodes'][node.nodeID]['complete']
                 except KeyError:
                     pass
-        try:
-            for effectID, durations in (
-                save[key]['dungeon']['mission_effects'].items()
-            ):
-                modID = GSMissionEffects[effectID]['battleModifierID']
-                nameKey = (
-                    GSTooltip[GSBattleModifier[modID]['TooltipID']]['headerText']
-                )
-                self.survivalEffects[DESCRIPTIONS[nameKey].title()] = durations
-        except KeyError:
-            pass
 
     def sort(self, func, descending=True):
         """Sorts the dictionary of characters stored in the `roster`
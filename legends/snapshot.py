@@ -0,0 +1,357 @@
+"""Saving and loading the state of a save slot.
+
+A snapshot records everything in a `legends.saveslot.SaveSlot` that the
+*STL Planner* app lets the user change: the roster, including edited
+ranks, levels, skills, gear, particles, and equipment, together with the
+favorites, tokens, inventory, mission progress, survival effects, and
+timestamps. It can also hold the settings of a session, as a dictionary
+that can be serialized as json.
+
+Snapshots are stored in a compact binary format. The file begins with
+the 4-byte signature `SNAPSHOT_MAGIC` and a 2-byte version number,
+followed by the zlib-compressed body. The body begins with a table of
+every string used in the snapshot (name IDs, gear IDs, stat names, and
+so on), so that each string is stored once and referred to elsewhere by
+its 2-byte index. The rest of the body consists of fixed-width records,
+packed with the `struct` module.
+
+"""
+
+from datetime import datetime, timedelta, timezone
+from json import dumps, loads
+import struct
+from zlib import compress, decompress, error as ZlibError
+from legends.constants import ITEMS
+from legends.gameobjects import Character, Gear, Particle
+from legends.saveslot import SaveSlot
+
+__all__ = [
+    'dumpSnapshot',
+    'loadSnapshot',
+    'readSnapshot',
+    'SnapshotError',
+    'writeSnapshot'
+]
+
+SNAPSHOT_MAGIC = b'STLS'
+"""`bytes`: The signature at the start of every snapshot."""
+
+SNAPSHOT_VERSION = 1
+"""`int`: The version of the snapshot format written by this module.
+Snapshots with a later version cannot be loaded."""
+
+_HEADER = struct.Struct('<4sH')
+_NONE = 0xFFFF
+_NO_ITEM = 0xFFFFFFFF
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be loaded.
+
+    """
+
+    pass # pylint: disable=unnecessary-pass
+
+class _Writer():
+    """Packs records into a snapshot body, interning strings."""
+
+    def __init__(self):
+        self.chunks = []
+        self.strings = {}
+
+    def pack(self, fmt, *values):
+        """Packs the given values with the given `struct` format."""
+        self.chunks.append(struct.pack('<' + fmt, *values))
+
+    def string(self, value):
+        """Returns the index of the given string in the string table,
+        adding it if necessary. The index of `None` is `_NONE`.
+
+        """
+        if value is None:
+            return _NONE
+        return self.strings.setdefault(value, len(self.strings))
+
+    def body(self):
+        """Returns the string table followed by the packed records."""
+        table = [struct.pack('<H', len(self.strings))]
+        for value in self.strings:
+            encoded = value.encode('utf-8')
+            table.append(struct.pack('<H', len(encoded)))
+            table.append(encoded)
+        return b''.join(table + self.chunks)
+
+class _Reader():
+    """Unpacks records from a snapshot body."""
+
+    def __init__(self, body):
+        self.body = body
+        self.offset = 0
+        self.strings = []
+        for _ in range(self.unpack('H')[0]):
+            length = self.unpack('H')[0]
+            self.strings.append(
+                body[self.offset:self.offset + length].decode('utf-8')
+            )
+            self.offset += length
+
+    def unpack(self, fmt):
+        """Unpacks a record with the given `struct` format."""
+        fmt = struct.Struct('<' + fmt)
+        values = fmt.unpack_from(self.body, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def string(self, index):
+        """Returns the string with the given index in the string table,
+        or `None` if the index is `_NONE`.
+
+        """
+        return None if index == _NONE else self.strings[index]
+
+def dumpSnapshot(saveslot, settings=None):
+    """Creates a snapshot of a save slot.
+
+    Args:
+        saveslot (legends.saveslot.SaveSlot): The save slot.
+        settings (dict): Session settings to store with the snapshot.
+            Must be serializable as json.
+
+    Returns:
+        bytes: The snapshot.
+
+    """
+    out = _Writer()
+    roster = saveslot.roster
+
+    timestamps = saveslot.timestamps
+    out.pack(
+        'ddd',
+        timestamps.startDate.timestamp(),
+        timestamps.timeLastPlayed.timestamp(),
+        timestamps.playDuration.total_seconds()
+    )
+
+    gearIndex = {}
+    out.pack('I', len(roster.gear))
+    for index, gear in enumerate(roster.gear):
+        gearIndex[gear] = index
+        out.pack('HB', out.string(gear.gearID), gear.level)
+    partIndex = {}
+    out.pack('I', len(roster.parts))
+    for index, part in enumerate(roster.parts):
+        partIndex[part] = index
+        out.pack(
+            'HHB?4H', out.string(part.typ), out.string(part.rarity),
+            part.level, part.locked,
+            *[out.string(statName) for statName in part.statNames]
+        )
+
+    out.pack('H', len(roster.chars))
+    for nameID, char in roster.chars.items():
+        out.pack(
+            'HBIB', out.string(nameID), char.rank, char.xp, len(char.skills)
+        )
+        for skillID, skill in char.skills.items():
+            out.pack('HB?', out.string(skillID), skill.level, skill.unlocked)
+        out.pack('4I', *[
+            gearIndex.get(roster.containsGear.get(gearSlot), _NO_ITEM)
+            for gearSlot in char.gearSlots
+        ])
+        out.pack('2I', *[
+            partIndex.get(roster.containsPart.get(partSlot), _NO_ITEM)
+            for partSlot in char.partSlots
+        ])
+
+    out.pack('H', len(saveslot.favorites))
+    for char in saveslot.favorites:
+        out.pack('H', out.string(char.nameID))
+    tokens = [(nameID, qty) for nameID, qty in saveslot.tokens.items() if qty]
+    out.pack('H', len(tokens))
+    for nameID, qty in tokens:
+        out.pack('Hq', out.string(nameID), qty)
+    items = [
+        (item.itemID, saveslot.inventory[item]) for item in ITEMS.values()
+        if saveslot.inventory[item]
+    ]
+    out.pack('H', len(items))
+    for itemID, qty in items:
+        out.pack('Hq', out.string(itemID), qty)
+
+    out.pack('H', len(saveslot.survivalEffects))
+    for name, durations in saveslot.survivalEffects.items():
+        out.pack('HH', out.string(name), len(durations))
+        out.pack('{}H'.format(len(durations)), *durations)
+
+    missions = [
+        (missionKey, difficulty, data)
+        for missionKey, difficulties in saveslot.missionData.items()
+        for difficulty, data in difficulties.items()
+    ]
+    out.pack('H', len(missions))
+    for missionKey, difficulty, data in missions:
+        out.pack(
+            'HHdH', out.string(missionKey), out.string(difficulty),
+            data['complete_pct'], len(data['nodes'])
+        )
+        for nodeID, nodeData in data['nodes'].items():
+            out.pack('H?', out.string(nodeID), nodeData['complete'])
+
+    encoded = b'' if settings is None else dumps(settings).encode('utf-8')
+    out.pack('I', len(encoded))
+    out.chunks.append(encoded)
+
+    return (
+        _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION)
+        + compress(out.body())
+    )
+
+def loadSnapshot(data):
+    """Builds a save slot from a snapshot. The roster is built directly
+    from the snapshot records, in a `legends.roster.Roster.bulkLoad`
+    block: each particle's stats are computed once, and equipment is
+    assigned without checking gear levels against character rarities,
+    since the snapshot was taken of a valid roster.
+
+    Args:
+        data (bytes): The snapshot, as returned by `dumpSnapshot`.
+
+    Returns:
+        tuple: (`legends.saveslot.SaveSlot`, `dict`) The save slot and
+            the session settings stored with the snapshot, or `None` if
+            there are none.
+
+    Raises:
+        SnapshotError: If the data is not a snapshot, or has a later
+            version than `SNAPSHOT_VERSION`, or is corrupt.
+
+    """
+    if len(data) < _HEADER.size:
+        raise SnapshotError('not a snapshot')
+    magic, version = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError('not a snapshot')
+    if version > SNAPSHOT_VERSION:
+        raise SnapshotError(
+            'snapshot version {} is not supported'.format(version)
+        )
+    try:
+        return _loadBody(_Reader(decompress(data[_HEADER.size:])))
+    except (
+        struct.error, ZlibError, IndexError, KeyError, ValueError
+    ) as ex:
+        raise SnapshotError('corrupt snapshot') from ex
+
+def _loadBody(inp):
+    """Builds a save slot from the body of a snapshot.
+
+    Args:
+        inp (_Reader): The body of the snapshot.
+
+    Returns:
+        tuple: As in `loadSnapshot`.
+
+    """
+    saveslot = SaveSlot()
+    roster = saveslot.roster
+
+    start, last, duration = inp.unpack('ddd')
+    saveslot.timestamps.startDate = datetime.fromtimestamp(
+        start, tz=timezone.utc
+    )
+    saveslot.timestamps.timeLastPlayed = datetime.fromtimestamp(
+        last, tz=timezone.utc
+    )
+    saveslot.timestamps.playDuration = timedelta(seconds=duration)
+
+    with roster.bulkLoad():
+        gearList = []
+        for _ in range(inp.unpack('I')[0]):
+            gearID, level = inp.unpack('HB')
+            gearList.append(Gear(inp.string(gearID), level))
+        roster.gear.extend(gearList)
+        partList = []
+        for _ in range(inp.unpack('I')[0]):
+            typ, rarity, level, locked, *statNames = inp.unpack('HHB?4H')
+            part = Particle(inp.string(typ), inp.string(rarity), level, locked)
+            part.setStatNames(inp.string(statName) for statName in statNames)
+            partList.append(part)
+        roster.parts.extend(partList)
+
+        roster.inGearSlot.enforceLevel = False
+        for _ in range(inp.unpack('H')[0]):
+            nameID, rank, xp, numSkills = inp.unpack('HBIB')
+            char = Character(inp.string(nameID), rank, xp)
+            for _ in range(numSkills):
+                skillID, level, unlocked = inp.unpack('HB?')
+                skill = char.skills[inp.string(skillID)]
+                skill.level = level
+                skill.unlocked = unlocked
+            for gearSlot, index in zip(char.gearSlots, inp.unpack('4I')):
+                if index != _NO_ITEM:
+                    roster.inGearSlot[gearList[index]] = gearSlot
+            for partSlot, index in zip(char.partSlots, inp.unpack('2I')):
+                if index != _NO_ITEM:
+                    roster.inPartSlot[partList[index]] = partSlot
+            roster.chars[char.nameID] = char
+        roster.inGearSlot.enforceLevel = True
+
+    for _ in range(inp.unpack('H')[0]):
+        nameID = inp.unpack('H')[0]
+        saveslot.favorites.append(roster.chars[inp.string(nameID)])
+    for _ in range(inp.unpack('H')[0]):
+        nameID, qty = inp.unpack('Hq')
+        saveslot.tokens[inp.string(nameID)] = qty
+    for _ in range(inp.unpack('H')[0]):
+        itemID, qty = inp.unpack('Hq')
+        saveslot.inventory[ITEMS[inp.string(itemID)]] = qty
+
+    for _ in range(inp.unpack('H')[0]):
+        name, count = inp.unpack('HH')
+        saveslot.survivalEffects[inp.string(name)] = list(
+            inp.unpack('{}H'.format(count))
+        )
+
+    missionData = {}
+    for _ in range(inp.unpack('H')[0]):
+        missionKey, difficulty, pct, numNodes = inp.unpack('HHdH')
+        nodes = {}
+        for _ in range(numNodes):
+            nodeID, complete = inp.unpack('H?')
+            nodes[inp.string(nodeID)] = {'complete': complete}
+        missionData.setdefault(inp.string(missionKey), {})[
+            inp.string(difficulty)
+        ] = {'complete_pct': pct, 'nodes': nodes}
+    saveslot.missionData = missionData
+
+    length = inp.unpack('I')[0]
+    encoded = inp.body[inp.offset:inp.offset + length]
+    settings = loads(encoded.decode('utf-8')) if length else None
+    return saveslot, settings
+
+def writeSnapshot(path, saveslot, settings=None):
+    """Writes a snapshot of a save slot to a file.
+
+    Args:
+        path (str): The path to the file.
+        saveslot (legends.saveslot.SaveSlot): The save slot.
+        settings (dict): Session settings to store with the snapshot.
+
+    """
+    with open(path, 'wb') as f:
+        f.write(dumpSnapshot(saveslot, settings))
+
+def readSnapshot(path):
+    """Reads a snapshot from a file.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        tuple: As in `loadSnapshot`.
+
+    Raises:
+        SnapshotError: As in `loadSnapshot`.
+
+    """
+    with open(path, 'rb') as f:
+        return loadSnapshot(f.read())
@@ -186,16 +186,18 @@ class StatObject():
 
     def __add__(self, other):
         result = self.__class__(self.statAbbrs)
-        for statAbbr in self.statAbbrs.values():
-            statSum = getattr(self, statAbbr) + getattr(other, statAbbr)
-            setattr(result, statAbbr, statSum)
+        result.update({
+            statName: getattr(self, statAbbr) + getattr(other, statAbbr)
+            for statName, statAbbr in self.statAbbrs.items()
+        })
         return result
 
     def __mul__(self, other):
         result = self.__class__(self.statAbbrs)
-        for statAbbr in self.statAbbrs.values():
-            statProd = getattr(self, statAbbr) * getattr(other, statAbbr)
-            setattr(result, statAbbr, statProd)
+        result.update({
+            statName: getattr(self, statAbbr) * getattr(other, statAbbr)
+            for statName, statAbbr in self.statAbbrs.items()
+        })
         return result
 
     def __repr__(self):
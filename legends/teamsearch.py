@@ -0,0 +1,546 @@
+"""Tools used to search a roster for the best teams of four characters.
+
+A search is performed by a `TeamSearch` instance, which pairs a roster
+with an objective and a set of constraints. Objectives that score a
+team as the sum of the scores of its members (`PowerObjective` and
+`EffStatObjective`) are searched exactly with a branch-and-bound
+algorithm. Objectives that cannot be decomposed in this way
+(`WinRateObjective`) supply an additive proxy objective, which is used
+to build a shortlist of teams that are then scored directly.
+
+"""
+
+import heapq
+import itertools
+from legends.constants import EFF_STATS, POWER_AT_ORIGIN
+from legends.effstatcalc import pvpMeta
+from legends.battle import BatchBattleSim
+from legends.roster import RosterReloadEvent
+
+__all__ = [
+    'EffStatObjective',
+    'PowerObjective',
+    'TeamConstraints',
+    'TeamObjective',
+    'TeamSearch',
+    'WinRateObjective'
+]
+
+TEAM_SIZE = 4
+"""`int`: The number of characters in a team."""
+
+class TeamObjective():
+    """An objective function for teams of characters, meant to be
+    subclassed.
+
+    The base class scores a team as the sum of the scores of its
+    members. Subclasses must override the `calculate` method. Character
+    scores are stored in a private dictionary for retrieval, and are
+    discarded when the roster's `charChangeWatcher` reports that the
+    character has changed.
+
+    Attributes:
+        additive (bool): `True` if the score of a team is the sum of the
+            scores of its members.
+
+    """
+
+    additive = True
+
+    def __init__(self, roster):
+        """The constructor subscribes weakly to the roster's
+        `charChangeWatcher` event handler with the
+        `TeamObjective.onCharChange` method.
+
+        """
+        self._roster = roster
+        self._roster.charChangeWatcher.subscribe(
+            self.onCharChange, weak=True
+        )
+        self._data = {}
+
+    @property
+    def roster(self):
+        """`legends.roster.Roster`: The roster to which this objective
+        belongs.
+        """
+        return self._roster
+
+    def calculate(self, char):
+        """Computes the score of a single character.
+
+        Args:
+            char (legends.gameobjects.Character): The character to
+                score. Should belong to the associated roster.
+
+        Returns:
+            float: The character's score.
+
+        """
+        raise NotImplementedError
+
+    def charScore(self, char):
+        """Returns the score of the given character. Looks it up in the
+        underlying dictionary, if it exists. Otherwise, computes it.
+
+        Args:
+            char (legends.gameobjects.Character): The character to
+                score. Should belong to the associated roster.
+
+        Returns:
+            float: The character's score.
+
+        """
+        if char.nameID not in self._data:
+            self._data[char.nameID] = self.calculate(char)
+        return self._data[char.nameID]
+
+    def scores(self, chars):
+        """Returns the scores of the given characters.
+
+        Args:
+            chars (list of legends.gameobjects.Character): The
+                characters to score.
+
+        Returns:
+            list of float: The scores, in the same order as `chars`.
+
+        """
+        return [self.charScore(char) for char in chars]
+
+    def teamScore(self, team):
+        """Computes the score of the given team.
+
+        Args:
+            team (tuple of legends.gameobjects.Character): The team.
+
+        Returns:
+            float: The team's score.
+
+        """
+        return sum(self.charScore(char) for char in team)
+
+    def proxy(self):
+        """Returns the additive objective used to shortlist teams when
+        this objective is not additive.
+
+        Returns:
+            TeamObjective: The proxy objective.
+
+        """
+        return self
+
+    def onCharChange(self, charChangeEvent):
+        """Discards the stored score of a character when it is modified,
+        or every stored score when the roster is reloaded.
+
+        Args:
+            charChangeEvent (legends.roster.CharChangeEvent): The event
+                sent by the roster's `charChangeWatcher` event handler.
+
+        """
+        if isinstance(charChangeEvent, RosterReloadEvent):
+            self._data.clear()
+            return
+        self._data.pop(charChangeEvent.char.nameID, None)
+
+class PowerObjective(TeamObjective):
+    """Scores a team by its total power.
+
+    If a mission is given, the mission's suggested power is subtracted
+    from the team's total power, so that teams with nonnegative scores
+    meet the suggested power.
+
+    Attributes:
+        mission (legends.saveslot.Mission): The mission whose suggested
+            power is used, or `None`.
+
+    """
+
+    def __init__(self, roster, mission=None):
+        TeamObjective.__init__(self, roster)
+        self.mission = mission
+
+    def calculate(self, char):
+        """Returns the total power of the given character, including
+        gear and particles.
+
+        """
+        return POWER_AT_ORIGIN + char.totalStats(self.roster).power
+
+    def teamScore(self, team):
+        """Returns the total power of the team, minus the suggested
+        power of the mission, if there is one.
+
+        """
+        score = TeamObjective.teamScore(self, team)
+        if self.mission is not None:
+            score -= self.mission.power
+        return score
+
+class EffStatObjective(TeamObjective):
+    """Scores a team by the effective stats of its members.
+
+    Each effective stat is divided by its maximum value among the
+    characters being scored, so that all effective stats are on the
+    same scale. The score of a character is the weighted sum of these
+    scaled effective stats.
+
+    Attributes:
+        calc (legends.effstatcalc.EffStatCalc): The effective stat
+            calculator used to compute effective stats. Its settings
+            must be fully instantiated.
+        weights (dict): {`str`:`float`} A dictionary mapping effective
+            stat names, as they appear in `EFF_STATS`, to their weights.
+
+    """
+
+    def __init__(self, calc, weights=None):
+        """The constructor uses the roster of the given effective stat
+        calculator. If no weights are given, every effective stat is
+        given a weight of 1.
+
+        """
+        TeamObjective.__init__(self, calc.roster)
+        self.calc = calc
+        if weights is None:
+            weights = {statName: 1 for statName in EFF_STATS}
+        self.weights = weights
+        self._scale = {statName: 1 for statName in EFF_STATS}
+
+    def calculate(self, char):
+        """Returns the weighted sum of the scaled effective stats of the
+        given character.
+
+        """
+        effStats = self.calc.get(char)
+        return sum(
+            weight * effStats.get(statName) / self._scale[statName]
+            for statName, weight in self.weights.items()
+        )
+
+    def scores(self, chars):
+        """Rescales the effective stats to the given characters, then
+        returns their scores.
+
+        """
+        scale = {
+            statName: max(
+                [self.calc.get(char).get(statName) for char in chars] + [0]
+            ) or 1
+            for statName in EFF_STATS
+        }
+        if scale != self._scale:
+            self._scale = scale
+            self._data.clear()
+        return TeamObjective.scores(self, chars)
+
+class WinRateObjective(TeamObjective):
+    """Scores a team by its simulated win rate against a fixed enemy
+    team.
+
+    Win rates are computed with `legends.battle.BatchBattleSim` and
+    stored by team. Since the win rate of a team is not the sum of
+    scores of its members, this objective is not additive. Its proxy is
+    a `PowerObjective` on the same roster.
+
+    Attributes:
+        enemies (list of legends.gameobjects.Character): The enemy
+            team.
+        enemyRoster (legends.roster.Roster): The roster to which the
+            enemy characters belong.
+        numBattles (int): The number of battles simulated per team.
+        seed (int): The seed passed to the simulator.
+
+    """
+
+    additive = False
+
+    def __init__(
+        self, roster, enemies=None, enemyRoster=None, numBattles=2000,
+        seed=0
+    ):
+        """The constructor uses the characters of `pvpMeta` as the enemy
+        team if no enemies are given, and subscribes weakly to batches
+        of changes from the roster's `charChangeWatcher` with the
+        `WinRateObjective.onCharBatch` method.
+
+        """
+        TeamObjective.__init__(self, roster)
+        if enemies is None:
+            meta = pvpMeta()
+            enemies = [enemyChar.settings.char for enemyChar in meta]
+            enemyRoster = meta[0].settings.roster
+        self.enemies = enemies
+        self.enemyRoster = enemyRoster
+        self.numBattles = numBattles
+        self.seed = seed
+        self._proxy = PowerObjective(roster)
+        self._teamData = {}
+        roster.charChangeWatcher.subscribeBatch(self.onCharBatch, weak=True)
+
+    def calculate(self, char):
+        """Returns the proxy score of the given character."""
+        return self._proxy.charScore(char)
+
+    def teamScore(self, team):
+        """Returns the simulated win rate of the given team. Looks it up
+        in the underlying dictionary, if it exists. Otherwise, runs the
+        simulation.
+
+        """
+        key = frozenset(char.nameID for char in team)
+        if key not in self._teamData:
+            sim = BatchBattleSim(
+                list(team), self.enemies, self.roster, self.enemyRoster
+            )
+            self._teamData[key] = sim.simulate(
+                self.numBattles, self.seed
+            ).winRate
+        return self._teamData[key]
+
+    def proxy(self):
+        return self._proxy
+
+    def onCharBatch(self, charBatchEvent):
+        """Discards the stored win rates of all teams that contain a
+        modified character, once for each batch of changes.
+
+        Args:
+            charBatchEvent (legends.roster.CharBatchEvent): The event
+                sent by the roster's `charChangeWatcher` event handler.
+
+        """
+        if charBatchEvent.reloaded:
+            self._teamData.clear()
+            return
+        nameIDs = {char.nameID for char in charBatchEvent.chars}
+        self._teamData = {
+            key: value for key, value in self._teamData.items()
+            if key.isdisjoint(nameIDs)
+        }
+
+class TeamConstraints():
+    """Constraints on the composition of a team.
+
+    Attributes:
+        roles (list of str): Roles that must appear in the team. A role
+            listed more than once must appear at least that many times.
+        allowedRoles (list of str): If not `None`, every member of the
+            team must have one of these roles.
+        tags (list of str): Tags that every member of the team must
+            have.
+        stations (list of str): Bridge stations that the team must be
+            able to fill, with a different member in each station.
+        include (list of str): Name IDs of characters that must be in
+            the team.
+        exclude (list of str): Name IDs of characters that may not be
+            in the team.
+
+    """
+
+    def __init__(
+        self, roles=None, allowedRoles=None, tags=None, stations=None,
+        include=None, exclude=None
+    ):
+        self.roles = [] if roles is None else list(roles)
+        self.allowedRoles = allowedRoles
+        self.tags = [] if tags is None else list(tags)
+        self.stations = [] if stations is None else list(stations)
+        self.include = [] if include is None else list(include)
+        self.exclude = [] if exclude is None else list(exclude)
+
+    def allows(self, char):
+        """Determines whether the given character may be a member of a
+        team under these constraints.
+
+        Args:
+            char (legends.gameobjects.Character): The character.
+
+        Returns:
+            bool: `True` if the character is allowed.
+
+        """
+        if char.nameID in self.exclude:
+            return False
+        if self.allowedRoles is not None and (
+            char.role not in self.allowedRoles
+        ):
+            return False
+        return all(tag in char.tags for tag in self.tags)
+
+    def missing(self, team):
+        """Counts the members that must still be added to the given
+        (possibly incomplete) team in order to satisfy the role, station,
+        and inclusion constraints. The count is a lower bound; it may be
+        impossible to satisfy the constraints with that many members.
+
+        Args:
+            team (tuple of legends.gameobjects.Character): The team.
+
+        Returns:
+            int: The number of members still needed.
+
+        """
+        nameIDs = [char.nameID for char in team]
+        needIncluded = sum(
+            nameID not in nameIDs for nameID in self.include
+        )
+        roles = [char.role for char in team]
+        needRoles = 0
+        for role in set(self.roles):
+            needRoles += max(self.roles.count(role) - roles.count(role), 0)
+        needStations = len(self.stations) - self._matchStations(team)
+        return max(needIncluded, needRoles, needStations)
+
+    def satisfied(self, team):
+        """Determines whether the given team satisfies the constraints.
+
+        Args:
+            team (tuple of legends.gameobjects.Character): The team.
+
+        Returns:
+            bool: `True` if the constraints are satisfied.
+
+        """
+        return all(self.allows(char) for char in team) and (
+            self.missing(team) == 0
+        )
+
+    def _matchStations(self, team):
+        """Returns the largest number of required stations that can be
+        filled by distinct members of the given team. Each member may
+        fill any of the required stations, so this is the size of a
+        maximum matching of members to stations, found by augmenting
+        paths.
+
+        """
+        filledBy = [None] * len(self.stations)
+        def assign(member, seen):
+            for index, station in enumerate(self.stations):
+                if index in seen or station not in member.bridgeStations:
+                    continue
+                seen.add(index)
+                if filledBy[index] is None or assign(filledBy[index], seen):
+                    filledBy[index] = member
+                    return True
+            return False
+        return sum(assign(member, set()) for member in team)
+
+class TeamSearch():
+    """Searches a roster for the best teams of four characters.
+
+    Candidates are sorted by score, so that the best possible completion
+    of a partial team is always given by the next candidates in order.
+    This provides an upper bound for the score of every team that
+    extends a partial team, and branches whose bound cannot beat the
+    current top teams are pruned.
+
+    Attributes:
+        objective (TeamObjective): The objective used to score teams.
+        constraints (TeamConstraints): The constraints teams must
+            satisfy.
+        shortlistFactor (int): When the objective is not additive, the
+            number of teams shortlisted with the proxy objective is
+            this many times the number of teams requested.
+
+    """
+
+    def __init__(self, objective, constraints=None, shortlistFactor=10):
+        if constraints is None:
+            constraints = TeamConstraints()
+        self.objective = objective
+        self.constraints = constraints
+        self.shortlistFactor = shortlistFactor
+
+    @property
+    def roster(self):
+        """`legends.roster.Roster`: The roster being searched."""
+        return self.objective.roster
+
+    def candidates(self):
+        """Returns the characters in the roster that may be a member of
+        a team under the constraints.
+
+        Returns:
+            list of legends.gameobjects.Character: The candidates.
+
+        """
+        return [
+            char for char in self.roster.chars.values()
+            if self.constraints.allows(char)
+        ]
+
+    def search(self, k=1):
+        """Finds the top teams in the roster.
+
+        Args:
+            k (int): The number of teams to return.
+
+        Returns:
+            list: [(`float`, `tuple`)] A list of length at most `k` of
+                pairs containing a team's score and the team, which is a
+                tuple of `legends.gameobjects.Character` objects. The
+                list is sorted in descending order of score.
+
+        """
+        if self.objective.additive:
+            return self._branchAndBound(self.objective, k)
+        shortlist = self._branchAndBound(
+            self.objective.proxy(), k * self.shortlistFactor
+        )
+        results = [
+            (self.objective.teamScore(team), team) for _, team in shortlist
+        ]
+        results.sort(key=lambda result: result[0], reverse=True)
+        return results[:k]
+
+    def _branchAndBound(self, objective, k):
+        """Finds the top `k` teams under the given additive objective.
+
+        """
+        # pylint: disable=too-many-locals
+        chars = self.candidates()
+        scores = objective.scores(chars)
+        order = sorted(
+            range(len(chars)), key=lambda index: scores[index], reverse=True
+        )
+        chars = [chars[index] for index in order]
+        scores = [scores[index] for index in order]
+        num = len(chars)
+
+        # sums of runs of consecutive scores, for upper bounds
+        prefix = list(itertools.accumulate(scores, initial=0))
+        def bestCompletion(start, size):
+            stop = min(start + size, num)
+            return prefix[stop] - prefix[start]
+
+        heap = [] # (sum of scores, counter, team) min-heap of top teams
+        counter = itertools.count()
+        team = []
+
+        def extend(start, partial):
+            needed = TEAM_SIZE - len(team)
+            if needed == 0:
+                if self.constraints.satisfied(tuple(team)):
+                    entry = (partial, next(counter), tuple(team))
+                    if len(heap) < k:
+                        heapq.heappush(heap, entry)
+                    elif entry[0] > heap[0][0]:
+                        heapq.heapreplace(heap, entry)
+                return
+            for index in range(start, num - needed + 1):
+                bound = partial + bestCompletion(index, needed)
+                if len(heap) == k and bound <= heap[0][0]:
+                    return # later candidates have lower scores
+                team.append(chars[index])
+                if self.constraints.missing(tuple(team)) <= needed - 1:
+                    extend(index + 1, partial + scores[index])
+                team.pop()
+
+        if k > 0:
+            extend(0, 0)
+        return [
+            (objective.teamScore(members), members)
+            for _, _, members in sorted(heap, reverse=True)
+        ]
@@ -10,6 +10,7 @@ Example:
 
 """
 
+from legends.ui.tasks import *
 from legends.ui.charcard import *
 from legends.ui.dialogs import *
 from legends.ui.rostertab import *
@@ -1,19 +1,77 @@
-"""The module contains the `CharCard` class.
+"""The module contains the `CharCard` class and related objects.
 
 """
 
 import tkinter as tk
 from legends.constants import POWER_AT_ORIGIN, RARITY_COLORS, STAT_INITIALS
 from legends.functions import tokensNeeded, xpFromLevel
+from legends.roster import RosterReloadEvent
 
-__all__ = ['CharCard']
+__all__ = ['CharCard', 'CharDataCache', 'charData']
+
+def charData(char, saveslot):
+    """Creates and returns a dictionary representation of the data
+    depicted on a character card.
+
+    Args:
+        char (legends.gameobjects.Character): The character.
+        saveslot (legends.saveslot.SaveSlot): The save slot in which the
+            character is located.
+
+    Returns:
+        dict: The dictionary of data from the card.
+
+    """
+    return _fillData(char, saveslot, _statData(char, saveslot.roster))
+
+def _statData(char, roster):
+    """Computes the total stats, power, and missing gear levels and
+    ranks of a character, which change only when the roster's
+    `charChangeWatcher` reports that the character has changed.
+
+    """
+    D = {}
+    statObj = char.totalStats(roster)
+    for statName in STAT_INITIALS:
+        D[statName] = statObj.get(statName)
+    D['power'] = POWER_AT_ORIGIN + statObj.power
+    D['MGL'] = roster.missingGearLevels(char.nameID)
+    D['MGR'] = roster.missingGearRanks(char.nameID)
+    return D
+
+def _fillData(char, saveslot, statData):
+    """Combines the given result of `_statData` with the other fields
+    of `charData`, which are quick to look up.
+
+    """
+    D = {
+        'name': char.shortName,
+        'rarity': char.rarity,
+        'role': char.role,
+        'rank': char.rank,
+        'tokens': saveslot.tokens[char.nameID],
+        'tokensNeeded': tokensNeeded(char.rarity, char.rank),
+        'level': char.level,
+        'xp': char.xp
+    }
+    D.update(statData)
+    D['MSL'] = char.missingSkillLevels
+    return D
 
 class CharCard(tk.Frame):
     """A small tile containing basic information about a character.
 
+    A card is built once and can then be bound to any character with
+    `CharCard.showChar`, which updates the text and colors of the
+    existing widgets. This allows a
+    `legends.utils.scrollframe.VirtualScrollFrame` to reuse cards as the
+    user scrolls.
+
     Attributes:
-        char (legends.gameobjects.Character): The character from which
-            the card is built.
+        char (legends.gameobjects.Character): The character shown on the
+            card, or `None` if the card has not been bound.
+        rostertab (legends.ui.rostertab.RosterTab): The roster tab to
+            which the card belongs.
         nameLabel (tk.Label): The label containing the character's name.
             Clicking it toggles the character's `favorite` property.
 
@@ -25,7 +83,8 @@ class CharCard(tk.Frame):
 
         Args:
             char (legends.gameobjects.Character): The character from
-                which to build the card.
+                which to build the card. If `None`, the card is left
+                empty until `CharCard.showChar` is called.
             rostertab (legends.ui.rostertab.RosterTab): The
                 `legends.ui.rostertab.RosterTab` object to which this
                 card belongs.
@@ -33,20 +92,22 @@ class CharCard(tk.Frame):
         """
         # build card and initialize variables
         tk.Frame.__init__(self, rostertab.scrollArea.content, **options)
-        self.char = char
+        self.char = None
+        self.rostertab = rostertab
+        self._colored = [self]
 
         # build name and stat plates
-        bgColor = RARITY_COLORS[char.rarity]
-        namePlate = self.namePlate(bgColor)
-        statPlate = self.statPlate(bgColor)
+        namePlate = self.namePlate()
+        statPlate = self.statPlate()
 
-        # set card color configuration
-        self.config(bg=bgColor, highlightthickness=2)
-        self.colorByFav()
+        # set card configuration
+        self.config(highlightthickness=2)
 
         # pack card contents
         statPlate.pack(side=tk.RIGHT)
         namePlate.pack(side=tk.LEFT, expand=tk.YES, fill=tk.BOTH)
+        if char is not None:
+            self.showChar(char)
 
     @property
     def favorite(self):
@@ -59,11 +120,7 @@ class CharCard(tk.Frame):
     def session(self):
         """`legends.ui.session.Session`: The currently running session.
         """
-        content = self.master
-        canvas = content.master
-        scrollArea = canvas.master
-        rostertab = scrollArea.master
-        return rostertab.master
+        return self.rostertab.master
 
     @property
     def saveslot(self):
@@ -72,112 +129,73 @@ class CharCard(tk.Frame):
         """
         return self.session.saveslot
 
-    def namePlate(self, bgColor):
-        """Builds and returns the character name plate with the given
-        background color.
-
-        Args:
-            bgColor (str): The `tkinter` name of the given background
-                color.
+    def namePlate(self):
+        """Builds and returns the character name plate. The labels on
+        the plate are filled in by `CharCard.showChar`.
 
         Returns:
             tk.Frame: The constructed name plate.
 
         """
-        plate = tk.Frame(self, bg=bgColor)
-        data = self.dictify()
+        plate = tk.Frame(self)
+        font = (None, 11, 'italic')
 
         # build name label
-        self.nameLabel = tk.Label(
-            plate, text=data['name'], bg=bgColor,
-            font=(None, 16, 'bold')
-        )
+        self.nameLabel = tk.Label(plate, font=(None, 16, 'bold'))
         self.nameLabel.bind('<Button-1>', self.toggleFav)
 
         # pack name plate contents and return the plate
-        tk.Label(
-            plate,
-            text='{}\nRank {}\nTokens: {}/{}'.format(
-                data['role'],
-                data['rank'],
-                data['tokens'],
-                data['tokensNeeded']
-            ),
-            bg=bgColor,
-            font=(None, 11, 'italic')
-        ).pack()
+        self._rankLabel = tk.Label(plate, font=font)
+        self._rankLabel.pack()
         self.nameLabel.pack(expand=tk.YES, fill=tk.X)
-        tk.Label(
-            plate,
-            text=('Level {}\nXP: {:,}\n({:.1%})'.format(
-                data['level'],
-                data['xp'],
-                data['xp']/xpFromLevel(99)
-            )),
-            bg=bgColor,
-            font=(None, 11, 'italic')
-        ).pack()
+        self._levelLabel = tk.Label(plate, font=font)
+        self._levelLabel.pack()
+        self._colored.extend(
+            [plate, self._rankLabel, self.nameLabel, self._levelLabel]
+        )
         return plate
 
-    def statPlate(self, bgColor):
-        """Build and returns the character stat plate with the given
-        background color.
-
-        Args:
-            bgColor (str): The `tkinter` name of the given background
-                color.
+    def statPlate(self):
+        """Builds and returns the character stat plate. The stat values
+        on the plate are filled in by `CharCard.showChar`.
 
         Returns:
             tk.Frame: The constructed stat plate.
 
         """
-        plate = tk.Frame(self, bg=bgColor)
-        data = self.dictify()
+        plate = tk.Frame(self)
         font = (None, 9)
+        self._statLabels = {}
+        self._colored.append(plate)
 
         # cycle through the 10 basic stats
         for index, statName in enumerate(STAT_INITIALS):
-            # format the stat value
-            statVal = data[statName]
-            if index == 2: # the speed stat
-                statText = '{:.2f}'.format(statVal)
-            elif index > 4: # the percentage stats
-                statText = (
-                    '{:.1f}'.format(100 * statVal).rstrip('0').rstrip('.')
-                    + '%'
-                )
-            else:
-                statText = '{:.0f}'.format(statVal)
-
             # grid the 10 basic stats
             row, col = index % 5, 2 * int(index/5)
-            tk.Label(
-                plate, text=STAT_INITIALS[statName] + ':',
-                bg=bgColor, font=font
-            ).grid(row=row, column=col, sticky=tk.W)
-            tk.Label(
-                plate, text=statText, bg=bgColor, font=font,
-                width=4 + col, anchor=tk.W
-            ).grid(row=row, column=col + 1, sticky=tk.W)
+            nameLabel = tk.Label(
+                plate, text=STAT_INITIALS[statName] + ':', font=font
+            )
+            nameLabel.grid(row=row, column=col, sticky=tk.W)
+            valueLabel = tk.Label(
+                plate, font=font, width=4 + col, anchor=tk.W
+            )
+            valueLabel.grid(row=row, column=col + 1, sticky=tk.W)
+            self._statLabels[statName] = valueLabel
+            self._colored.extend([nameLabel, valueLabel])
 
         # grid the extra stats
-        moreStats = {k + ':': data[k] for k in ['MGL', 'MGR', 'MSL']}
-        for row, item in enumerate(moreStats.items()):
-            text, statVal = item
-            tk.Label(
-                plate, text=text, bg=bgColor, font=font
-            ).grid(row=row, column=4, sticky=tk.W)
-            tk.Label(
-                plate, text=str(statVal), bg=bgColor, font=font,
-                width=5, anchor=tk.W
-            ).grid(row=row, column=5, sticky=tk.W)
+        for row, statName in enumerate(['MGL', 'MGR', 'MSL']):
+            nameLabel = tk.Label(plate, text=statName + ':', font=font)
+            nameLabel.grid(row=row, column=4, sticky=tk.W)
+            valueLabel = tk.Label(plate, font=font, width=5, anchor=tk.W)
+            valueLabel.grid(row=row, column=5, sticky=tk.W)
+            self._statLabels[statName] = valueLabel
+            self._colored.extend([nameLabel, valueLabel])
 
         # grid the power stat and return the plate
-        tk.Label(
-            plate,
-            text='POWER: {:.0f}'.format(data['power']),
-            bg=bgColor, font=(None, 11, 'bold')
-        ).grid(row=5, column=0, columnspan=4)
+        self._powerLabel = tk.Label(plate, font=(None, 11, 'bold'))
+        self._powerLabel.grid(row=5, column=0, columnspan=4)
+        self._colored.append(self._powerLabel)
 
         openLabel = tk.Label(
             plate,
@@ -193,6 +211,55 @@ class CharCard(tk.Frame):
 
         return plate
 
+    def showChar(self, char):
+        """Binds the card to the given character, updating the text and
+        colors of the card.
+
+        Args:
+            char (legends.gameobjects.Character): The character to show.
+
+        """
+        self.char = char
+        data = self.dictify()
+        bgColor = RARITY_COLORS[char.rarity]
+        for widget in self._colored:
+            widget.config(bg=bgColor)
+
+        # fill in the name plate
+        self.nameLabel.config(text=data['name'])
+        self._rankLabel.config(text='{}\nRank {}\nTokens: {}/{}'.format(
+            data['role'],
+            data['rank'],
+            data['tokens'],
+            data['tokensNeeded']
+        ))
+        self._levelLabel.config(text='Level {}\nXP: {:,}\n({:.1%})'.format(
+            data['level'],
+            data['xp'],
+            data['xp']/xpFromLevel(99)
+        ))
+
+        # fill in the stat plate
+        for index, statName in enumerate(STAT_INITIALS):
+            # format the stat value
+            statVal = data[statName]
+            if index == 2: # the speed stat
+                statText = '{:.2f}'.format(statVal)
+            elif index > 4: # the percentage stats
+                statText = (
+                    '{:.1f}'.format(100 * statVal).rstrip('0').rstrip('.')
+                    + '%'
+                )
+            else:
+                statText = '{:.0f}'.format(statVal)
+            self._statLabels[statName].config(text=statText)
+        for statName in ['MGL', 'MGR', 'MSL']:
+            self._statLabels[statName].config(text=str(data[statName]))
+        self._powerLabel.config(
+            text='POWER: {:.0f}'.format(data['power'])
+        )
+        self.colorByFav()
+
     def toggleFav(self, event): # pylint: disable=unused-argument
         """Toggles the character's `favorite` property and recolors the
         card.
@@ -215,30 +282,78 @@ class CharCard(tk.Frame):
         self.nameLabel.config(fg=color)
 
     def dictify(self):
-        """Creates and returns a dictionary representation of the data
-        depicted on this card.
+        """Returns a dictionary representation of the data depicted on
+        this card, looked up in the session's `CharDataCache`.
 
         Returns:
-            dict: The dictionary of data from the card.
+            dict: The dictionary of data from the card, as returned by
+                `charData`.
+
+        """
+        return self.session.cardData.get(self.char)
+
+class CharDataCache():
+    """Stores the data depicted on character cards.
+
+    Looking up a character returns the same dictionary as `charData`.
+    The total stats, power, and missing gear levels and ranks of a
+    character are computed the first time it is looked up, and again
+    only after the roster's `charChangeWatcher` reports that the
+    character has changed, or that the roster was reloaded. The other
+    fields, such as the character's tokens, are quick to look up and
+    can change without a character change event, so they are read anew
+    each time.
+
+    Attributes:
+        saveslot (legends.saveslot.SaveSlot): The save slot in which the
+            characters are located.
+
+    """
+
+    def __init__(self, saveslot):
+        """The constructor subscribes weakly to the `charChangeWatcher`
+        event handler of the save slot's roster with the
+        `CharDataCache.onCharChange` method.
+
+        Args:
+            saveslot (legends.saveslot.SaveSlot): The value of the
+                `saveslot` attribute.
+
+        """
+        self.saveslot = saveslot
+        self.saveslot.roster.charChangeWatcher.subscribe(
+            self.onCharChange, weak=True
+        )
+        self._data = {}
+
+    def get(self, char):
+        """Returns the data depicted on the card of the given character.
+
+        Args:
+            char (legends.gameobjects.Character): A character in the
+                roster of the associated save slot.
+
+        Returns:
+            dict: The dictionary of data from the card, as returned by
+                `charData`.
+
+        """
+        cached, statData = self._data.get(char.nameID, (None, None))
+        if cached is not char:
+            statData = _statData(char, self.saveslot.roster)
+            self._data[char.nameID] = (char, statData)
+        return _fillData(char, self.saveslot, statData)
+
+    def onCharChange(self, charChangeEvent):
+        """Discards the stored data of a character when it is modified,
+        or all stored data when the roster is reloaded.
+
+        Args:
+            charChangeEvent (legends.roster.CharChangeEvent): The event
+                sent by the roster's `charChangeWatcher` event handler.
 
         """
-        D = {
-            'name': self.char.shortName,
-            'rarity': self.char.rarity,
-            'role': self.char.role,
-            'rank': self.char.rank,
-            'tokens': self.saveslot.tokens[self.char.nameID],
-            'tokensNeeded': tokensNeeded(self.char.rarity, self.char.rank),
-            'level': self.char.level,
-            'xp': self.char.xp
-        }
-        statObj = self.char.totalStats(self.saveslot.roster)
-        for statName in STAT_INITIALS:
-            D[statName] = statObj.get(statName)
-        D['power'] = POWER_AT_ORIGIN + statObj.power
-        D.update({
-            'MGL': self.saveslot.roster.missingGearLevels(self.char.nameID),
-            'MGR': self.saveslot.roster.missingGearRanks(self.char.nameID),
-            'MSL': self.char.missingSkillLevels
-        })
-        return D
+        if isinstance(charChangeEvent, RosterReloadEvent):
+            self._data.clear()
+            return
+        self._data.pop(charChangeEvent.char.nameID, None)
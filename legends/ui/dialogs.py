@@ -7,11 +7,14 @@ from tkinter.messagebox import askyesno as _askyesno
 from tkinter.messagebox import showerror as _showerror
 from tkinter.messagebox import showinfo as _showinfo
 from tkinter.messagebox import showwarning as _showwarning
+from tkinter.filedialog import askopenfilename as _askopenfilename
 from tkinter.filedialog import asksaveasfilename as _asksaveasfilename
 from tkinter.simpledialog import Dialog
+from legends.ui.tasks import TaskRunner
 
 __all__ = [
     'addroot',
+    'askopenfilename',
     'asksaveasfilename',
     'askyesno',
     'ModalMessage',
@@ -40,6 +43,17 @@ def addroot(func):
         return result
     return newFunc
 
+def askopenfilename(root, *args, **kargs):
+    """A wrapper around `tk.filedialog.askopenfilename` that disables
+    the root menu while the dialog is open.
+
+    Args:
+        root (legends.ui.stlplanner.STLPlanner): The currently running
+            `legends.ui.stlplanner.STLPlanner` instance.
+
+    """
+    return addroot(_askopenfilename)(root, *args, **kargs)
+
 def asksaveasfilename(root, *args, **kargs):
     """A wrapper around `tk.filedialog.asksaveasfilename` that disables
     the root menu while the dialog is open.
@@ -105,6 +119,9 @@ class ModalMessage(Dialog):
         initialMenuState (bool): `True` if the root menu is enabled at
             the moment the dialog opens.
         box (tk.Frame): The frame that holds the buttons.
+        tasks (legends.ui.tasks.TaskRunner): Runs slow computations for
+            the dialog in a worker thread. Its pending tasks are
+            cancelled when the dialog is destroyed.
 
     """
     def __init__(self, root, parent=None, title=None):
@@ -113,6 +130,7 @@ class ModalMessage(Dialog):
 
         """
         self.root = root
+        self.tasks = TaskRunner(self)
         self.initialMenuState = self.root.menuEnabled
         if self.initialMenuState:
             self.root.menuEnabled = False
@@ -139,10 +157,11 @@ class ModalMessage(Dialog):
         self.box.pack()
 
     def destroy(self):
-        """Restores root menu options to their original state, then
-        destroys the window.
+        """Cancels any pending tasks and restores root menu options to
+        their original state, then destroys the window.
 
         """
+        self.tasks.cancel()
         self.initial_focus = None
         if self.initialMenuState:
             self.root.menuEnabled = True
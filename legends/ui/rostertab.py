@@ -6,8 +6,9 @@ import tkinter as tk
 from tkinter import ttk
 from csv import DictWriter
 import os
+import numpy as np
 from legends.utils.functions import camelToSpace
-from legends.utils.scrollframe import ScrollFrame
+from legends.utils.scrollframe import VirtualScrollFrame
 # pylint: disable-next=no-name-in-module
 from legends.constants import (
     CHARACTER_TAGS, ENABLED, POWER_AT_ORIGIN, RARITIES, ROLES, STAT_INITIALS,
@@ -15,10 +16,12 @@ from legends.constants import (
 )
 from legends.functions import tokensNeeded
 from legends.gameobjects import allSkillEffectTags
+from legends.roster import RosterReloadEvent
 from legends.ui.charcard import CharCard
 from legends.ui.dialogs import (
     asksaveasfilename, ModalDialog, ModalMessage, showwarning
 )
+from legends.ui.tasks import PENDING
 
 __all__ = [
     'AskRosterFilter',
@@ -26,7 +29,9 @@ __all__ = [
     'OptimalSummons',
     'RosterFilter',
     'RosterInfoBar',
-    'RosterTab'
+    'RosterTab',
+    'StatMatrix',
+    'summonRates'
 ]
 
 class AskRosterFilter(ModalDialog):
@@ -348,21 +353,35 @@ class OptimalSummons(ModalMessage):
         self.refresh()
 
     def refresh(self):
+        """Recomputes the summon rates in the dialog's worker thread.
+        Until they are ready, the values in the `values` attribute are
+        set to a placeholder, and every label has normal emphasis.
+
+        """
+        self.tasks.cancel()
+        for pool in SUMMON_POOL:
+            self.values[pool].set(PENDING)
+            self.setPoolEmphasis(pool, 'normal')
+        self.tasks.submit(
+            summonRates, self.showRates, self.root.session.saveslot.roster,
+            self.root.session.settings.excludeCommons.get()
+        )
+
+    def showRates(self, tokens):
         """Updates the values in the `values` attribute and sets the
         font emphasis of the labels so that the highest summon rate is
         bold and the others are normal.
 
+        Args:
+            tokens (dict): {`str`:`float`} A dictionary mapping pool
+                names to the average number of tokens per 150 orbs, as
+                returned by `summonRates`.
+
         """
         bestPool = ''
         bestPoolTokens = -1
-        tokens = {}
         for pool in SUMMON_POOL:
-            roster = self.root.session.saveslot.roster
-            tokens[pool] = 150 * roster.tokensPerOrb(
-                pool, self.root.session.settings.excludeCommons.get()
-            )
             self.values[pool].set('{:.2f}'.format(tokens[pool]))
-            self.setPoolEmphasis(pool, 'normal')
             if tokens[pool] > bestPoolTokens:
                 bestPool, bestPoolTokens = pool, tokens[pool]
         self.setPoolEmphasis(bestPool, 'bold')
@@ -379,6 +398,25 @@ class OptimalSummons(ModalMessage):
         self.labels[pool][0].config(font=(None, 11, emphasis))
         self.labels[pool][1].config(font=(None, 11, emphasis))
 
+def summonRates(roster, excludeCommons=True):
+    """Computes the summon rates shown by the `OptimalSummons` dialog.
+
+    Args:
+        roster (legends.roster.Roster): The player's roster.
+        excludeCommons (bool): `True` if Common characters are excluded
+            from the summon pools.
+
+    Returns:
+        dict: {`str`:`float`} A dictionary mapping pool names to the
+            average number of tokens per 150 orbs received from the
+            pool.
+
+    """
+    return {
+        pool: 150 * roster.tokensPerOrb(pool, excludeCommons)
+        for pool in SUMMON_POOL
+    }
+
 class RosterFilter():
     """Stores information about filtering a
     `legends.ui.rostertab.RosterTab`.
@@ -472,6 +510,26 @@ class RosterFilter():
         for timing, var in self.skillTimings.items():
             var.set(filt.skillTimings[timing].get())
 
+    def fromDict(self, D):
+        """Sets the values of the calling instance to match those in the
+        given dictionary. Keys that the calling instance does not have,
+        such as tags that are no longer in the game data, are ignored.
+
+        Args:
+            D (dict): A dictionary of the form returned by
+                `RosterFilter.dictify`.
+
+        """
+        for attrName in ['rarities', 'roles', 'charTags', 'effectTags',
+                         'skillTimings']:
+            varDict = getattr(self, attrName)
+            for key, val in D.get(attrName, {}).items():
+                if key in varDict:
+                    varDict[key].set(val)
+        for attrName in ['ranks', 'levels']:
+            for var, val in zip(getattr(self, attrName), D.get(attrName, [])):
+                var.set(val)
+
     def setCharTags(self, val):
         """Sets all character tag variables to the given value.
 
@@ -556,35 +614,35 @@ class RosterInfoBar(tk.Frame):
         )
         self.charCount.pack(side=tk.LEFT)
 
-    def makeStats(self, chars, roster):
+    def makeStats(self, chars, statMatrix):
         """Computes and redisplays roster statistics using the given
-        collection of characters.
+        list of characters.
 
         Args:
-            chars (iterable of legends.gameobjects.Character): The
+            chars (list of legends.gameobjects.Character): The
                 characters to use when computing statistics.
-            roster (legends.roster.Roster): The roster to which the
-                characters belong.
+            statMatrix (StatMatrix): The stat matrix of the roster to
+                which the characters belong.
 
         """
         self.totalXP.config(text='Total XP: {:,}'.format(sum(
             char.xp for char in chars
         )))
-        self.totalPower.config(text='Total power: {:,.0f}'.format(sum(
-            POWER_AT_ORIGIN + char.totalStats(roster).power
-            for char in chars
-        )))
+        self.totalPower.config(text='Total power: {:,.0f}'.format(
+            statMatrix.column('Power', chars).sum()
+        ))
         self.charCount.config(text='Characters: {}/{}'.format(
-            len(list(chars)), len(ENABLED)
+            len(chars), len(ENABLED)
         ))
 
 class RosterTab(tk.Frame):
     """Displays the player's character collection.
 
     Attributes:
-        scrollArea (legends.utils.scrollframe.ScrollFrame): The
-            `legends.utils.scrollframe.ScrollFrame` used to hold the
-            character cards.
+        scrollArea (legends.utils.scrollframe.VirtualScrollFrame): The
+            `legends.utils.scrollframe.VirtualScrollFrame` used to hold
+            the character cards. Cards are only built for the rows in
+            view, and are reused as the user scrolls.
         infoBar (RosterInfoBar): The info bar containing aggregate info
             about the currently displayed characters.
         sortFuncs (dict): {`str`:`func`} A dictionary mapping field
@@ -610,7 +668,9 @@ class RosterTab(tk.Frame):
         tk.Frame.__init__(self, session, **options)
 
         # build widgets
-        self.scrollArea = ScrollFrame(self)
+        self.scrollArea = VirtualScrollFrame(
+            self, lambda: CharCard(None, self), CharCard.showChar, 4
+        )
         self.scrollArea.canvas.config(height=0.7 * self.winfo_screenheight())
         self.infoBar = RosterInfoBar(self)
 
@@ -639,32 +699,26 @@ class RosterTab(tk.Frame):
     @property
     def cards(self):
         """`dict`: {`str`:`legends.ui.charcard.CharCard`} A dictionary
-        mapping a character's name ID attribute to its character card.
+        mapping the name ID of each character in view to its character
+        card.
         """
         return {
             card.char.nameID : card
-            for card in self.scrollArea.content.winfo_children()
-            if isinstance(card, CharCard)
+            for card in self.scrollArea.widgets.values()
         }
 
-    def fillCards(self):
-        """Builds a card for each character in the player's collection
-        and places it in the scroll area's content frame.
+    def fillCards(self, rebind=False):
+        """Places the characters in the player's collection in the
+        scroll area, which shows cards for those in view.
+
+        Args:
+            rebind (bool): If `True`, the cards in view are updated, to
+                show changes to the characters.
 
         """
-        columns = 4
-        for j in range(columns):
-            self.scrollArea.content.columnconfigure(
-                j, weight=1, uniform='roster'
-            )
-        count = 0
         chars = self.master.charList
-        for char in chars:
-            CharCard(char, self).grid(
-                row=count // columns, column=count % columns, sticky=tk.NSEW
-            )
-            count += 1
-        self.infoBar.makeStats(chars, self.roster)
+        self.scrollArea.setItems(chars, rebind)
+        self.infoBar.makeStats(chars, self.master.statMatrix)
 
     def actionBar(self):
         """Builds and returns an action bar that allows the user to
@@ -674,6 +728,7 @@ class RosterTab(tk.Frame):
         # define and initialize variables
         sslot = self.master.saveslot
         ros = self.roster
+        mat = self.master.statMatrix
         self.sortFuncs = {
             'Name': lambda c: c.shortName,
             'Favorite': lambda c,s=sslot: c in s.favorites,
@@ -686,13 +741,10 @@ class RosterTab(tk.Frame):
                 tokensNeeded(c.rarity, c.rank) - s.tokens[c.nameID]
             )
         }
-        for statName in STAT_INITIALS:
-            self.sortFuncs[statName] = lambda c,r=ros,n=statName: (
-                c.totalStats(r).get(n)
+        for statName in list(STAT_INITIALS) + ['Power']:
+            self.sortFuncs[statName] = lambda c,m=mat,n=statName: (
+                m.column(n, [c])[0]
             )
-        self.sortFuncs['Power'] = lambda c,r=ros: (
-            POWER_AT_ORIGIN + c.totalStats(r).power
-        )
         self.sortFuncs.update({
             'Missing gear levels': lambda c,r=ros: (
                 r.missingGearLevels(c.nameID)
@@ -704,8 +756,9 @@ class RosterTab(tk.Frame):
         })
         fields = list(self.sortFuncs.keys())
         self.sortField = tk.StringVar()
+        self.sortField.set(self.master.sortField)
         self.descending = tk.BooleanVar()
-        self.descending.set(True)
+        self.descending.set(self.master.descending)
 
         # build bar and sorting Combobox
         bar = tk.Frame(self)
@@ -757,26 +810,27 @@ class RosterTab(tk.Frame):
         OptimalSummons(self.root)
 
     def sort(self):
-        """Sorts the dictionary of characters stored in the associated
-        `legends.saveslot.SaveSlot` object according the currently
-        selected sorting field. Then refreshes the character cards.
+        """Orders the session's list of characters according to the
+        currently selected sorting field, then moves the character cards
+        into the new order. The roster is not changed, and the cards are
+        not rebuilt.
 
         """
         field = self.sortField.get()
         if field == '':
             return
-        self.master.saveslot.sort(
-            self.sortFuncs[field], self.descending.get()
+        self.master.sortChars(
+            field, self.sortFuncs[field], self.descending.get()
         )
-        self.refresh()
+        self.scrollArea.setItems(self.master.charList)
 
     def refresh(self):
-        """Destroys and rebuilds all character cards.
+        """Updates the character cards and the info bar, to show changes
+        to the characters or to the order and filtering of the list of
+        characters.
 
         """
-        for card in self.cards.values():
-            card.destroy()
-        self.fillCards()
+        self.fillCards(True)
 
     def adjustFilter(self):
         """Creates an `AskRosterFilter` window, giving the user an
@@ -793,9 +847,12 @@ class RosterTab(tk.Frame):
 
     def export(self):
         """Exports the data in the character cards to a csv file. Each
-        row in the file corresponds to a card, and the data in that row
-        is the data generated by the card's
-        `legends.ui.charcard.CharCard.dictify` method.
+        row in the file corresponds to a character in the session's
+        list of characters, whether or not its card is in view, and the
+        data in that row is the data generated by the
+        `legends.ui.charcard.charData` function. The data of characters
+        that have not changed since their cards were shown is not
+        computed again.
 
         """
         initDir, initFile = os.path.split(
@@ -812,9 +869,125 @@ class RosterTab(tk.Frame):
         if not filename:
             return
         self.master.settings.rosterExportFile = filename
-        cardDicts = [card.dictify() for card in self.cards.values()]
+        cardDicts = [
+            self.master.cardData.get(char) for char in self.master.charList
+        ]
         fields = cardDicts[0].keys()
         with open(filename, 'w', newline='', encoding='utf-8') as f:
             writer = DictWriter(f, fields)
             writer.writeheader()
             writer.writerows(cardDicts)
+
+class StatMatrix():
+    """The total stats and power of the characters in a roster, stored
+    in a matrix.
+
+    Each character has a row in the matrix, holding the values of the
+    character's total stats, in the order of `STAT_INITIALS`, followed
+    by its power. A row is computed the first time it is needed, and is
+    recomputed only after the roster's `charChangeWatcher` reports that
+    the character has changed. Sorting the roster by a stat therefore
+    computes the total stats of only the characters that changed since
+    the last sort.
+
+    Attributes:
+        fields (list of str): The names of the columns of the matrix.
+
+    """
+
+    def __init__(self, roster):
+        """The constructor subscribes weakly to the roster's
+        `charChangeWatcher` event handler with the
+        `StatMatrix.onCharChange` method.
+
+        Args:
+            roster (legends.roster.Roster): The roster whose characters
+                are described by the matrix.
+
+        """
+        self._roster = roster
+        self._roster.charChangeWatcher.subscribe(
+            self.onCharChange, weak=True
+        )
+        self.fields = list(STAT_INITIALS) + ['Power']
+        self._chars = {}
+        self._rows = {}
+        self._stale = set()
+        self._matrix = np.zeros((0, len(self.fields)))
+
+    @property
+    def roster(self):
+        """`legends.roster.Roster`: The roster whose characters are
+        described by the matrix.
+        """
+        return self._roster
+
+    def column(self, field, chars):
+        """Returns the values of a field for the given characters.
+
+        Args:
+            field (str): One of the names in the `fields` attribute.
+            chars (list of legends.gameobjects.Character): Characters
+                in the associated roster.
+
+        Returns:
+            numpy.ndarray: The values, in the same order as `chars`.
+
+        """
+        return self.rows(chars)[:, self.fields.index(field)]
+
+    def rows(self, chars):
+        """Returns the rows of the given characters, computing those
+        that are missing or out of date.
+
+        Args:
+            chars (list of legends.gameobjects.Character): Characters
+                in the associated roster.
+
+        Returns:
+            numpy.ndarray: A matrix with one row for each character, in
+                the same order as `chars`.
+
+        """
+        new = []
+        stale = set()
+        for char in chars:
+            if char.nameID not in self._rows:
+                new.append(char.nameID)
+            if (
+                self._chars.get(char.nameID) is not char
+                or char.nameID in self._stale
+            ):
+                self._chars[char.nameID] = char
+                stale.add(char.nameID)
+        if new:
+            start = len(self._matrix)
+            self._matrix = np.vstack([
+                self._matrix, np.zeros((len(new), len(self.fields)))
+            ])
+            for index, nameID in enumerate(new, start):
+                self._rows[nameID] = index
+        for nameID in stale:
+            stats = self._chars[nameID].totalStats(self.roster)
+            self._matrix[self._rows[nameID]] = [
+                stats.get(statName) for statName in STAT_INITIALS
+            ] + [POWER_AT_ORIGIN + stats.power]
+        self._stale -= stale
+        return self._matrix[[self._rows[char.nameID] for char in chars]]
+
+    def onCharChange(self, charChangeEvent):
+        """Marks the row of a character as out of date when it is
+        modified, or discards every row when the roster is reloaded.
+
+        Args:
+            charChangeEvent (legends.roster.CharChangeEvent): The event
+                sent by the roster's `charChangeWatcher` event handler.
+
+        """
+        if isinstance(charChangeEvent, RosterReloadEvent):
+            self._chars.clear()
+            self._rows.clear()
+            self._stale.clear()
+            self._matrix = np.zeros((0, len(self.fields)))
+            return
+        self._stale.add(charChangeEvent.char.nameID)
@@ -10,19 +10,72 @@ from legends.utils.relations import bidict
 from legends.utils.scrollframe import ScrollFrame
 from legends.constants import ITEMS
 from legends.functions import cleanTime, levelFromXP, xpFromLevel
+from legends.journal import RosterJournal
 from legends.saveslot import Inventory
 from legends.ui.dialogs import ModalMessage
-from legends.ui.rostertab import RosterTab, RosterFilter
+from legends.ui.charcard import CharDataCache
+from legends.ui.rostertab import RosterTab, RosterFilter, StatMatrix
 from legends.ui.chartab import CharTab
+from legends.ui.tasks import PENDING
 
 __all__ = [
+    'incompleteMissions',
     'InventoryScreen',
+    'itemsToMaxRoster',
     'MissingMissions',
     'Session',
     'SessionSettings',
     'SurvivalEffects'
 ]
 
+def itemsToMaxRoster(roster):
+    """Computes the items needed to max the skills and gear of every
+    character in a roster.
+
+    Args:
+        roster (legends.roster.Roster): The roster.
+
+    Returns:
+        tuple: (`dict`, `legends.saveslot.Inventory`) A dictionary
+            mapping each role to the items needed to max the skills of
+            the characters with that role, and the items needed to max
+            the gear of every character.
+
+    """
+    skillItems = {}
+    for char in roster.chars.values():
+        skillItems[char.role] = sum(
+            (skill.itemsToMax for skill in char.skills.values()),
+            skillItems.get(char.role, Inventory())
+        )
+    gearItems = sum(
+        (char.itemsToMaxGear(roster) for char in roster.chars.values()),
+        Inventory()
+    )
+    return skillItems, gearItems
+
+def incompleteMissions(saveslot):
+    """Finds the incomplete missions and uncollected gear ranking
+    materials of a save slot.
+
+    Args:
+        saveslot (legends.saveslot.SaveSlot): The save slot.
+
+    Returns:
+        tuple: (`list`, `list`) The incomplete missions, as
+            `legends.saveslot.Mission` objects, and the uncollected
+            gear ranking materials, as (`legends.constants.Item`,
+            `int`) pairs.
+
+    """
+    missions = [
+        mission for mission in saveslot.missions if mission.complete < 1
+    ]
+    missingRewards = saveslot.missionRewards.missing(
+        'Gear Ranking Materials'
+    )
+    return missions, list(missingRewards.itemsByCat('Gear Ranking Materials'))
+
 class InventoryScreen(ModalMessage):
     """A message dialog showing the player's inventory.
 
@@ -37,6 +90,13 @@ class InventoryScreen(ModalMessage):
             level combo-box.
         endLevel (tk.StringVar): The level displayed in the ending level
             combo-box.
+        neededLabels (dict): {`legends.constants.Item`:`tk.Label`} A
+            dictionary mapping items to the labels showing the amounts
+            needed to max the roster. The amounts are computed in the
+            dialog's worker thread, and the labels show a placeholder
+            until they are ready.
+        latinumLabel (tk.Label): The label showing the Latinum needed
+            to max the gear of the roster.
 
     """
     def __init__(self, root, parent=None):
@@ -54,6 +114,8 @@ class InventoryScreen(ModalMessage):
         self.startLevel = tk.StringVar(None, '1')
         self.endLevel = tk.StringVar()
         self.setEndLevel()
+        self.neededLabels = {}
+        self.latinumLabel = None
         ModalMessage.__init__(self, root, parent, 'Inventory')
 
     @property
@@ -140,19 +202,10 @@ class InventoryScreen(ModalMessage):
             master, text='Needed to Max Roster', font=(None, 13, 'italic')
         ).grid(row=10, column=2, columnspan=2, sticky=tk.W, pady=(20,0))
         for index, item in enumerate(self.inventory.keysByCat('Protomatter')):
-            totalNeeded = Inventory()
-            for char in self.roster.chars.values():
-                if char.role == item.role:
-                    totalNeeded = sum(
-                        (skill.itemsToMax for skill in char.skills.values()),
-                        totalNeeded
-                    )
-            tk.Label(
-                master, text='{:,} + {:,} Latinum'.format(
-                    totalNeeded[item],
-                    totalNeeded[ITEMS['Latinum']]
-                )
-            ).grid(row=11 + index, column=2, sticky=tk.W)
+            self.neededLabels[item] = tk.Label(master, text=PENDING)
+            self.neededLabels[item].grid(
+                row=11 + index, column=2, sticky=tk.W
+            )
 
         cols, rows = master.grid_size()
         ttk.Separator(master, orient='vertical').grid(
@@ -163,28 +216,48 @@ class InventoryScreen(ModalMessage):
         tk.Label(
             master, text='Needed to Max Roster', font=(None, 13, 'italic')
         ).grid(row=0, column=cols + 3, columnspan=2, sticky=tk.W)
-        totalNeeded = sum(
-            (
-                char.itemsToMaxGear(self.roster)
-                for char in self.roster.chars.values()
-            ),
-            Inventory()
-        )
         for index, item in enumerate(
             self.inventory.keysByCat('Gear Leveling Materials')
         ):
-            tk.Label(
-                master, text='{:,}'.format(totalNeeded[item])
-            ).grid(row=1 + index, column=cols + 3, sticky=tk.W)
+            self.neededLabels[item] = tk.Label(master, text=PENDING)
+            self.neededLabels[item].grid(
+                row=1 + index, column=cols + 3, sticky=tk.W
+            )
         for index, item in enumerate(
             self.inventory.keysByCat('Gear Ranking Materials')
         ):
-            tk.Label(
-                master, text='{:,}'.format(totalNeeded[item])
-            ).grid(row=5 + index, column=cols + 3, sticky=tk.W)
-        tk.Label(
-            master, text='+ {:,} Latinum'.format(totalNeeded[ITEMS['Latinum']])
-        ).grid(row=8, column=cols + 3, sticky=tk.W)
+            self.neededLabels[item] = tk.Label(master, text=PENDING)
+            self.neededLabels[item].grid(
+                row=5 + index, column=cols + 3, sticky=tk.W
+            )
+        self.latinumLabel = tk.Label(master, text=PENDING)
+        self.latinumLabel.grid(row=8, column=cols + 3, sticky=tk.W)
+        self.tasks.submit(itemsToMaxRoster, self.showNeeded, self.roster)
+
+    def showNeeded(self, needed):
+        """Displays the items needed to max the roster in the labels of
+        the `neededLabels` and `latinumLabel` attributes.
+
+        Args:
+            needed (tuple): The items needed, as returned by
+                `itemsToMaxRoster`.
+
+        """
+        skillItems, gearItems = needed
+        latinum = ITEMS['Latinum']
+        for item in self.inventory.keysByCat('Protomatter'):
+            totalNeeded = skillItems.get(item.role, Inventory())
+            self.neededLabels[item].config(text='{:,} + {:,} Latinum'.format(
+                totalNeeded[item], totalNeeded[latinum]
+            ))
+        for cat in ['Gear Leveling Materials', 'Gear Ranking Materials']:
+            for item in self.inventory.keysByCat(cat):
+                self.neededLabels[item].config(
+                    text='{:,}'.format(gearItems[item])
+                )
+        self.latinumLabel.config(
+            text='+ {:,} Latinum'.format(gearItems[latinum])
+        )
 
     def setStartLevel(self):
         """Sets the `tkinter` variable in the `startLevel` attribute
@@ -235,11 +308,18 @@ class InventoryScreen(ModalMessage):
 class MissingMissions(ModalMessage):
     """A message showing the player's incomplete missions.
 
-    Also shows the total uncollected gear ranking materials.
+    Also shows the total uncollected gear ranking materials. These are
+    found in the dialog's worker thread, and a placeholder is shown
+    until they are ready.
+
+    Attributes:
+        display (tk.Frame): The frame that holds the list of missions and
+            materials.
 
     """
 
     def __init__(self, root, parent=None):
+        self.display = None
         ModalMessage.__init__(self, root, parent, 'Incomplete Missions')
 
     def body(self, master):
@@ -247,23 +327,35 @@ class MissingMissions(ModalMessage):
 
         """
         scrollFrame = ScrollFrame(master)
-        display = tk.Frame(scrollFrame.content)
+        self.display = tk.Frame(scrollFrame.content)
         scrollFrame.canvas.config(height=0.5 * self.winfo_screenheight())
-        incompleteMissions = [
-            mission for mission in self.root.session.saveslot.missions
-            if mission.complete < 1
-        ]
-        missingRewards = Inventory()
-        for mission in incompleteMissions:
-            missingRewards = missingRewards + mission.missingNodeRewards
-            missingRewards = missingRewards + mission.rewards
+        tk.Label(self.display, text=PENDING).grid(row=0, column=0)
+        self.display.pack(padx=20)
+        scrollFrame.pack(expand=tk.YES, fill=tk.BOTH)
+        self.tasks.submit(
+            incompleteMissions, self.showMissions, self.root.session.saveslot
+        )
+
+    def showMissions(self, result):
+        """Replaces the placeholder with the list of missions and
+        materials.
+
+        Args:
+            result (tuple): The incomplete missions and uncollected
+                materials, as returned by `incompleteMissions`.
+
+        """
+        missions, missingRewards = result
+        display = self.display
+        for widget in display.winfo_children():
+            widget.destroy()
         tk.Label(
             display,
             text='Uncollected Gear Ranking Materials',
             font=(None, 13, 'bold')
         ).grid(row=0, column=0, columnspan=3, sticky=tk.W)
         row = 1
-        for item, qty in missingRewards.itemsByCat('Gear Ranking Materials'):
+        for item, qty in missingRewards:
             tk.Label(
                 display, text=item.name
             ).grid(row=row, column=0, columnspan=2, sticky=tk.W)
@@ -275,7 +367,7 @@ class MissingMissions(ModalMessage):
             display, text='Incomplete Missions', font=(None, 13, 'bold')
         ).grid(row=row, column=0, columnspan=3, sticky=tk.W, pady=(20,0))
         row += 1
-        for mission in incompleteMissions:
+        for mission in missions:
             tk.Label(
                 display, text=mission.difficulty
             ).grid(row=row, column=0, sticky=tk.W)
@@ -290,8 +382,6 @@ class MissingMissions(ModalMessage):
                 display, text='{:.0%}'.format(mission.complete)
             ).grid(row=row, column=2, sticky=tk.E)
             row += 1
-        display.pack(padx=20)
-        scrollFrame.pack(expand=tk.YES, fill=tk.BOTH)
 
 class Session(tk.Frame):
     """A user session in the *STL Planner* app.
@@ -306,6 +396,23 @@ class Session(tk.Frame):
             frame that displays time stamp info connected with the
             associated save slot.
         tab (tk.Frame): The visible tab in the session frame.
+        journal (legends.journal.RosterJournal): The journal of edits to
+            the roster of the associated save slot, or `None` if there
+            is no associated save slot.
+        statMatrix (legends.ui.rostertab.StatMatrix): The total stats
+            of the characters in the roster of the associated save slot,
+            or `None` if there is no associated save slot.
+        cardData (legends.ui.charcard.CharDataCache): The data shown on
+            the character cards of the roster tab, or `None` if there is
+            no associated save slot.
+        sortField (str): The name of the field by which the characters
+            were last sorted, or the empty string if they have not been
+            sorted.
+        descending (bool): `True` if the characters were last sorted in
+            descending order.
+        charOrder (dict): {`str`:`int`} A dictionary mapping the name ID
+            of each character to its position in the sort order, or
+            `None` if the characters are in the order of the roster.
 
     """
     def __init__(self, stlplanner, saveslot=None, **options):
@@ -325,9 +432,24 @@ class Session(tk.Frame):
         self.settings = SessionSettings()
         self.tab = tk.Frame(self)
         self.tab.pack()
+        self.journal = None
+        self.statMatrix = None
+        self.cardData = None
+        self.sortField = ''
+        self.descending = True
+        self.charOrder = None
+        self._charList = None
+        self._charIndex = None
+        self._listKey = None
         if saveslot is None:
             self.startFrame()
         else:
+            self.journal = RosterJournal(saveslot.roster)
+            self.statMatrix = StatMatrix(saveslot.roster)
+            self.cardData = CharDataCache(saveslot)
+            saveslot.roster.charChangeWatcher.subscribe(
+                self.onCharChange, weak=True
+            )
             self.makeTimeBar()
             self.rosterTab()
 
@@ -336,14 +458,49 @@ class Session(tk.Frame):
         """`list` of `legends.gameobjects.Character`: The list of
         characters from the associated save slot, ordered and filtered
         according to the user's current settings. Is an empty list if
-        there is no associated save slot.
+        there is no associated save slot. The list is stored, and is
+        built again only after the roster filter, the sort order, or the
+        characters change.
         """
         if self.saveslot is None:
             return []
-        return [
-            char for char in self.saveslot.roster.chars.values()
-            if self.checkFilter(char)
-        ]
+        return list(self._indexedChars()[0])
+
+    # pylint: disable-next=unused-argument
+    def onCharChange(self, charChangeEvent):
+        """Discards the stored list of characters when a character
+        changes, since it may no longer pass the roster filter.
+
+        Args:
+            charChangeEvent (legends.roster.CharChangeEvent): The event
+                sent by the roster's `charChangeWatcher` event handler.
+
+        """
+        self._charList = None
+
+    def _indexedChars(self):
+        """Returns the stored list of characters, with a dictionary
+        mapping the name ID of each character to its index in the list.
+        The list is built again if the roster filter or the sort order
+        has changed since it was stored.
+
+        """
+        filt = self.settings.rosterFilter.dictify()
+        if (
+            self._charList is None
+            or self._listKey[0] != filt
+            or self._listKey[1] is not self.charOrder
+        ):
+            self._charList = self._ordered([
+                char for char in self.saveslot.roster.chars.values()
+                if self.checkFilter(char, filt)
+            ])
+            self._charIndex = {
+                char.nameID: index
+                for index, char in enumerate(self._charList)
+            }
+            self._listKey = (filt, self.charOrder)
+        return self._charList, self._charIndex
 
     def startFrame(self):
         """Build the starting frame, with choices from the `File` menu.
@@ -417,7 +574,7 @@ class Session(tk.Frame):
         # pack labels and bar
         for label in labels:
             label.pack(side=tk.LEFT)
-        self.timeBar.pack(side=tk.TOP)
+        self.timeBar.pack(side=tk.TOP, before=self.tab)
 
     def removeTimeBar(self):
         """If the time bar exists, it is destroyed and the `timeBar`
@@ -428,19 +585,23 @@ class Session(tk.Frame):
             self.timeBar.destroy()
             self.timeBar = None
 
-    def checkFilter(self, char):
+    def checkFilter(self, char, filt=None):
         """Checks if the given character passes the current filter
         options.
 
         Args:
             char (legends.gameobjects.Character): The character to
                 check.
+            filt (dict): The current filter options, as returned by
+                `legends.ui.rostertab.RosterFilter.dictify`. Computed
+                from the session settings if not given.
 
         Returns:
             bool: `True` if the character passes.
 
         """
-        filt = self.settings.rosterFilter.dictify()
+        if filt is None:
+            filt = self.settings.rosterFilter.dictify()
         timings = [
             timing for timing, var in filt['skillTimings'].items() if var
         ]
@@ -456,9 +617,56 @@ class Session(tk.Frame):
             )
         )
 
+    def sortChars(self, field, func, descending=True):
+        """Orders the characters in the `charList` property by the given
+        field, without changing the roster. The key of each character is
+        computed once. The keys of fields in the `statMatrix` attribute
+        are taken from the matrix, so the total stats are recomputed
+        only for characters that changed since they were last needed.
+        Characters with equal keys keep their previous order.
+
+        Args:
+            field (str): The name of the field, stored in the
+                `sortField` attribute.
+            func (function): A function that maps a
+                `legends.gameobjects.Character` to a sortable value.
+                Used if the field is not in the `statMatrix` attribute.
+            descending (bool): True if the characters are to be sorted
+                in descending order.
+
+        """
+        chars = self._ordered(list(self.saveslot.roster.chars.values()))
+        if field in self.statMatrix.fields:
+            keys = self.statMatrix.column(field, chars).tolist()
+        else:
+            keys = [func(char) for char in chars]
+        order = sorted(
+            range(len(chars)), key=keys.__getitem__, reverse=descending
+        )
+        self.sortField = field
+        self.descending = descending
+        self.charOrder = {
+            chars[index].nameID: position
+            for position, index in enumerate(order)
+        }
+
+    def _ordered(self, chars):
+        """Returns the given characters in the sort order. Characters
+        not in the sort order follow the others, in their given order.
+
+        """
+        if self.charOrder is None:
+            return chars
+        last = len(self.charOrder)
+        return sorted(
+            chars, key=lambda char: self.charOrder.get(char.nameID, last)
+        )
+
     def nextChar(self, char):
         """Finds and returns the character that follows the given
-        character in the `charList` property.
+        character in the `charList` property. The position of the
+        character is looked up, so this takes constant time, unless the
+        list of characters must be built again.
 
         Args:
             char (legends.gameobjects.Character): A character in the
@@ -470,15 +678,22 @@ class Session(tk.Frame):
                 property. Returns `None` if the given character is the
                 last item in the `charList` property.
 
+        Raises:
+            ValueError: If the character is not in the `charList`
+                property.
+
         """
-        chars = self.charList
-        if char is chars[-1]:
+        chars, index = self._indexedChars()
+        position = self._position(char, chars, index)
+        if position == len(chars) - 1:
             return None
-        return chars[chars.index(char) + 1]
+        return chars[position + 1]
 
     def prevChar(self, char):
         """Finds and returns the character that precedes the given
-        character in the `charList` property.
+        character in the `charList` property. The position of the
+        character is looked up, so this takes constant time, unless the
+        list of characters must be built again.
 
         Args:
             char (legends.gameobjects.Character): A character in the
@@ -490,11 +705,79 @@ class Session(tk.Frame):
                 property. Returns `None` if the given character is the
                 first item in the `charList` property.
 
+        Raises:
+            ValueError: If the character is not in the `charList`
+                property.
+
         """
-        chars = self.charList
-        if char is chars[0]:
+        chars, index = self._indexedChars()
+        position = self._position(char, chars, index)
+        if position == 0:
             return None
-        return chars[chars.index(char) - 1]
+        return chars[position - 1]
+
+    @staticmethod
+    def _position(char, chars, index):
+        """Returns the index of the given character in the given list,
+        using the given dictionary of indices.
+
+        """
+        position = index.get(char.nameID)
+        if position is None or chars[position] is not char:
+            raise ValueError('{!r} is not in list'.format(char))
+        return position
+
+    def syncFromFile(self, save, slot):
+        """Updates the associated save slot from newer save data, then
+        refreshes the visible tab. Only the parts of the roster that
+        have changed are rebuilt. If the visible tab shows a character
+        that is no longer in the roster, the roster tab is shown
+        instead. Edits made before the update can no longer be undone.
+
+        Args:
+            save (legends.savefile.SaveFile): The save file.
+            slot (int): The 0-based index of the save slot from which to
+                draw the data.
+
+        """
+        try:
+            self.saveslot.fromFile(save, slot, sync=True)
+        except ValueError:
+            return
+        self.journal.clear()
+        self._charList = None
+        self.removeTimeBar()
+        self.makeTimeBar()
+        self.refreshTab()
+
+    def undo(self):
+        """Undoes the last step recorded in the journal, then refreshes
+        the visible tab.
+
+        """
+        if self.journal.undo():
+            self.refreshTab()
+
+    def redo(self):
+        """Redoes the last step undone from the journal, then refreshes
+        the visible tab.
+
+        """
+        if self.journal.redo():
+            self.refreshTab()
+
+    def refreshTab(self):
+        """Rebuilds the visible tab to match the associated save slot.
+        If the visible tab shows a character that is no longer in the
+        roster, the roster tab is shown instead.
+
+        """
+        if isinstance(self.tab, RosterTab):
+            self.tab.refresh()
+        elif self.tab.char in self.saveslot.roster.chars.values():
+            self.charTab(self.tab.char)
+        else:
+            self.rosterTab()
 
     def rosterTab(self):
         """Loads a new `legends.ui.rostertab.RosterTab` instance into
@@ -536,6 +819,38 @@ class SessionSettings(): # pylint: disable=too-few-public-methods
         self.rosterExportFile = '/Users/' + getuser() + '/Documents/roster.csv'
         self.excludeCommons = tk.BooleanVar(None, True)
 
+    def dictify(self):
+        """Creates and returns a dictionary of the calling instance's
+        settings, with each `tkinter` variable replaced by its value.
+        The dictionary can be serialized as json.
+
+        Returns:
+            dict: The constructed dictionary.
+
+        """
+        return {
+            'rosterFilter': self.rosterFilter.dictify(),
+            'rosterExportFile': self.rosterExportFile,
+            'excludeCommons': self.excludeCommons.get()
+        }
+
+    def fromDict(self, D):
+        """Sets the calling instance's settings to match those in the
+        given dictionary.
+
+        Args:
+            D (dict): A dictionary of the form returned by
+                `SessionSettings.dictify`.
+
+        """
+        self.rosterFilter.fromDict(D.get('rosterFilter', {}))
+        self.rosterExportFile = D.get(
+            'rosterExportFile', self.rosterExportFile
+        )
+        self.excludeCommons.set(
+            D.get('excludeCommons', self.excludeCommons.get())
+        )
+
 class SurvivalEffects(ModalMessage):
     """A message showing the active battle modifiers in survival mode.
 
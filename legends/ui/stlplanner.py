@@ -7,16 +7,18 @@ The *STL PLanner* app can be launched with `STLPlanner().mainloop()`.
 import tkinter as tk
 from tkinter import ttk
 from tkinter.scrolledtext import ScrolledText
-from json import loads
 # pylint: disable-next=no-name-in-module
 from legends.constants import GSCharacter
 from legends.constants import (
     ENABLED, HELP, SUMMON_POOL, STAT_INITIALS, UPCOMING
 )
-from legends.functions import decompressData, decryptSaveFile
+from legends.functions import loadCompressed
+from legends.savefile import SaveFile, SaveFileWatcher
 from legends.saveslot import SaveSlot
+from legends.snapshot import readSnapshot, SnapshotError, writeSnapshot
 from legends.ui.dialogs import (
-    askyesno, ModalDialog, ModalMessage, showerror
+    askopenfilename, asksaveasfilename, askyesno, ModalDialog, ModalMessage,
+    showerror
 )
 from legends.ui.session import (
     InventoryScreen, MissingMissions, Session, SurvivalEffects
@@ -72,11 +74,7 @@ class AskClipboard(ModalDialog):
 
         """
         try:
-            text = self.clipboard_get()
-            stringData = decompressData(text)
-            if stringData[:6] == 'compr-':
-                stringData = decompressData(stringData[6:])
-            slotData = loads(stringData)
+            slotData = loadCompressed(self.clipboard_get())
             save = {'0 data': slotData}
             self.result = SaveSlot()
             self.result.fromFile(save, 0)
@@ -179,11 +177,12 @@ class AskSlot(ModalDialog):
     `AskSlot` window, they are shown to the user as '1', '2', or '3'.
 
     Attributes:
-        save (dict): A decrypted dictionary representation of the
-            player's save file, as returned by the
-            `legends.functions.decryptSaveFile` function.
+        save (legends.savefile.SaveFile): The player's save file, whose
+            slots are decrypted when they are first accessed.
         displaySlot (tk.StringVar): The currently selected slot, as it
             is displayed in the window.
+        slot (int): The 0-based index of the chosen slot, or `None` if
+            no slot was chosen.
         result (legends.saveslot.SaveSlot or None): Inherited from
             `legends.ui.dialogs.ModalDialog`, which inherited it from
             `tk.simpledialog.Dialog`. Defaults to `None`. Is set by the
@@ -194,6 +193,7 @@ class AskSlot(ModalDialog):
     def __init__(self, root, save, parent=None):
         self.save = save
         self.displaySlot = tk.StringVar(None, '1')
+        self.slot = None
         ModalDialog.__init__(self, root, parent, 'Choose a save slot')
 
     def body(self, master):
@@ -240,6 +240,7 @@ class AskSlot(ModalDialog):
             return False
         self.result = SaveSlot()
         self.result.fromFile(self.save, slot)
+        self.slot = slot
         return True
 
 class HelpScreen(ModalMessage):
@@ -274,6 +275,12 @@ class STLPlanner(tk.Tk):
     Args:
         showTimestamps (tk.BooleanVar): `True` if the info bar with
             timestamp data should be shown. Defaults to `True`.
+        liveUpdates (tk.BooleanVar): `True` if a session started from
+            the save file should be updated whenever the save file
+            changes. Defaults to `True`.
+        watcher (legends.savefile.SaveFileWatcher): The watcher of the
+            save file slot used by the current session, or `None` if
+            the session was not started from the save file.
         disableOnModal (list): [(`tk.Menu`, `int`)]: Each item in this
             list is a 2-tuple that represents a menu option which should
             be disabled when a modal dialog is open. The first value is
@@ -298,9 +305,13 @@ class STLPlanner(tk.Tk):
         tk.Tk.__init__(self, *args, **kargs)
         self.title('STL Planner')
         self.showTimestamps = tk.BooleanVar(self, True)
+        self.liveUpdates = tk.BooleanVar(self, True)
+        self.watcher = None
         self.disableOnModal = []
         self.sessionOnly = []
         self._menuEnabled = True
+        self._watchJob = None
+        self._pendingLoad = None
         self.buildMenu()
         self._session = Session(self)
         self.session.pack()
@@ -363,6 +374,34 @@ class STLPlanner(tk.Tk):
             label='Maxed Characters...', command=self.newMaxChars
         )
         self.disableOnModal.append((newSessionSubmenu, 2))
+        newSessionSubmenu.add_command(
+            label='From Snapshot...', command=self.newFromSnapshot
+        )
+        self.disableOnModal.append((newSessionSubmenu, 3))
+
+        # populate the rest of the File menu
+        fileMenu.add_command(
+            label='Save Snapshot...', command=self.saveSnapshot,
+            state=tk.DISABLED
+        )
+        self.disableOnModal.append((fileMenu, 1))
+        self.sessionOnly.append((fileMenu, 1))
+
+        # build and populate the Edit menu
+        editMenu = tk.Menu(menuBar)
+        menuBar.add_cascade(label='Edit', menu=editMenu)
+        editMenu.add_command(
+            label='Undo', command=lambda: self.session.undo(),
+            state=tk.DISABLED
+        )
+        self.disableOnModal.append((editMenu, 0))
+        self.sessionOnly.append((editMenu, 0))
+        editMenu.add_command(
+            label='Redo', command=lambda: self.session.redo(),
+            state=tk.DISABLED
+        )
+        self.disableOnModal.append((editMenu, 1))
+        self.sessionOnly.append((editMenu, 1))
 
         # build and populate the Session menu
         sessionMenu = tk.Menu(menuBar)
@@ -393,6 +432,10 @@ class STLPlanner(tk.Tk):
         )
         self.disableOnModal.append((sessionMenu, 3))
         self.sessionOnly.append((sessionMenu, 3))
+        sessionMenu.add_checkbutton(
+            label='Live Updates', variable=self.liveUpdates
+        )
+        self.disableOnModal.append((sessionMenu, 4))
 
         # build and populate the Help menu
         helpMenu = tk.Menu(menuBar)
@@ -413,6 +456,7 @@ class STLPlanner(tk.Tk):
                 the new session.
 
         """
+        self.stopWatching()
         self.session.destroy()
         self._session = Session(self, saveslot)
         self.menuEnabled = True
@@ -439,14 +483,15 @@ class STLPlanner(tk.Tk):
         """
         if self.askCloseSession():
             try:
-                save = decryptSaveFile()
+                save = SaveFile()
             except FileNotFoundError:
                 showerror(self, 'File Not Found', 'Save file not found.')
                 return
-            saveslot = AskSlot(self, save).result
-            if saveslot is None:
+            dialog = AskSlot(self, save)
+            if dialog.result is None:
                 return
-            self.newSession(saveslot)
+            self.newSession(dialog.result)
+            self.watchSaveFile(dialog.slot)
 
     def newFromClipboard(self):
         """Provides instructions on copying save data to the clipboard,
@@ -474,6 +519,53 @@ class STLPlanner(tk.Tk):
             saveslot.roster.fillChars(chars, maxGear)
             self.newSession(saveslot)
 
+    def newFromSnapshot(self):
+        """Prompts the user for a snapshot file saved by
+        `STLPlanner.saveSnapshot`, then starts a new session with the
+        save slot and session settings stored in it.
+
+        """
+        if self.askCloseSession():
+            filename = askopenfilename(
+                self,
+                title='Open Snapshot',
+                filetypes=[('STL Planner Snapshot', '*.stlsnap')]
+            )
+            if not filename:
+                return
+            try:
+                saveslot, settings = readSnapshot(filename)
+            except (OSError, SnapshotError):
+                showerror(
+                    self, 'Snapshot Error', 'Cannot read snapshot file.'
+                )
+                return
+            self.newSession(saveslot)
+            if settings is not None:
+                self.session.settings.fromDict(settings)
+                self.session.rosterTab()
+
+    def saveSnapshot(self):
+        """Prompts the user for a file name, then saves a snapshot of
+        the current session's save slot and settings to that file.
+
+        """
+        filename = asksaveasfilename(
+            self,
+            defaultextension='stlsnap',
+            title='Save Snapshot',
+            filetypes=[('STL Planner Snapshot', '*.stlsnap')]
+        )
+        if not filename:
+            return
+        try:
+            writeSnapshot(
+                filename, self.session.saveslot,
+                self.session.settings.dictify()
+            )
+        except OSError:
+            showerror(self, 'Snapshot Error', 'Cannot write snapshot file.')
+
     def setTimestamps(self, *args): # pylint: disable=unused-argument
         """Sets the visibility of the timestamps in the active session
         according to the value of the `showTimestamps` attribute.
@@ -483,3 +575,57 @@ class STLPlanner(tk.Tk):
             self.session.makeTimeBar()
         else:
             self.session.removeTimeBar()
+
+    def watchSaveFile(self, slot):
+        """Starts watching the given slot of the save file. While the
+        `liveUpdates` attribute is `True`, changes to the save file are
+        checked for every few seconds, and the current session is
+        updated when one is found. The save file is read in a background
+        thread, so the app remains responsive while it is decrypted.
+
+        Args:
+            slot (int): The 0-based index of the save slot used by the
+                current session.
+
+        """
+        self.stopWatching()
+        self.watcher = SaveFileWatcher(slot)
+        self._watchJob = self.after(
+            int(1000 * self.watcher.interval), self.checkSaveFile
+        )
+
+    def stopWatching(self):
+        """Stops watching the save file, if it is being watched.
+
+        """
+        if self.watcher is None:
+            return
+        self.after_cancel(self._watchJob)
+        self.watcher.close()
+        self.watcher = None
+        self._watchJob = None
+        self._pendingLoad = None
+
+    def checkSaveFile(self):
+        """Polls the save file watcher and any read in progress. A
+        finished read is applied to the current session, unless a modal
+        dialog is open, in which case it is applied once the dialog is
+        closed. A read that fails, for instance because the game was
+        still writing the file, is discarded. Reschedules itself.
+
+        """
+        watcher = self.watcher
+        if self._pendingLoad is not None:
+            if self._pendingLoad.done() and self.menuEnabled:
+                try:
+                    save = self._pendingLoad.result()
+                except Exception: # pylint: disable=broad-except
+                    save = None
+                self._pendingLoad = None
+                if save is not None and self.liveUpdates.get():
+                    self.session.syncFromFile(save, watcher.slot)
+        elif watcher.poll() and self.liveUpdates.get():
+            self._pendingLoad = watcher.load()
+        self._watchJob = self.after(
+            int(1000 * watcher.interval), self.checkSaveFile
+        )
@@ -0,0 +1,195 @@
+"""Running slow computations without freezing the *STL Planner* app.
+
+Tk widgets may only be used from the thread that runs the Tk event loop.
+A `TaskRunner` runs a computation in a worker thread, and passes its
+result to a callback on the main thread, by checking for finished tasks
+with `tk.Misc.after`. In the meantime, the event loop keeps running, so
+windows can be moved, scrolled, and closed while the computation is in
+progress. A widget that uses a task runner typically shows a
+placeholder, such as `PENDING`, in place of each result, and replaces it
+in the callback.
+
+All tasks run in a single worker thread, one at a time, in the order
+they were submitted, so that two tasks never read or update the same
+objects at once. Tasks should only read objects that are not changed
+while they run, such as the roster of a session while a modal dialog is
+open.
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+__all__ = ['PENDING', 'Task', 'TaskRunner']
+
+PENDING = '...'
+"""`str`: The text shown in place of a result that is being computed."""
+
+_WORKER = ThreadPoolExecutor(1, thread_name_prefix='legends-task')
+
+class Task():
+    """A computation submitted to a `TaskRunner`.
+
+    Attributes:
+        callback (callable): The function called on the main thread with
+            the result of the computation.
+        errback (callable): The function called on the main thread with
+            the exception raised by the computation, or `None`, in which
+            case the exception is raised on the main thread, where Tk
+            reports it.
+
+    """
+
+    def __init__(self, func, args, callback, errback=None, withTask=False):
+        """The constructor submits the computation to the worker thread.
+
+        Args:
+            func (callable): The function that performs the computation.
+            args (tuple): The arguments to pass to `func`.
+            callback (callable): The value of the `callback` attribute.
+            errback (callable): The value of the `errback` attribute.
+            withTask (bool): If `True`, the task is passed to `func` as
+                an additional first argument.
+
+        """
+        self.callback = callback
+        self.errback = errback
+        self._cancelled = Event()
+        if withTask:
+            args = (self,) + tuple(args)
+        self._future = _WORKER.submit(self._run, func, args)
+
+    @property
+    def cancelled(self):
+        """`bool`: `True` if the task was cancelled. The callback of a
+        cancelled task is never called. A function that is passed the
+        task may check this property to stop early.
+        """
+        return self._cancelled.is_set()
+
+    def done(self):
+        """Returns `True` if the computation has finished or was
+        cancelled.
+
+        """
+        return self._future.done()
+
+    def cancel(self):
+        """Cancels the task. If the computation has not started, it
+        never will. If it has, it runs to completion, or until it checks
+        the `cancelled` property, and its result is discarded.
+
+        """
+        self._cancelled.set()
+        self._future.cancel()
+
+    def finish(self):
+        """Passes the result of the finished computation to the callback,
+        or the exception it raised to the errback. Does nothing if the
+        task was cancelled.
+
+        """
+        if self.cancelled:
+            return
+        error = self._future.exception()
+        if error is None:
+            self.callback(self._future.result())
+        elif self.errback is not None:
+            self.errback(error)
+        else:
+            raise error
+
+    def _run(self, func, args):
+        """Runs the computation in the worker thread, unless the task
+        was cancelled while it was waiting.
+
+        """
+        if self.cancelled:
+            return None
+        return func(*args)
+
+class TaskRunner():
+    """Runs computations in a worker thread on behalf of a widget.
+
+    While tasks are pending, the runner checks for finished ones every
+    `interval` milliseconds, using the `after` method of its widget, and
+    calls their callbacks in the order the tasks were submitted. The
+    runner should be cancelled with `TaskRunner.cancel` when the widget
+    is destroyed.
+
+    Attributes:
+        widget (tk.Misc): The widget whose `after` method is used to
+            check for finished tasks.
+        interval (int): The number of milliseconds between checks.
+
+    """
+
+    def __init__(self, widget, interval=50):
+        """The constructor does not use the widget, so the runner can be
+        created before the widget's constructor is called.
+
+        Args:
+            widget (tk.Misc): The value of the `widget` attribute.
+            interval (int): The value of the `interval` attribute.
+
+        """
+        self.widget = widget
+        self.interval = interval
+        self._tasks = []
+        self._job = None
+
+    @property
+    def busy(self):
+        """`bool`: `True` if some tasks have not yet been finished."""
+        return bool(self._tasks)
+
+    def submit(self, func, callback, *args, errback=None, withTask=False):
+        """Runs a function in the worker thread, then passes its result
+        to a callback on the main thread.
+
+        Args:
+            func (callable): The function to run. Must not use any Tk
+                objects.
+            callback (callable): The function to call with the result.
+                Must take one argument.
+            *args: The arguments to pass to `func`.
+            errback (callable): The function to call with the exception
+                raised by `func`, if any. See `Task.errback`.
+            withTask (bool): If `True`, the `Task` instance is passed to
+                `func` as an additional first argument, so that `func`
+                can stop early if the task is cancelled.
+
+        Returns:
+            Task: The submitted task.
+
+        """
+        task = Task(func, args, callback, errback, withTask)
+        self._tasks.append(task)
+        if self._job is None:
+            self._job = self.widget.after(self.interval, self._poll)
+        return task
+
+    def cancel(self):
+        """Cancels every pending task and stops checking for finished
+        ones.
+
+        """
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _poll(self):
+        """Finishes the tasks that are done, in order, and reschedules
+        itself while tasks are pending.
+
+        """
+        self._job = None
+        try:
+            while self._tasks and self._tasks[0].done():
+                self._tasks.pop(0).finish()
+        finally:
+            if self._tasks and self._job is None:
+                self._job = self.widget.after(self.interval, self._poll)
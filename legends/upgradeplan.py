@@ -0,0 +1,495 @@
+"""Tools used to plan how to spend the items in a player's inventory.
+
+An `UpgradePlanner` looks at every character in a save slot and the
+upgrades available to it: leveling equipped gear, unlocking and
+leveling skills, leveling up with bio-gel, and ranking up with tokens.
+Each upgrade is scored by the increase it produces in a goal (such as
+`PowerGoal` or `EffStatGoal`), and upgrades are chosen greedily in
+order of increase per unit of cost, where the cost of an upgrade is
+measured as a fraction of the inventory available at the start. When
+an upgrade is made, the other upgrades of the same character are
+rescored before they are chosen.
+
+Costs are looked up in cumulative cost tables, one for each gear ID,
+skill ID, and character rarity, which are built on first use and
+shared by all planners.
+
+"""
+
+import heapq
+import itertools
+from functools import lru_cache
+import numpy as np
+# pylint: disable-next=no-name-in-module
+from legends.constants import GSItem
+from legends.constants import (
+    EFF_STATS, Inventory, ITEMS, POWER_AT_ORIGIN, POWER_GRADIENT,
+    STAT_ABBREVIATIONS
+)
+from legends.functions import (
+    gearUpgradeCost, getCharStats, getGearStats, skillUpgradeCost,
+    tokensNeeded, xpFromLevel
+)
+from legends.stats import Stats
+
+__all__ = [
+    'EffStatGoal',
+    'PlanGoal',
+    'PowerGoal',
+    'Upgrade',
+    'UpgradePlan',
+    'UpgradePlanner'
+]
+
+RESOURCE_IDS = list(GSItem) + ['XP']
+"""`list` of `str`: The resources used to pay for upgrades, in the
+order used by the cost tables. These are the item IDs in `GSItem`,
+followed by 'XP', which stands for the combined xp of all bio-gel."""
+
+_RESOURCE_INDEX = {resID: index for index, resID in enumerate(RESOURCE_IDS)}
+
+def _costVector(inventory):
+    """Converts an inventory to a vector of resource quantities."""
+    vec = np.zeros(len(RESOURCE_IDS))
+    for itemID in GSItem:
+        vec[_RESOURCE_INDEX[itemID]] = inventory[ITEMS[itemID]]
+    return vec
+
+def _cumulative(steps):
+    """Stacks the given step costs under a row of zeros and returns
+    their cumulative sums, so that the cost of going from step `a` to
+    step `b` is the difference between rows `b` and `a`.
+
+    """
+    table = np.zeros((len(steps) + 1, len(RESOURCE_IDS)))
+    for index, step in enumerate(steps):
+        table[index + 1] = step
+    return np.cumsum(table, axis=0)
+
+@lru_cache(maxsize=None)
+def gearCostTable(gearID):
+    """Returns the cumulative cost table for the given gear. Row `n` is
+    the cost of leveling the gear from level 1 to level `n + 1`.
+
+    """
+    steps = []
+    for level in range(2, 26):
+        try:
+            steps.append(_costVector(gearUpgradeCost(gearID, level)))
+        except KeyError:
+            break
+    return _cumulative(steps)
+
+@lru_cache(maxsize=None)
+def skillCostTable(skillID):
+    """Returns the cumulative cost table for the given skill. Row `n` is
+    the cost of leveling the skill from locked (level 0) to level `n`.
+    Skills that cannot be bought at some level cost nothing at that
+    level.
+
+    """
+    steps = []
+    for level in (1, 2):
+        try:
+            steps.append(_costVector(skillUpgradeCost(skillID, level)))
+        except KeyError:
+            steps.append(np.zeros(len(RESOURCE_IDS)))
+    return _cumulative(steps)
+
+@lru_cache(maxsize=None)
+def rankCostTable(nameID, rarity):
+    """Returns the cumulative cost table for ranking up the character
+    with the given name ID and rarity. Row `n` is the cost of ranking up
+    from rank 1 to rank `n + 1`. Returns `None` if the character has no
+    tokens.
+
+    """
+    if nameID not in _RESOURCE_INDEX:
+        return None
+    steps = []
+    for rank in range(1, 9):
+        step = np.zeros(len(RESOURCE_IDS))
+        step[_RESOURCE_INDEX[nameID]] = tokensNeeded(rarity, rank)
+        steps.append(step)
+    return _cumulative(steps)
+
+@lru_cache(maxsize=None)
+def _xpTable(rarity):
+    return np.array([0] + [xpFromLevel(level, rarity) for level in range(
+        1, 100
+    )])
+
+@lru_cache(maxsize=None)
+def _charStats(nameID, rank, level):
+    stats = getCharStats(nameID, rank, level)
+    return np.array([stats[statName] for statName in STAT_ABBREVIATIONS])
+
+@lru_cache(maxsize=None)
+def _gearStats(gearID, level):
+    stats = getGearStats(gearID, level)
+    return np.array([stats[statName] for statName in STAT_ABBREVIATIONS])
+
+class PlanGoal():
+    """A goal used to score characters when planning upgrades, meant to
+    be subclassed. The total goal of a roster is the sum of the goals of
+    its characters.
+
+    Attributes:
+        skillWeight (float): The value added to the goal for each
+            unlocked skill level.
+
+    """
+
+    def __init__(self, skillWeight=0):
+        self.skillWeight = skillWeight
+
+    def value(self, char, stats, partEffects, skillLevels):
+        """Computes the goal for a character with the given stats.
+
+        Args:
+            char (legends.gameobjects.Character): The character.
+            stats (numpy.ndarray): The character's total stats, ordered
+                as in `STAT_ABBREVIATIONS`.
+            partEffects (legends.stats.PartEffects): The total effects
+                of the character's particles.
+            skillLevels (int): The total number of unlocked skill levels.
+
+        Returns:
+            float: The goal.
+
+        """
+        raise NotImplementedError
+
+class PowerGoal(PlanGoal):
+    """Scores a character by its power, plus `skillWeight` for each
+    unlocked skill level.
+
+    """
+
+    def __init__(self, skillWeight=0):
+        PlanGoal.__init__(self, skillWeight)
+        self._gradient = np.array([
+            POWER_GRADIENT[statName] for statName in STAT_ABBREVIATIONS
+        ])
+
+    def value(self, char, stats, partEffects, skillLevels):
+        return (
+            POWER_AT_ORIGIN + self._gradient @ stats
+            + self.skillWeight * skillLevels
+        )
+
+class EffStatGoal(PlanGoal):
+    """Scores a character by the weighted sum of its effective stats,
+    plus `skillWeight` for each unlocked skill level.
+
+    Attributes:
+        calc (legends.effstatcalc.EffStatCalc): The effective stat
+            calculator. Its settings must be fully instantiated.
+        weights (dict): {`str`:`float`} A dictionary mapping effective
+            stat names, as they appear in `EFF_STATS`, to their weights.
+            Defaults to 1 for each effective stat.
+
+    """
+
+    def __init__(self, calc, weights=None, skillWeight=0):
+        PlanGoal.__init__(self, skillWeight)
+        self.calc = calc
+        if weights is None:
+            weights = {statName: 1 for statName in EFF_STATS}
+        self.weights = weights
+
+    def value(self, char, stats, partEffects, skillLevels):
+        effStats = self.calc.calculateFromStats(
+            Stats(initDict=dict(zip(STAT_ABBREVIATIONS, stats))),
+            partEffects
+        )
+        return sum(
+            weight * effStats[statName]
+            for statName, weight in self.weights.items()
+        ) + self.skillWeight * skillLevels
+
+class Upgrade(): # pylint: disable=too-few-public-methods
+    """A single upgrade step.
+
+    Attributes:
+        nameID (str): The name ID of the character being upgraded.
+        kind (str): One of 'gear', 'skill', 'level', or 'rank'.
+        target (obj): For 'gear', the index of the gear slot; for
+            'skill', the skill ID; otherwise `None`.
+        level (int): The gear level, skill level, character level, or
+            rank reached by the upgrade.
+        cost (dict): {`str`:`int`} A dictionary mapping resource IDs, as
+            they appear in `RESOURCE_IDS`, to the quantity consumed.
+        gain (float): The increase in the goal.
+
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(self, nameID, kind, target, level, cost, gain):
+        self.nameID = nameID
+        self.kind = kind
+        self.target = target
+        self.level = level
+        self.cost = cost
+        self.gain = gain
+
+    def __repr__(self):
+        target = '' if self.target is None else ' {}'.format(self.target)
+        return '<Upgrade: {} {}{} to {}, gain {:.2f}>'.format(
+            self.nameID, self.kind, target, self.level, self.gain
+        )
+
+class UpgradePlan():
+    """An ordered sequence of upgrades.
+
+    Attributes:
+        upgrades (list of Upgrade): The upgrades, in the order chosen.
+        cost (legends.constants.Inventory): The total items consumed,
+            excluding bio-gel.
+        xp (int): The total bio-gel xp consumed.
+        gain (float): The total increase in the goal.
+
+    """
+
+    def __init__(self, upgrades):
+        self.upgrades = upgrades
+        total = np.zeros(len(RESOURCE_IDS))
+        for upgrade in upgrades:
+            for resID, qty in upgrade.cost.items():
+                total[_RESOURCE_INDEX[resID]] += qty
+        self.cost = Inventory({
+            itemID: int(total[_RESOURCE_INDEX[itemID]]) for itemID in GSItem
+            if total[_RESOURCE_INDEX[itemID]] > 0
+        })
+        self.xp = int(total[-1])
+        self.gain = sum(upgrade.gain for upgrade in upgrades)
+
+    def __len__(self):
+        return len(self.upgrades)
+
+    def __repr__(self):
+        return 'UpgradePlan({} upgrades, gain={:.2f})'.format(
+            len(self.upgrades), self.gain
+        )
+
+class _CharState():
+    """The upgrade state of a single character during planning.
+
+    """
+
+    def __init__(self, char, roster):
+        self.char = char
+        self.rank = char.rank
+        self.level = char.level
+        self.xp = char.xp
+        self.gear = {}
+        for slot in char.gearSlots:
+            gear = roster.containsGear.get(slot)
+            if gear is not None:
+                self.gear[slot.index] = [
+                    gear.gearID, gear.level, roster.maxGearLevel(gear)
+                ]
+        self.skills = {
+            skillID: skill.level if skill.unlocked else 0
+            for skillID, skill in char.skills.items()
+        }
+        self.partStats = np.zeros(len(STAT_ABBREVIATIONS))
+        self.partEffects = char.partEffects(roster)
+        for slot in char.partSlots:
+            part = roster.containsPart.get(slot)
+            if part is not None:
+                self.partStats += np.array([
+                    part.stats.get(statName)
+                    for statName in STAT_ABBREVIATIONS
+                ])
+
+    def stats(self):
+        """Returns the total stats for the current state."""
+        stats = _charStats(self.char.nameID, self.rank, self.level)
+        for gearID, level, _ in self.gear.values():
+            stats = stats + _gearStats(gearID, level)
+        return stats + self.partStats
+
+    def skillLevels(self):
+        """Returns the total number of unlocked skill levels."""
+        return sum(self.skills.values())
+
+    def tracks(self):
+        """Returns the keys of the upgrade tracks of the character. Each
+        track is a sequence of upgrades that must be done in order.
+
+        """
+        return (
+            [('gear', index) for index in self.gear]
+            + [('skill', skillID) for skillID in self.skills]
+            + [('level', None), ('rank', None)]
+        )
+
+class UpgradePlanner():
+    """Plans the upgrades that can be afforded with a save slot's
+    inventory.
+
+    Attributes:
+        saveslot (legends.saveslot.SaveSlot): The save slot whose
+            roster, inventory, and tokens are used.
+        goal (PlanGoal): The goal to increase. Defaults to a
+            `PowerGoal`.
+        nameIDs (list of str): The name IDs of the characters that may
+            be upgraded. Defaults to all characters in the roster.
+
+    """
+
+    def __init__(self, saveslot, goal=None, nameIDs=None):
+        self.saveslot = saveslot
+        self.goal = PowerGoal() if goal is None else goal
+        if nameIDs is None:
+            nameIDs = list(saveslot.roster.chars.keys())
+        self.nameIDs = nameIDs
+
+    def available(self):
+        """Returns the resources available to pay for upgrades.
+
+        Returns:
+            numpy.ndarray: The quantity of each resource, ordered as in
+                `RESOURCE_IDS`.
+
+        """
+        vec = _costVector(self.saveslot.inventory)
+        for nameID, qty in self.saveslot.tokens.items():
+            if nameID in _RESOURCE_INDEX:
+                vec[_RESOURCE_INDEX[nameID]] = qty
+        vec[-1] = self.saveslot.inventory.xp
+        return vec
+
+    def plan(self):
+        """Chooses upgrades greedily, in order of goal increase per unit
+        of cost, until no affordable upgrade increases the goal.
+
+        Returns:
+            UpgradePlan: The chosen upgrades.
+
+        """
+        # pylint: disable=too-many-locals
+        roster = self.saveslot.roster
+        remaining = self.available()
+        price = np.zeros(len(RESOURCE_IDS)) # cost of one unit of each item
+        np.divide(1, remaining, out=price, where=remaining > 0)
+        states = {
+            nameID: _CharState(roster.chars[nameID], roster)
+            for nameID in self.nameIDs
+        }
+        values = {
+            nameID: self._value(state) for nameID, state in states.items()
+        }
+        version = dict.fromkeys(states, 0)
+        heap = []
+        counter = itertools.count()
+
+        def push(nameID, track):
+            step = self._nextStep(states[nameID], track)
+            if step is None:
+                return
+            cost, gain = step[0], step[1] - values[nameID]
+            if gain <= 0 or np.any(cost > remaining):
+                return
+            size = price @ cost
+            ratio = np.inf if size == 0 else gain / size
+            heapq.heappush(heap, (
+                -ratio, next(counter), nameID, track, version[nameID]
+            ))
+
+        for nameID, state in states.items():
+            for track in state.tracks():
+                push(nameID, track)
+
+        upgrades = []
+        while heap:
+            _, _, nameID, track, ver = heapq.heappop(heap)
+            if ver != version[nameID]:
+                push(nameID, track) # rescore against the current state
+                continue
+            state = states[nameID]
+            step = self._nextStep(state, track)
+            if step is None or np.any(step[0] > remaining):
+                continue
+            cost, newValue, level = step
+            remaining -= cost
+            self._advance(state, track, level, cost)
+            upgrades.append(Upgrade(
+                nameID, track[0], track[1], level,
+                {
+                    RESOURCE_IDS[index]: int(cost[index])
+                    for index in np.flatnonzero(cost)
+                },
+                newValue - values[nameID]
+            ))
+            values[nameID] = newValue
+            version[nameID] += 1
+            push(nameID, track)
+        return UpgradePlan(upgrades)
+
+    def _value(self, state):
+        return self.goal.value(
+            state.char, state.stats(), state.partEffects, state.skillLevels()
+        )
+
+    def _nextStep(self, state, track):
+        """Returns the cost, resulting goal, and new level of the next
+        upgrade on the given track, or `None` if there is none.
+
+        """
+        kind, target = track
+        if kind == 'gear':
+            gearID, level, maxLevel = state.gear[target]
+            table = gearCostTable(gearID)
+            if level >= maxLevel or level >= len(table):
+                return None
+            cost = table[level] - table[level - 1]
+            state.gear[target][1] = level + 1
+            newValue = self._value(state)
+            state.gear[target][1] = level
+            return cost, newValue, level + 1
+        if kind == 'skill':
+            level = state.skills[target]
+            if level >= 2:
+                return None
+            table = skillCostTable(target)
+            cost = table[level + 1] - table[level]
+            state.skills[target] = level + 1
+            newValue = self._value(state)
+            state.skills[target] = level
+            return cost, newValue, level + 1
+        if kind == 'level':
+            level = state.level
+            if level >= 99:
+                return None
+            cost = np.zeros(len(RESOURCE_IDS))
+            cost[-1] = max(
+                _xpTable(state.char.rarity)[level + 1] - state.xp, 0
+            )
+            state.level = level + 1
+            newValue = self._value(state)
+            state.level = level
+            return cost, newValue, level + 1
+        rank = state.rank
+        table = rankCostTable(state.char.nameID, state.char.rarity)
+        if rank >= 9 or table is None:
+            return None
+        cost = table[rank] - table[rank - 1]
+        state.rank = rank + 1
+        newValue = self._value(state)
+        state.rank = rank
+        return cost, newValue, rank + 1
+
+    # pylint: disable-next=no-self-use
+    def _advance(self, state, track, level, cost):
+        kind, target = track
+        if kind == 'gear':
+            state.gear[target][1] = level
+        elif kind == 'skill':
+            state.skills[target] = level
+        elif kind == 'level':
+            state.level = level
+            state.xp += int(cost[-1])
+        else:
+            state.rank = level
@@ -2,6 +2,9 @@
 
 """
 
+from copy import deepcopy
+from types import MethodType
+from weakref import WeakMethod, ref
 from legends.utils.functions import formatDict, objDict
 
 __all__ = ['Event', 'EventHandler']
@@ -19,20 +22,80 @@ class Event(): # pylint: disable=too-few-public-methods
 class EventHandler():
     """A simple event handler.
 
+    Subscribers are stored in a dictionary, in the order they
+    subscribed, so that unsubscribing takes constant time. A subscriber
+    may be held by a weak reference, in which case the event handler
+    does not keep it alive, and it is unsubscribed automatically when
+    it is garbage collected. The length of an event handler is its
+    number of subscribers, not counting weakly held subscribers that
+    have been garbage collected.
+
     """
 
     def __init__(self):
-        self._subscribers = []  # the list of subscribers
+        # maps a key identifying each callback to a pair consisting of
+        # the callback, or None, and a weak reference to it, or None
+        self._subscribers = {}
+
+    def __len__(self):
+        return sum(
+            weakRef is None or weakRef() is not None
+            for _, weakRef in self._subscribers.values()
+        )
 
-    def subscribe(self, callback):
-        """Used to subscribe to the event handler.
+    def __deepcopy__(self, memo):
+        """Copies the event handler, together with its subscribers and
+        any other attributes. Weakly held subscribers are held weakly by
+        the copy, and those that have been garbage collected are
+        dropped.
+
+        """
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        for name, value in self.__dict__.items():
+            if name != '_subscribers':
+                new.__dict__[name] = deepcopy(value, memo)
+        new._subscribers = {}
+        for callback, weakRef in list(self._subscribers.values()):
+            if weakRef is not None:
+                callback = weakRef()
+                if callback is None:
+                    continue
+            new.subscribe(deepcopy(callback, memo), weakRef is not None)
+        return new
+
+    def subscribe(self, callback, weak=False):
+        """Used to subscribe to the event handler. Subscribing a
+        callback that is already subscribed has no effect.
 
         Args:
             callback (callable): The callable object to add to the list
                 of subscribers. Must take one argument.
+            weak (bool): If `True`, the event handler holds only a weak
+                reference to the callback, or, if the callback is a
+                bound method, to the object to which it is bound. The
+                callback is unsubscribed when that object is garbage
+                collected. A lambda or other function that is not
+                referenced elsewhere should not be subscribed weakly,
+                since it would be unsubscribed at once.
 
         """
-        self._subscribers.append(callback)
+        key = _key(callback)
+        if key in self._subscribers:
+            return
+        if not weak:
+            self._subscribers[key] = (callback, None)
+            return
+        # the dead reference removes its own entry, unless the key has
+        # since been unsubscribed and subscribed again
+        def prune(weakRef, key=key):
+            if self._subscribers.get(key, (None, None))[1] is weakRef:
+                del self._subscribers[key]
+        if isinstance(callback, MethodType):
+            weakRef = WeakMethod(callback, prune)
+        else:
+            weakRef = ref(callback, prune)
+        self._subscribers[key] = (None, weakRef)
 
     def unsubscribe(self, callback):
         """Used to unsubscribe from the event handler.
@@ -41,8 +104,14 @@ class EventHandler():
             callback (callable): The callable object to remove from the
                 list of subscribers. Must take one argument.
 
+        Raises:
+            ValueError: If the callback is not subscribed.
+
         """
-        self._subscribers.remove(callback)
+        try:
+            del self._subscribers[_key(callback)]
+        except KeyError:
+            raise ValueError(callback) from None
 
     def notify(self, event):
         """Notifies the subscribers of an event. More specifically, each
@@ -54,5 +123,19 @@ class EventHandler():
                 callables.
 
         """
-        for func in self._subscribers:
-            func(event)
+        for callback, weakRef in list(self._subscribers.values()):
+            if weakRef is not None:
+                callback = weakRef()
+                if callback is None:
+                    continue
+            callback(event)
+
+def _key(callback):
+    """Returns a key identifying the given callback. Bound methods are
+    created anew each time they are looked up, so a bound method is
+    identified by its object and function.
+
+    """
+    if isinstance(callback, MethodType):
+        return (id(callback.__self__), id(callback.__func__))
+    return id(callback)
@@ -7,6 +7,7 @@ any of these relations must be instances of the `Managed` class. The
 
 """
 
+from copy import deepcopy
 from types import MethodType
 from legends.utils.customabcs import BiMapping, MultiMapping
 from legends.utils.relations import (
@@ -37,6 +38,21 @@ class Managed(): # pylint: disable=too-few-public-methods
         Managed._m_objects[id(obj)] = obj
         return obj
 
+    @staticmethod
+    def release(*objs):
+        """Stops tracking the given objects, so that they can be garbage
+        collected once they are no longer used elsewhere. A released
+        object must no longer be stored in any relation. Objects that
+        are not tracked are ignored.
+
+        Args:
+            *objs (Managed): The objects to release.
+
+        """
+        for obj in objs:
+            if Managed._m_objects.get(id(obj)) is obj:
+                del Managed._m_objects[id(obj)]
+
 class ManyToMany(MultiMapping, Managed):
     """A many-to-many relation mapping objects to objects.
 
@@ -270,6 +286,24 @@ class OneToOne(BiMapping, Managed):
         if self.validate(key, val): # pylint: disable=not-callable
             self.map[id(key)] = id(val)
 
+    def __deepcopy__(self, memo):
+        """Copies the relation together with the objects in it, so that
+        the map of the copy holds the IDs of the copied objects. The
+        inverse of the copy is created anew when it is first used.
+
+        """
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        for name, value in self.__dict__.items():
+            if name not in ('map', '_inverse'):
+                new.__dict__[name] = deepcopy(value, memo)
+        new.map = bidict()
+        for keyID, valID in self.map.items():
+            key = deepcopy(Managed._m_objects[keyID], memo)
+            val = deepcopy(Managed._m_objects[valID], memo)
+            new.map[id(key)] = id(val)
+        return new
+
     def __inverse__(self):
         inverse = self.__class__()
         inverse.map = self.map.inverse
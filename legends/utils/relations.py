@@ -63,6 +63,15 @@ class bidict(BiMapping): # pylint: disable=invalid-name
         inverse._backward = self._forward
         return inverse
 
+    def copy(self):
+        """Creates and returns a copy of the `bidict` object.
+
+        """
+        new = bidict()
+        new._forward = self._forward.copy()
+        new._backward = self._backward.copy()
+        return new
+
     def __repr__(self):
         return 'bidict(' + repr(self._forward) + ')'
 
@@ -1,11 +1,12 @@
-"""The `legends.utils.scrollframe.ScrollFrame` class.
+"""The `legends.utils.scrollframe.ScrollFrame` class and related
+objects.
 
 """
 
 import tkinter as tk
-from tkinter import LEFT, RIGHT, Y, YES, BOTH, NW
+from tkinter import LEFT, RIGHT, Y, YES, BOTH, NW, NSEW
 
-__all__ = ['ScrollFrame']
+__all__ = ['ScrollFrame', 'VirtualScrollFrame']
 
 class ScrollFrame(tk.Frame):
     """A simple scrollable frame.
@@ -82,3 +83,248 @@ class ScrollFrame(tk.Frame):
         """
         if event.widget == self:
             self.canvas.unbind_all('<MouseWheel>')
+
+class VirtualScrollFrame(tk.Frame):
+    """A scrollable grid that only builds widgets for the rows in view.
+
+    A `VirtualScrollFrame` displays a list of items in a grid with a
+    fixed number of columns, one widget per item. Instead of building a
+    widget for every item, it keeps a pool of widgets, just large
+    enough to fill the rows in view, in a `content` frame embedded in a
+    `tk.Canvas`. Scrolling moves the `content` frame by less than the
+    height of one row, and when a row leaves the view, the widgets in
+    it are moved to the row entering the view and bound to its items.
+    The number of widgets thus depends on the size of the view, not on
+    the number of items, and widgets are never destroyed.
+
+    Widgets are built by the `makeWidget` callable, which takes no
+    arguments and must return a widget whose master is the `content`
+    frame, and bound to items by the `bindWidget` callable, which takes
+    a widget and an item. Every row must have the same height, which is
+    measured from the first widget built. As with a `ScrollFrame`,
+    parent objects can set the 'height' option of the `canvas`
+    attribute to give the frame an initial height.
+
+    Attributes:
+        canvas (tk.Canvas): The embedded canvas.
+        scrollbar (tk.Scrollbar): The embedded scrollbar.
+        content (tk.Frame): The inner frame, attached to the embedded
+            canvas, which holds the widgets.
+        makeWidget (callable): Builds a widget.
+        bindWidget (callable): Binds a widget to an item.
+        columns (int): The number of columns in the grid.
+        items (list): The items displayed in the grid.
+
+    """
+
+    def __init__(
+        self, parent=None, makeWidget=None, bindWidget=None, columns=1,
+        **options
+    ):
+        """The constructor passes `parent` and `options` to the
+        `tk.Frame` superclass.
+
+        Args:
+            parent (tk.Widget): The master of the frame.
+            makeWidget (callable): The value of the `makeWidget`
+                attribute.
+            bindWidget (callable): The value of the `bindWidget`
+                attribute.
+            columns (int): The value of the `columns` attribute.
+
+        """
+        tk.Frame.__init__(self, parent, **options)
+        self.makeWidget = makeWidget
+        self.bindWidget = bindWidget
+        self.columns = columns
+        self.items = []
+        self._pool = []
+        self._bound = {}
+        self._cells = {}
+        self._offset = 0
+        self._rowHeight = None
+        self.canvas = tk.Canvas(self, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, command=self.yview)
+        self.canvas.bind('<Enter>', lambda event: (
+            self.canvas.bind_all('<MouseWheel>', self.onMouseWheel)
+        ))
+        self.canvas.bind('<Leave>', lambda event: (
+            self.canvas.unbind_all('<MouseWheel>')
+        ))
+        self.canvas.bind('<Configure>', lambda event: self.layout())
+        self.bind('<Destroy>', self.onDestroy)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.canvas.pack(side=LEFT, expand=YES, fill=BOTH)
+        self.content = tk.Frame(self.canvas)
+        self._window = self.canvas.create_window(
+            (0,0), window=self.content, anchor=NW
+        )
+        for column in range(columns):
+            self.content.columnconfigure(column, weight=1, uniform='cells')
+        self.content.bind('<Configure>', lambda event:self.onContentConfig())
+
+    @property
+    def widgets(self):
+        """`dict`: {`int`:`tk.Widget`} A dictionary mapping the index of
+        each item in view to the widget bound to it.
+        """
+        return dict(self._cells)
+
+    @property
+    def viewHeight(self):
+        """`int`: The height of the view, in pixels."""
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            height = int(float(self.canvas.cget('height')))
+        return height
+
+    @property
+    def totalHeight(self):
+        """`int`: The height of all the rows, in pixels."""
+        numRows = -(-len(self.items) // self.columns)
+        return numRows * (self._rowHeight or 0)
+
+    def setItems(self, items, rebind=False):
+        """Replaces the items displayed in the grid. Unless `rebind` is
+        `True`, a widget already bound to an item that is still in view
+        is moved to the item's new position without being bound again,
+        so reordering the items only moves widgets. The scroll position
+        is kept, if possible.
+
+        Args:
+            items (iterable): The new items.
+            rebind (bool): If `True`, every widget in view is bound
+                again, to show changes to the items.
+
+        """
+        self.items = list(items)
+        if rebind:
+            self._bound = {}
+        self.layout()
+
+    def layout(self):
+        """Makes sure the pool has enough widgets to fill the view, and
+        binds and places the widgets for the rows in view.
+
+        """
+        if self.items and self._rowHeight is None:
+            widget = self._newWidget()
+            self._bind(widget, self.items[0])
+            widget.update_idletasks()
+            self._rowHeight = max(widget.winfo_reqheight(), 1)
+        if self._rowHeight is None:
+            for widget in self._pool:
+                widget.grid_remove()
+            self.scrollbar.set(0, 1)
+            return
+        numRows = self.viewHeight // self._rowHeight + 2
+        while len(self._pool) < numRows * self.columns:
+            self._newWidget()
+        self._offset = max(
+            0, min(self._offset, self.totalHeight - self.viewHeight)
+        )
+        self._place()
+
+    def yview(self, *args):
+        """Scrolls the view. Takes the same arguments as the
+        `tk.Canvas.yview` method, as passed by the scrollbar.
+
+        """
+        if not args:
+            return
+        if args[0] == 'moveto':
+            offset = float(args[1]) * self.totalHeight
+        else:
+            step = int(args[1])
+            if args[2] == 'pages':
+                offset = self._offset + step * self.viewHeight
+            else:
+                offset = self._offset + step * max(self.viewHeight // 10, 1)
+        self._offset = int(max(
+            0, min(offset, self.totalHeight - self.viewHeight)
+        ))
+        self._place()
+
+    def onMouseWheel(self, event):
+        """Allows the user to use the mouse wheel/trackpad to scroll the
+        grid.
+
+        Args:
+            event (tk.Event): The `tk.Event` passed by the
+                `Mousewheel` event.
+
+        """
+        self.yview('scroll', -1 * event.delta, 'units')
+
+    def onContentConfig(self):
+        """When the content area changes, the canvas adjusts its width
+        to match it.
+
+        """
+        self.canvas.config(width=self.content.winfo_reqwidth())
+
+    def onDestroy(self, event):
+        """Unbinds the mousewheel when the scroll frame is destroyed.
+
+        Args:
+            event (tk.Event): The event passed by the `Destroy` event.
+
+        """
+        if event.widget == self:
+            self.canvas.unbind_all('<MouseWheel>')
+
+    def _newWidget(self):
+        """Builds a widget and adds it to the pool."""
+        widget = self.makeWidget()
+        self._pool.append(widget)
+        return widget
+
+    def _bind(self, widget, item):
+        """Binds a widget to an item, and records the binding."""
+        self.bindWidget(widget, item)
+        self._bound[widget] = item
+
+    def _place(self):
+        """Binds the widgets in the pool to the items in the rows in
+        view, reusing the widgets already bound to those items, and
+        grids them. Then positions the content frame and the scrollbar.
+
+        """
+        if self._rowHeight is None:
+            return
+        firstRow = self._offset // self._rowHeight
+        start = firstRow * self.columns
+        end = min(start + len(self._pool), len(self.items))
+        byItem = {id(item): widget for widget, item in self._bound.items()}
+        cells = {}
+        for index in range(start, end):
+            widget = byItem.pop(id(self.items[index]), None)
+            if widget is not None:
+                cells[index] = widget
+        used = set(cells.values())
+        free = [widget for widget in self._pool if widget not in used]
+        for index in range(start, end):
+            if index not in cells:
+                widget = free.pop()
+                self._bind(widget, self.items[index])
+                cells[index] = widget
+        for index, widget in cells.items():
+            widget.grid(
+                row=index // self.columns - firstRow,
+                column=index % self.columns,
+                sticky=NSEW
+            )
+        for widget in free:
+            widget.grid_remove()
+        self._cells = cells
+        self.canvas.coords(
+            self._window, 0, -(self._offset % self._rowHeight)
+        )
+        total = self.totalHeight
+        if total <= self.viewHeight:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(
+                self._offset / total,
+                (self._offset + self.viewHeight) / total
+            )
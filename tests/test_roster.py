@@ -0,0 +1,207 @@
+"""Checks the bookkeeping of gear and particles in `legends.roster.Roster`.
+
+"""
+
+import copy
+import gc
+from random import Random
+import unittest
+from legends.constants import ENABLED, GSAccessoryItems, PART_STAT_VALUES
+from legends.functions import getBasicGearID
+from legends.gameobjects import Character
+from legends.roster import Roster
+from legends.utils.objrelations import Managed
+
+def makeSave(seed, numChars=12):
+    """Builds the decrypted data of a save file with one slot, holding
+    randomly chosen characters with random gear and particles.
+
+    Args:
+        seed (int): The seed of the random number generator.
+        numChars (int): The number of characters.
+
+    Returns:
+        dict: The save data, in the format returned by
+            `legends.functions.decryptSaveFile`.
+
+    """
+    rng = Random(seed)
+    gears, parts, units = {}, {}, {}
+    partIDs = sorted(GSAccessoryItems)
+    statNames = sorted(PART_STAT_VALUES)
+    for nameID in rng.sample(sorted(ENABLED), numChars):
+        char = Character(nameID)
+        charGear = {}
+        for index in range(4):
+            charGear[str(index)] = 0
+            if rng.random() < 0.7:
+                saveIndex = len(gears) + 1
+                gears[str(saveIndex)] = {
+                    'gearid': getBasicGearID(char.role, index),
+                    'level': rng.randint(1, 5)
+                }
+                charGear[str(index)] = saveIndex
+        charParts = {}
+        for index in range(2):
+            charParts[str(index)] = 0
+            if rng.random() < 0.7:
+                saveIndex = len(parts) + 1
+                parts[str(saveIndex)] = {
+                    'accessoryid': rng.choice(partIDs),
+                    'level': rng.randint(1, 5),
+                    'locked': False,
+                    'stats': {
+                        str(statIndex): rng.choice(statNames)
+                        for statIndex in range(4)
+                    }
+                }
+                charParts[str(index)] = saveIndex
+        units[nameID] = {
+            'rank': 1, 'xp': 0, 'skills': {},
+            'gears': charGear, 'accessories': charParts
+        }
+    return {'0 data': {'units': units, 'gears': gears, 'accessories': parts}}
+
+def moveItems(save, seed):
+    """Returns a copy of the given save data in which the equipped gear
+    and particles are shuffled between characters. Gear only moves to
+    the same slot of a character of the same role.
+
+    """
+    rng = Random(seed)
+    save = copy.deepcopy(save)
+    units = save['0 data']['units']
+    partSlots = [
+        (data['accessories'], index)
+        for data in units.values() for index in data['accessories']
+    ]
+    saveIndices = [slots[index] for slots, index in partSlots]
+    rng.shuffle(saveIndices)
+    for (slots, index), saveIndex in zip(partSlots, saveIndices):
+        slots[index] = saveIndex
+    for role in {Character(nameID).role for nameID in units}:
+        for index in map(str, range(4)):
+            gearSlots = [
+                data['gears'] for nameID, data in units.items()
+                if Character(nameID).role == role
+            ]
+            saveIndices = [slots[index] for slots in gearSlots]
+            rng.shuffle(saveIndices)
+            for slots, saveIndex in zip(gearSlots, saveIndices):
+                slots[index] = saveIndex
+    return save
+
+def equipment(roster):
+    """Describes the equipment of a roster by save indices and slot
+    names, so that two rosters can be compared.
+
+    Returns:
+        tuple: The pairs of `Roster.inGearSlot`, of its inverse, of
+            `Roster.inPartSlot`, and of its inverse, as sets, then the
+            contents of every gear slot and particle slot, as
+            dictionaries.
+
+    """
+    gearIndex = {gear: index for index, gear in roster._saveGear.items()}
+    partIndex = {part: index for index, part in roster._saveParts.items()}
+
+    def slotName(slot):
+        return (slot.char.nameID, type(slot).__name__, slot.index)
+
+    def pairs(rel, keyName, valueName):
+        return {(keyName(key), valueName(value)) for key, value in rel.items()}
+
+    return (
+        pairs(roster.inGearSlot, gearIndex.get, slotName),
+        pairs(roster.inGearSlot.inverse, slotName, gearIndex.get),
+        pairs(roster.inPartSlot, partIndex.get, slotName),
+        pairs(roster.inPartSlot.inverse, slotName, partIndex.get),
+        {
+            slotName(slot): gearIndex.get(roster.containsGear.get(slot))
+            for char in roster.chars.values() for slot in char.gearSlots
+        },
+        {
+            slotName(slot): partIndex.get(roster.containsPart.get(slot))
+            for char in roster.chars.values() for slot in char.partSlots
+        }
+    )
+
+class TestSyncFromSaveData(unittest.TestCase):
+    """Compares rosters updated by `Roster.syncFromSaveData` with rosters
+    built from the same save data.
+
+    """
+
+    def testMovedItems(self):
+        """Syncs after gear and particles move between characters."""
+        for seed in range(4):
+            save = makeSave(seed)
+            moved = moveItems(save, seed)
+            roster = Roster(save, 0)
+            roster.syncFromSaveData(moved, 0)
+            fresh = Roster(moved, 0)
+            with self.subTest(seed=seed):
+                for rel, freshRel in [
+                    (roster.inGearSlot, fresh.inGearSlot),
+                    (roster.inPartSlot, fresh.inPartSlot)
+                ]:
+                    self.assertEqual(len(rel), len(freshRel))
+                    self.assertEqual(len(rel.inverse), len(freshRel.inverse))
+                    self.assertEqual(len(rel), len(rel.inverse))
+                self.assertEqual(equipment(roster), equipment(fresh))
+
+def editFork(roster, rng):
+    """Makes a fork of the given roster, and changes a character, a gear
+    piece, and a particle in it, so that `Roster.writable` copies them.
+
+    Returns:
+        legends.roster.Roster: The fork.
+
+    """
+    fork = roster.fork()
+    char = fork.writable(rng.choice(list(fork.chars.values())))
+    char.rank = rng.randint(1, 9)
+    gear = fork.writable(rng.choice(fork.gear))
+    gear.setLevel(fork, 1)
+    part = fork.writable(rng.choice(fork.parts))
+    part.level = rng.randint(1, 5)
+    for slot in char.partSlots:
+        fork.containsPart.pop(slot, None)
+    return fork
+
+class TestFork(unittest.TestCase):
+    """Checks that forks do not leave objects behind in the registry of
+    `legends.utils.objrelations.Managed` objects.
+
+    """
+
+    def testRegistrySize(self):
+        """Creates and drops many forks."""
+        rng = Random(0)
+        roster = Roster(makeSave(0), 0)
+        editFork(roster, rng)
+        gc.collect()
+        size = len(Managed._m_objects)
+        for _ in range(200):
+            editFork(roster, rng)
+        gc.collect()
+        self.assertEqual(len(Managed._m_objects), size)
+
+    def testForkOfFork(self):
+        """Drops a fork while a fork of it is in use."""
+        rng = Random(1)
+        roster = Roster(makeSave(1), 0)
+        fork = editFork(editFork(roster, rng), rng)
+        gc.collect()
+        self.assertEqual(len(fork.inGearSlot), len(fork.inGearSlot.inverse))
+        for gear, slot in fork.inGearSlot.items():
+            self.assertIs(fork.containsGear[slot], gear)
+        del fork
+        gc.collect()
+        size = len(Managed._m_objects)
+        editFork(editFork(roster, rng), rng)
+        gc.collect()
+        self.assertEqual(len(Managed._m_objects), size)
+
+if __name__ == '__main__':
+    unittest.main()
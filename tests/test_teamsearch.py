@@ -0,0 +1,87 @@
+"""Cross-checks `legends.teamsearch.TeamSearch` against brute force.
+
+"""
+
+import itertools
+from random import Random
+import unittest
+from legends.constants import ENABLED
+from legends.roster import Roster
+from legends.teamsearch import (
+    PowerObjective, TEAM_SIZE, TeamConstraints, TeamSearch
+)
+
+STATIONS = [
+    ['Captain', 'Conn', 'Engineering', 'FirstOfficer'],
+    ['Conn', 'Engineering', 'FirstOfficer', 'Medical'],
+    ['Captain', 'Science'],
+    ['Medical', 'Medical']
+]
+
+def makeRoster(seed, size=18):
+    """Builds a roster of randomly chosen characters, with random ranks
+    and levels.
+
+    Args:
+        seed (int): The seed of the random number generator.
+        size (int): The number of characters.
+
+    Returns:
+        legends.roster.Roster: The roster.
+
+    """
+    rng = Random(seed)
+    roster = Roster()
+    roster.fillChars(rng.sample(sorted(ENABLED), size))
+    for char in roster.chars.values():
+        char.rank = rng.randint(1, 9)
+        char.level = rng.randint(1, 99)
+    return roster
+
+def bruteForce(search, k):
+    """Finds the scores of the top `k` teams by scoring every team."""
+    scores = sorted((
+        search.objective.teamScore(team)
+        for team in itertools.combinations(search.candidates(), TEAM_SIZE)
+        if search.constraints.satisfied(team)
+    ), reverse=True)
+    return scores[:k]
+
+class TestTeamSearch(unittest.TestCase):
+    """Compares the scores of the teams found by `TeamSearch.search`
+    with those found by brute force.
+
+    """
+
+    def testStations(self):
+        """Searches with station constraints."""
+        for seed in range(4):
+            roster = makeRoster(seed)
+            for stations in STATIONS:
+                search = TeamSearch(
+                    PowerObjective(roster), TeamConstraints(stations=stations)
+                )
+                with self.subTest(seed=seed, stations=stations):
+                    found = [score for score, _ in search.search(3)]
+                    expected = bruteForce(search, 3)
+                    self.assertEqual(len(found), len(expected))
+                    for score, best in zip(found, expected):
+                        self.assertAlmostEqual(score, best)
+
+    def testRoles(self):
+        """Searches with role and inclusion constraints."""
+        for seed in range(4):
+            roster = makeRoster(seed)
+            include = [list(roster.chars)[seed]]
+            search = TeamSearch(PowerObjective(roster), TeamConstraints(
+                roles=['Medical', 'Science'], include=include
+            ))
+            with self.subTest(seed=seed):
+                found = [score for score, _ in search.search(3)]
+                expected = bruteForce(search, 3)
+                self.assertEqual(len(found), len(expected))
+                for score, best in zip(found, expected):
+                    self.assertAlmostEqual(score, best)
+
+if __name__ == '__main__':
+    unittest.main()